@@ -1,3 +1,4 @@
+import cluster from "cluster";
 import express from "express";
 import cors from "cors";
 import helmet from "helmet";
@@ -9,6 +10,17 @@ import { fileURLToPath } from "url";
 
 // Config
 import { config } from "./config/index.js";
+import { getPoolStats, getQueryStats } from "./db/index.js";
+import { getQuizCacheStats } from "./services/quizCache.js";
+import lessonProgressBuffer from "./services/lessonProgressBuffer.js";
+import catalogCache from "./services/catalogCache.js";
+import { CONTENT_SCOPES } from "./services/contentVersions.js";
+import { getRealtimeStreamStats } from "./services/realtimeDelta.js";
+import { getStatisticsStats } from "./services/statistics.js";
+import { getSharedCounterStats, SharedRateLimitStore } from "./services/sharedCounters.js";
+import { getPasswordHashStats } from "./services/passwordHasher.js";
+import { getEmailQueueStats } from "./services/emailQueue.js";
+import { getCertificatePdfStats } from "./services/certificatePdfCache.js";
 
 // Routes
 import authRoutes from "./routes/auth.js";
@@ -27,6 +39,10 @@ import learningProgressRoutes from './routes/learning-progress.js';
 
 // Middleware
 import { notFound, errorHandler } from "./middleware/errorHandler.js";
+import { countQueries } from "./middleware/queryCount.js";
+import { invalidateCatalogOnWrite } from "./middleware/catalogCache.js";
+import { bumpContentVersionsOnWrite } from "./middleware/contentVersion.js";
+import { authenticateToken, requireAdmin } from "./middleware/auth.js";
 
 const app = express();
 
@@ -56,6 +72,8 @@ app.use(
             }
         },
         credentials: true,
+        // Let browser clients follow admin list pages
+        exposedHeaders: ["X-Next-Cursor", "Link"],
     })
 );
 
@@ -63,17 +81,25 @@ app.use(helmet());
 app.use(morgan("dev"));
 app.use(compression());
 
-// Rate limiting
+// Rate limiting, counted across every worker process
 const limiter = rateLimit({
-    windowMs: 15 * 60 * 1000, // 15 minutes
-    max: 2000,
-    message: "Too many requests from this IP, please try again later."
+    windowMs: config.rateLimit.windowMs,
+    max: config.rateLimit.max,
+    message: "Too many requests from this IP, please try again later.",
+    store: new SharedRateLimitStore("api:"),
+    // Serve the request rather than fail it if the shared store is unreachable
+    passOnStoreError: true,
 });
 app.use("/api/", limiter);
 
-app.use(express.json());
+app.use(express.json({ limit: config.jsonBodyLimit }));
 app.use(express.urlencoded({ extended: true }));
 
+// Per-request database query counts for the API test suites
+if (config.db.exposeQueryCount) {
+    app.use("/api/", countQueries);
+}
+
 // Root Route
 app.get("/", (req, res) => {
     res.json({
@@ -90,32 +116,62 @@ app.get("/api/health", (req, res) => {
     res.json({
         status: "ok",
         message: "Server is running successfully 🚀",
-        timestamp: new Date().toISOString()
+        timestamp: new Date().toISOString(),
+        db: getPoolStats(),
+        queries: getQueryStats(),
+        progressBuffer: lessonProgressBuffer.getStats(),
+        catalogCache: catalogCache.getStats(),
+        realtime: getRealtimeStreamStats(),
+        statistics: getStatisticsStats(),
+        cluster: { workerId: cluster.worker?.id ?? null, workers: config.cluster.workers },
+        sharedState: getSharedCounterStats(),
+        passwordHashing: getPasswordHashStats(),
+        emailQueue: getEmailQueueStats(),
+        certificatePdf: getCertificatePdfStats(),
+        quizCache: getQuizCacheStats()
+    });
+});
+
+// Process memory is only reported to admins
+app.get("/api/admin/health", authenticateToken, requireAdmin, (req, res) => {
+    res.json({
+        status: "ok",
+        timestamp: new Date().toISOString(),
+        cluster: { workerId: cluster.worker?.id ?? null, workers: config.cluster.workers },
+        sharedState: getSharedCounterStats(),
+        memory: process.memoryUsage()
     });
 });
 
+// Successful writes advance the content versions behind conditional-GET ETags
+const bumpCatalog = bumpContentVersionsOnWrite([CONTENT_SCOPES.catalog]);
+const bumpActivity = bumpContentVersionsOnWrite([CONTENT_SCOPES.activity]);
+const bumpQuizzes = bumpContentVersionsOnWrite([CONTENT_SCOPES.quizzes], { adminOnly: true });
+// Deletes send realtime delta clients back to a full resync
+const bumpDeletions = bumpContentVersionsOnWrite([CONTENT_SCOPES.deletions], { methods: ["DELETE"] });
+
 // API Routes
 app.use("/api/auth", authRoutes);
-app.use("/api/courses", coursesRoutes);
-app.use("/api/enrollments", enrollmentsRoutes);
-app.use("/api/coupons", couponsRoutes);
-app.use("/api/payments", paymentsRoutes);
+app.use("/api/courses", invalidateCatalogOnWrite, bumpCatalog, bumpDeletions, coursesRoutes);
+app.use("/api/enrollments", bumpActivity, bumpDeletions, enrollmentsRoutes);
+app.use("/api/coupons", bumpActivity, bumpDeletions, couponsRoutes);
+app.use("/api/payments", bumpActivity, paymentsRoutes);
 
 // Admin Routes
 app.use("/api/admin/users", adminUsersRoutes);
-app.use("/api/admin/courses", coursesRoutes);
-app.use("/api/admin/enrollments", enrollmentsRoutes);
-app.use("/api/admin/payments", paymentsRoutes);
-app.use("/api/admin/coupons", couponsRoutes);
+app.use("/api/admin/courses", invalidateCatalogOnWrite, bumpCatalog, bumpDeletions, coursesRoutes);
+app.use("/api/admin/enrollments", bumpActivity, bumpDeletions, enrollmentsRoutes);
+app.use("/api/admin/payments", bumpActivity, paymentsRoutes);
+app.use("/api/admin/coupons", bumpActivity, bumpDeletions, couponsRoutes);
 app.use("/api/admin/certifications", certificationsRoutes);
 app.use("/api/admin/realtime", adminRealtimeRoutes);
 
 // Other Routes
 app.use("/api/certifications", certificationsRoutes);
 app.use('/api/public/realtime', publicRealtimeRoutes);
-app.use('/api/progress', progressRoutes);
-app.use('/api/modules', modulesRoutes);
-app.use('/api/quizzes', quizzesRoutes);
+app.use('/api/progress', bumpActivity, progressRoutes);
+app.use('/api/modules', invalidateCatalogOnWrite, bumpCatalog, modulesRoutes);
+app.use('/api/quizzes', bumpQuizzes, quizzesRoutes);
 app.use('/api/learning-progress', learningProgressRoutes);
 
 // Serve static files from React build (production only)
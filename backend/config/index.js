@@ -1,17 +1,134 @@
+import os from "os";
+import path from "path";
 import dotenv from "dotenv";
 
 // Load environment variables
 dotenv.config();
 
+// 0 starts one HTTP worker per available core
+const requestedWorkers = Number(process.env.CLUSTER_WORKERS ?? 1);
+const clusterWorkers = requestedWorkers > 0 ? requestedWorkers : os.availableParallelism();
+
 export const config = {
     env: process.env.NODE_ENV || "development",
     port: process.env.PORT || 3000,
+    cluster: {
+        // HTTP worker processes behind one port; 1 runs the API in a single process
+        workers: clusterWorkers,
+        // In-flight requests get this long to finish when a worker is stopped or replaced
+        shutdownTimeoutMs: Number(process.env.SHUTDOWN_TIMEOUT_MS) || 10000,
+    },
+    sharedState: {
+        // Rate-limit and OTP counters: "memory" keeps them in this process, "database" shares them across workers and hosts
+        store: process.env.SHARED_STATE_STORE || (clusterWorkers > 1 ? "database" : "memory"),
+        // How often expired database counters are removed; the memory store expires them every second
+        sweepIntervalMs: Number(process.env.SHARED_STATE_SWEEP_INTERVAL_MS) || 5 * 60 * 1000,
+        // Most counters each limit keeps in the memory store; past this its oldest window is dropped to make room
+        maxEntries: Number(process.env.SHARED_STATE_MAX_ENTRIES) || 100000,
+    },
+    rateLimit: {
+        // Requests per client IP per window across /api/
+        windowMs: Number(process.env.API_RATE_LIMIT_WINDOW_MS) || 15 * 60 * 1000,
+        max: Number(process.env.API_RATE_LIMIT_MAX) || 2000,
+    },
     baseUrl: process.env.BASE_URL || `http://localhost:${process.env.PORT || 3000}`,
     db: {
         host: process.env.DB_HOST,
         user: process.env.DB_USER,
         password: process.env.DB_PASSWORD,
         name: process.env.DB_NAME,
+        // Report each request's query count in an X-DB-Query-Count header (off in production by default)
+        exposeQueryCount: process.env.DB_EXPOSE_QUERY_COUNT
+            ? process.env.DB_EXPOSE_QUERY_COUNT === "true"
+            : process.env.NODE_ENV !== "production",
+        pool: {
+            // Connections opened on demand up to this many; extra queries wait in the queue
+            connectionLimit: Number(process.env.DB_POOL_SIZE) || 10,
+            // Waiting queries beyond this are rejected immediately (0 = unbounded)
+            queueLimit: Number(process.env.DB_POOL_QUEUE_LIMIT ?? 500),
+            // A query still waiting for a connection after this long fails instead of hanging
+            acquireTimeoutMs: Number(process.env.DB_POOL_ACQUIRE_TIMEOUT_MS) || 10000,
+            maxIdle: Number(process.env.DB_POOL_MAX_IDLE) || Number(process.env.DB_POOL_SIZE) || 10,
+            idleTimeoutMs: Number(process.env.DB_POOL_IDLE_TIMEOUT_MS) || 60000,
+        },
+    },
+    // Largest JSON request body, e.g. a course created with all of its modules and quizzes
+    jsonBodyLimit: process.env.JSON_BODY_LIMIT || "5mb",
+    courseImport: {
+        // Courses written per transaction by POST /api/courses/import
+        batchSize: Number(process.env.COURSE_IMPORT_BATCH_SIZE) || 25,
+        maxBytes: Number(process.env.COURSE_IMPORT_MAX_BYTES) || 50 * 1024 * 1024,
+    },
+    progressBuffer: {
+        // Lesson heartbeats are coalesced per (user, lesson) and written in batches this often (0 = write through).
+        // The buffer lives in one process, so with several workers every heartbeat is written through:
+        // a worker's older pending heartbeat would otherwise overwrite a completion recorded by another
+        flushIntervalMs: clusterWorkers > 1 ? 0 : Number(process.env.PROGRESS_FLUSH_INTERVAL_MS ?? 5000),
+        // Flush early once this many (user, lesson) pairs are waiting
+        maxPending: Number(process.env.PROGRESS_BUFFER_MAX_PENDING) || 1000,
+    },
+    catalogCache: {
+        // Public course list and module trees are served from memory this long (0 = always query)
+        ttlMs: Number(process.env.CATALOG_CACHE_TTL_MS ?? 60000),
+        maxEntries: Number(process.env.CATALOG_CACHE_SIZE) || 200,
+    },
+    realtime: {
+        // Most rows returned per table by one realtime delta poll; clients page with the returned cursor
+        deltaLimit: Number(process.env.REALTIME_DELTA_LIMIT) || 500,
+        // Rows younger than this are left for the next poll, so most commits land before the cursor passes them
+        settleSeconds: Number(process.env.REALTIME_DELTA_SETTLE_SECONDS ?? 2),
+        // Each poll re-reads this far below its cursor for rows whose transaction committed late;
+        // keep it above the longest write transaction, e.g. a course import batch or a row lock wait
+        overlapSeconds: Number(process.env.REALTIME_DELTA_OVERLAP_SECONDS ?? 60),
+        // Most rows of that window a cursor remembers as seen (8 bytes each); a busier window is cut short
+        overlapRows: Number(process.env.REALTIME_DELTA_OVERLAP_ROWS) || 200,
+        // How often each open realtime SSE stream polls for new deltas
+        streamIntervalMs: Number(process.env.REALTIME_STREAM_INTERVAL_MS) || 5000,
+        // Open SSE streams allowed per server process
+        maxStreams: Number(process.env.REALTIME_MAX_STREAMS) || 200,
+    },
+    pagination: {
+        // Rows per page of the admin list endpoints when ?limit= is not given
+        defaultLimit: Number(process.env.PAGINATION_DEFAULT_LIMIT) || 100,
+        // Largest ?limit= honoured; bigger requests get this many rows and a next cursor
+        maxLimit: Number(process.env.PAGINATION_MAX_LIMIT) || 1000,
+    },
+    statistics: {
+        // How often counters maintained on write are checked against the source tables (0 = only at startup)
+        reconcileIntervalMs: Number(process.env.STATS_RECONCILE_INTERVAL_MS ?? 15 * 60 * 1000),
+    },
+    emailQueue: {
+        // How often each server process checks email_jobs for due emails (new jobs are also sent right away)
+        pollIntervalMs: Number(process.env.EMAIL_QUEUE_POLL_INTERVAL_MS) || 5000,
+        // Jobs claimed and sent together over the pooled SMTP connections
+        batchSize: Number(process.env.EMAIL_QUEUE_BATCH_SIZE) || 20,
+        // Delivery attempts before a job is marked failed; retries back off exponentially from retryBaseMs
+        maxAttempts: Number(process.env.EMAIL_QUEUE_MAX_ATTEMPTS) || 5,
+        retryBaseMs: Number(process.env.EMAIL_QUEUE_RETRY_BASE_MS) || 30000,
+        // A claimed job whose sender died is picked up again after this long
+        leaseMs: Number(process.env.EMAIL_QUEUE_LEASE_MS) || 2 * 60 * 1000,
+        // Sent, failed and expired jobs are deleted after this long
+        retentionMs: Number(process.env.EMAIL_QUEUE_RETENTION_MS) || 7 * 24 * 60 * 60 * 1000,
+    },
+    passwordHashing: {
+        // Worker threads running bcrypt for signup, login and password resets (0 = hash on the event loop)
+        workers: Number(process.env.PASSWORD_HASH_WORKERS ?? Math.max(1, Math.min(4, os.availableParallelism() - 1))),
+        // Hashes allowed to wait for a worker; beyond this auth requests get a 503 with Retry-After
+        maxQueue: Number(process.env.PASSWORD_HASH_MAX_QUEUE) || 200,
+        // bcrypt cost for new hashes; existing hashes verify at whatever cost they were made with
+        rounds: Number(process.env.BCRYPT_ROUNDS) || 10,
+    },
+    certificatePdf: {
+        // Rendered certificates, one directory per certificate and one file per content hash
+        cacheDir: path.resolve(process.env.CERT_PDF_CACHE_DIR || path.join(os.tmpdir(), "jntugv-certificates")),
+        // Worker threads rendering certificate PDFs (0 = render on the event loop)
+        workers: Number(process.env.CERT_PDF_WORKERS ?? Math.max(1, Math.min(2, os.availableParallelism() - 1))),
+        // Renders allowed to wait for a worker; beyond this downloads get a 503 with Retry-After
+        maxQueue: Number(process.env.CERT_PDF_MAX_QUEUE) || 100,
+    },
+    quizCache: {
+        // Quizzes whose compiled answer keys stay in memory (0 = always reload questions)
+        maxEntries: Number(process.env.QUIZ_CACHE_SIZE ?? 500),
     },
     jwt: {
         secret: process.env.JWT_SECRET,
@@ -1,26 +1,146 @@
 /* eslint-disable no-console */
+import cluster from 'cluster';
 import mysql from 'mysql2';
 import { drizzle } from 'drizzle-orm/mysql2';
 import bcrypt from 'bcryptjs';
 import { randomUUID } from 'crypto';
+import { AsyncLocalStorage } from 'async_hooks';
 import * as schema from './schema.js';
 import { config } from '../config/index.js';
 import logger from '../utils/logger.js';
 
-const connection = mysql.createConnection({
+const poolConfig = config.db.pool;
+
+const connection = mysql.createPool({
   host: config.db.host || 'localhost',
   user: config.db.user || 'root',
   password: config.db.password,
   database: config.db.name,
   port: process.env.DB_PORT ? Number(process.env.DB_PORT) : undefined,
+  waitForConnections: true,
+  connectionLimit: poolConfig.connectionLimit,
+  queueLimit: poolConfig.queueLimit,
+  maxIdle: poolConfig.maxIdle,
+  idleTimeout: poolConfig.idleTimeoutMs,
+  enableKeepAlive: true,
+  // Dates are sent and read as UTC, matching the session time zone set on each connection
+  timezone: 'Z',
+});
+
+// Occupancy is tracked here rather than read from mysql2's private pool arrays
+const poolCounters = {
+  open: 0,
+  leased: 0,
+  waiting: 0,
+  acquired: 0,
+  acquireTimeouts: 0,
+  queueRejections: 0,
+  totalWaitMs: 0,
+  maxWaitMs: 0,
+};
+
+// Connections handed out by getConnection and not yet released
+const leased = new WeakSet();
+
+const endLease = (conn) => {
+  if (leased.delete(conn)) {
+    poolCounters.leased -= 1;
+  }
+};
+
+// mysql2 pools have no acquire timeout, so bound the wait for a free connection here.
+// pool.query/execute and drizzle transactions all acquire through getConnection.
+const acquireConnection = connection.getConnection.bind(connection);
+connection.getConnection = (callback) => {
+  const requestedAt = Date.now();
+  let timedOut = false;
+  poolCounters.waiting += 1;
+  const timer = setTimeout(() => {
+    timedOut = true;
+    poolCounters.waiting -= 1;
+    poolCounters.acquireTimeouts += 1;
+    const error = new Error(`Timed out after ${poolConfig.acquireTimeoutMs}ms waiting for a database connection`);
+    error.code = 'POOL_ACQUIRE_TIMEOUT';
+    callback(error);
+  }, poolConfig.acquireTimeoutMs);
+
+  acquireConnection((error, conn) => {
+    if (timedOut) {
+      conn?.release();
+      return;
+    }
+    clearTimeout(timer);
+    poolCounters.waiting -= 1;
+    if (error) {
+      if (error.message === 'Queue limit reached.') {
+        poolCounters.queueRejections += 1;
+      }
+      callback(error);
+      return;
+    }
+    const waitMs = Date.now() - requestedAt;
+    poolCounters.acquired += 1;
+    poolCounters.totalWaitMs += waitMs;
+    poolCounters.maxWaitMs = Math.max(poolCounters.maxWaitMs, waitMs);
+    leased.add(conn);
+    poolCounters.leased += 1;
+    callback(null, conn);
+  });
+};
+
+connection.on('connection', (conn) => {
+  poolCounters.open += 1;
+  let closed = false;
+  const close = () => {
+    if (closed) return;
+    closed = true;
+    poolCounters.open -= 1;
+    endLease(conn);
+  };
+  const release = conn.release.bind(conn);
+  conn.release = () => {
+    endLease(conn);
+    release();
+  };
+  // Idle timeouts destroy connections; broken ones end or error and leave the pool
+  const destroy = conn.destroy.bind(conn);
+  conn.destroy = () => {
+    close();
+    destroy();
+  };
+  conn.on('end', close);
+  conn.on('error', close);
+
+  // CURRENT_TIMESTAMP defaults and NOW() comparisons must agree with the UTC dates the app writes
+  conn.query("SET time_zone = '+00:00'");
+  logger.debug('Opened MySQL pool connection');
 });
 
-connection.connect((error) => {
+connection.getConnection((error, conn) => {
   if (error) {
     logger.error('Failed to connect to MySQL:', error.message);
     throw error;
   }
-  logger.info('Connected to MySQL database via mysql.createConnection');
+  conn.release();
+  logger.info(`Connected to MySQL database via pool (limit ${poolConfig.connectionLimit})`);
+});
+
+/**
+ * Snapshot of pool occupancy and acquire counters, for /api/health and benchmarks
+ */
+export const getPoolStats = () => ({
+  connectionLimit: poolConfig.connectionLimit,
+  queueLimit: poolConfig.queueLimit,
+  acquireTimeoutMs: poolConfig.acquireTimeoutMs,
+  totalConnections: poolCounters.open,
+  activeConnections: poolCounters.leased,
+  idleConnections: Math.max(poolCounters.open - poolCounters.leased, 0),
+  queuedRequests: poolCounters.waiting,
+  acquired: poolCounters.acquired,
+  acquireTimeouts: poolCounters.acquireTimeouts,
+  queueRejections: poolCounters.queueRejections,
+  avgWaitMs: poolCounters.acquired ? poolCounters.totalWaitMs / poolCounters.acquired : 0,
+  maxWaitMs: poolCounters.maxWaitMs,
 });
 
 const createTablesStatements = [
@@ -272,6 +392,7 @@ const createTablesStatements = [
     order_index INT NOT NULL DEFAULT 1,
     total_questions INT NOT NULL DEFAULT 0,
     total_points INT NOT NULL DEFAULT 0,
+    answer_key_version INT NOT NULL DEFAULT 0,
     created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     CONSTRAINT fk_quizzes_course FOREIGN KEY (course_id) REFERENCES courses(id) ON DELETE CASCADE,
@@ -382,6 +503,38 @@ const createTablesStatements = [
     UNIQUE KEY uk_user_lesson_progress (user_id, lesson_id),
     INDEX idx_user_lesson_progress_user_module (user_id, module_id),
     INDEX idx_user_lesson_progress_enrollment (enrollment_id)
+  ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;`,
+  `CREATE TABLE IF NOT EXISTS content_versions (
+    scope VARCHAR(64) NOT NULL PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+  ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;`,
+  `CREATE TABLE IF NOT EXISTS stat_counters (
+    scope VARCHAR(64) NOT NULL,
+    name VARCHAR(64) NOT NULL,
+    value INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, name)
+  ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;`,
+  `CREATE TABLE IF NOT EXISTS shared_counters (
+    counter_key VARCHAR(191) NOT NULL PRIMARY KEY,
+    hits INT NOT NULL DEFAULT 0,
+    reset_at DATETIME(3) NOT NULL
+  ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;`,
+  `CREATE TABLE IF NOT EXISTS email_jobs (
+    id VARCHAR(36) NOT NULL PRIMARY KEY,
+    kind VARCHAR(32) NOT NULL,
+    recipient VARCHAR(255) NOT NULL,
+    payload JSON,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    run_at DATETIME(3) NOT NULL,
+    expires_at DATETIME(3),
+    locked_by VARCHAR(36),
+    locked_until DATETIME(3),
+    last_error TEXT,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME
   ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;`
 ];
 
@@ -435,6 +588,8 @@ const createPerformanceIndexes = async (client) => {
   await ensureIndexExists(client, 'users', 'idx_users_is_admin', '(is_admin)');
   await ensureIndexExists(client, 'users', 'idx_users_is_active', '(is_active)');
   await ensureIndexExists(client, 'users', 'idx_users_google_id', '(google_id)');
+  await ensureIndexExists(client, 'users', 'idx_users_updated_at', '(updated_at, id)');
+  await ensureIndexExists(client, 'users', 'idx_users_created_at', '(created_at, id)');
 
   // Courses table indexes
   await ensureIndexExists(client, 'courses', 'idx_courses_is_published', '(is_published)');
@@ -443,12 +598,16 @@ const createPerformanceIndexes = async (client) => {
   await ensureIndexExists(client, 'courses', 'idx_courses_slug', '(slug)');
   await ensureIndexExists(client, 'courses', 'idx_courses_created_by', '(created_by)');
   await ensureIndexExists(client, 'courses', 'idx_courses_status', '(status)');
+  await ensureIndexExists(client, 'courses', 'idx_courses_updated_at', '(updated_at, id)');
+  await ensureIndexExists(client, 'courses', 'idx_courses_created_at', '(created_at, id)');
 
   // Enrollments table indexes
   await ensureIndexExists(client, 'enrollments', 'idx_enrollments_user_id', '(user_id)');
   await ensureIndexExists(client, 'enrollments', 'idx_enrollments_course_id', '(course_id)');
   await ensureIndexExists(client, 'enrollments', 'idx_enrollments_status', '(status)');
   await ensureIndexExists(client, 'enrollments', 'idx_enrollments_user_course', '(user_id, course_id)');
+  await ensureIndexExists(client, 'enrollments', 'idx_enrollments_updated_at', '(updated_at, id)');
+  await ensureIndexExists(client, 'enrollments', 'idx_enrollments_created_at', '(created_at, id)');
 
   // Certifications table indexes
   await ensureIndexExists(client, 'certifications', 'idx_certifications_user_id', '(user_id)');
@@ -460,10 +619,19 @@ const createPerformanceIndexes = async (client) => {
   await ensureIndexExists(client, 'payments', 'idx_payments_course_id', '(course_id)');
   await ensureIndexExists(client, 'payments', 'idx_payments_status', '(status)');
   await ensureIndexExists(client, 'payments', 'idx_payments_order_id', '(order_id)');
+  await ensureIndexExists(client, 'payments', 'idx_payments_updated_at', '(updated_at, id)');
+  await ensureIndexExists(client, 'payments', 'idx_payments_created_at', '(created_at, id)');
 
   // Coupons table indexes
   await ensureIndexExists(client, 'coupons', 'idx_coupons_code', '(code)');
   await ensureIndexExists(client, 'coupons', 'idx_coupons_is_active', '(is_active)');
+  await ensureIndexExists(client, 'coupons', 'idx_coupons_updated_at', '(updated_at, id)');
+
+  // Shared counters are swept by expiry
+  await ensureIndexExists(client, 'shared_counters', 'idx_shared_counters_reset_at', '(reset_at)');
+
+  // The email sender claims due pending jobs in run_at order and prunes finished ones by age
+  await ensureIndexExists(client, 'email_jobs', 'idx_email_jobs_status_run_at', '(status, run_at)');
 
   logger.info('✅ Performance indexes created');
 };
@@ -500,6 +668,7 @@ const initializeDatabase = async () => {
   await ensureColumnExists(client, 'enrollments', 'certificate_issued_at', 'certificate_issued_at DATETIME');
   await ensureColumnExists(client, 'enrollments', 'certificate_unlocked_at', 'certificate_unlocked_at DATETIME');
   await ensureColumnExists(client, 'quizzes', 'lesson_id', 'lesson_id VARCHAR(36)');
+  await ensureColumnExists(client, 'quizzes', 'answer_key_version', 'answer_key_version INT NOT NULL DEFAULT 0');
   await ensureColumnExists(client, 'quiz_attempts', 'lesson_id', 'lesson_id VARCHAR(36)');
   await ensureForeignKeyExists(
     client,
@@ -571,9 +740,35 @@ const seedDefaultAdmin = async () => {
   logger.info(`✅ Seeded default admin user (${email}). Remember to rotate ADMIN_PASSWORD after first login.`);
 };
 
-export const db = drizzle(connection.promise(), { schema, mode: 'default' });
+/**
+ * Per-request query counter; countQueries middleware opens a store and drizzle's logger fills it
+ */
+export const queryContext = new AsyncLocalStorage();
+
+const queryTotals = { queries: 0, writes: 0 };
+
+const queryCounter = {
+  logQuery(query) {
+    queryTotals.queries += 1;
+    if (/^\s*(insert|update|delete)\b/i.test(query)) {
+      queryTotals.writes += 1;
+    }
+    const store = queryContext.getStore();
+    if (store) {
+      store.queries += 1;
+    }
+  },
+};
+
+/**
+ * Process-wide statement counts since startup, for /api/health and benchmarks
+ */
+export const getQueryStats = () => ({ ...queryTotals });
+
+export const db = drizzle(connection.promise(), { schema, mode: 'default', logger: queryCounter });
 export const sqlConnection = connection;
-export const dbReady = (async () => {
+// Cluster workers are forked once the primary has prepared the schema, so they skip it
+export const dbReady = cluster.isWorker ? Promise.resolve() : (async () => {
   try {
     await initializeDatabase();
     await seedDefaultAdmin();
@@ -6,6 +6,7 @@ import {
   int,
   json,
   mysqlTable,
+  primaryKey,
   text,
   varchar,
 } from 'drizzle-orm/mysql-core';
@@ -288,6 +289,7 @@ export const quizzes = mysqlTable('quizzes', {
   orderIndex: int('order_index').notNull().default(1),
   totalQuestions: int('total_questions').notNull().default(0),
   totalPoints: int('total_points').notNull().default(0),
+  answerKeyVersion: int('answer_key_version').notNull().default(0), // Bumped whenever questions change
   ...withTimestamps(),
 });
 
@@ -401,3 +403,60 @@ export const userLessonProgress = mysqlTable('user_lesson_progress', {
   notes: text('notes'), // User's notes for this lesson
   ...withTimestamps(),
 });
+
+/**
+ * Content Versions - Counters bumped by every write to a scope of cacheable reads,
+ * used to build ETags without loading or hashing the response
+ */
+export const contentVersions = mysqlTable('content_versions', {
+  scope: varchar('scope', 64).primaryKey(),
+  version: int('version').notNull().default(0),
+  updatedAt: datetime('updated_at')
+    .notNull()
+    .default(sql`CURRENT_TIMESTAMP`),
+});
+
+/**
+ * Shared Counters - Fixed-window rate-limit hits shared by every server process
+ */
+export const sharedCounters = mysqlTable('shared_counters', {
+  key: varchar('counter_key', 191).primaryKey(),
+  hits: int('hits').notNull().default(0),
+  resetAt: datetime('reset_at', { fsp: 3 }).notNull(),
+});
+
+/**
+ * Statistic Counters - Platform and per-user counts kept up to date on write
+ * and periodically reconciled against the source tables
+ */
+export const statCounters = mysqlTable('stat_counters', {
+  scope: varchar('scope', 64).notNull(),
+  name: varchar('name', 64).notNull(),
+  value: int('value').notNull().default(0),
+  updatedAt: datetime('updated_at')
+    .notNull()
+    .default(sql`CURRENT_TIMESTAMP`),
+}, (table) => ({
+  pk: primaryKey({ columns: [table.scope, table.name] }),
+}));
+
+/**
+ * Email Jobs - Outbound emails waiting for, or finished with, the background sender
+ */
+export const emailJobs = mysqlTable('email_jobs', {
+  id: varchar('id', 36).primaryKey(),
+  kind: varchar('kind', 32).notNull(),
+  recipient: varchar('recipient', 255).notNull(),
+  payload: json('payload'),
+  status: varchar('status', 16).notNull().default('pending'),
+  attempts: int('attempts').notNull().default(0),
+  runAt: datetime('run_at', { fsp: 3 }).notNull(),
+  expiresAt: datetime('expires_at', { fsp: 3 }),
+  lockedBy: varchar('locked_by', 36),
+  lockedUntil: datetime('locked_until', { fsp: 3 }),
+  lastError: text('last_error'),
+  createdAt: datetime('created_at')
+    .notNull()
+    .default(sql`CURRENT_TIMESTAMP`),
+  sentAt: datetime('sent_at'),
+});
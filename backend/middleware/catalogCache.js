@@ -0,0 +1,23 @@
+import catalogCache from '../services/catalogCache.js';
+
+/**
+ * Catalog invalidation middleware
+ * Clears the catalog read cache when a write request on the guarded router
+ * succeeds, before its response is sent, so the writer's next read is fresh
+ */
+export const invalidateCatalogOnWrite = (req, res, next) => {
+  if (['GET', 'HEAD', 'OPTIONS'].includes(req.method)) {
+    return next();
+  }
+  const writeHead = res.writeHead;
+  res.writeHead = function writeHeadAfterInvalidation(...args) {
+    const statusCode = typeof args[0] === 'number' ? args[0] : res.statusCode;
+    if (statusCode < 400) {
+      catalogCache.invalidate();
+    }
+    return writeHead.apply(this, args);
+  };
+  next();
+};
+
+export default invalidateCatalogOnWrite;
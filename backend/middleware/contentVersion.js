@@ -0,0 +1,66 @@
+import { bumpContentVersions, getContentEtag } from '../services/contentVersions.js';
+import logger from '../utils/logger.js';
+
+const READ_METHODS = ['GET', 'HEAD', 'OPTIONS'];
+
+const matchesEtag = (header, etag) =>
+  header.trim() === '*' || header.split(',').some((candidate) => candidate.trim() === etag);
+
+/**
+ * Content version bump middleware
+ * Advances the given scopes when a write request on the guarded router succeeds.
+ * The response is held until the bump is stored, so once a client sees its write
+ * acknowledged no conditional GET can revalidate the old content.
+ * @param {Array<string>} scopes - Scopes the router writes
+ * @param {Object} [options]
+ * @param {boolean} [options.adminOnly] - Only bump for writes made by an admin
+ * @param {Array<string>} [options.methods] - Only bump for these request methods
+ */
+export const bumpContentVersionsOnWrite = (scopes, { adminOnly = false, methods } = {}) => (req, res, next) => {
+  if (READ_METHODS.includes(req.method) || (methods && !methods.includes(req.method))) {
+    return next();
+  }
+  const end = res.end;
+  res.end = function endAfterVersionBump(...args) {
+    if (res.statusCode >= 400 || (adminOnly && !req.user?.isAdmin)) {
+      return end.apply(this, args);
+    }
+    bumpContentVersions(scopes)
+      .catch((error) => logger.error(`Failed to bump content versions ${scopes.join(', ')}: ${error.message}`))
+      .finally(() => end.apply(this, args));
+    return this;
+  };
+  next();
+};
+
+/**
+ * Conditional GET middleware
+ * Sets a strong ETag built from the scopes' content versions and answers a
+ * matching If-None-Match with 304 before the route runs its queries. The
+ * versions are read first, so a write landing mid-request can only make the
+ * tag older than the body, never newer. The tag is left on req.contentEtag so
+ * a route's read cache can key its entries by the same versions.
+ * @param {Array<string>} scopes - Scopes the route's response is built from
+ */
+export const conditionalGet = (scopes) => async (req, res, next) => {
+  if (req.method !== 'GET' && req.method !== 'HEAD') {
+    return next();
+  }
+  try {
+    const etag = await getContentEtag(scopes);
+    req.contentEtag = etag;
+    res.setHeader('ETag', etag);
+    // Clients keep the body but revalidate it on every use
+    res.setHeader('Cache-Control', 'no-cache');
+    const ifNoneMatch = req.get('If-None-Match');
+    if (ifNoneMatch && matchesEtag(ifNoneMatch, etag)) {
+      return res.status(304).end();
+    }
+  } catch (error) {
+    // Serve the full response without an ETag rather than fail the read
+    logger.error(`Failed to read content versions ${scopes.join(', ')}: ${error.message}`);
+  }
+  next();
+};
+
+export default conditionalGet;
@@ -20,6 +20,18 @@ export class ApiError extends Error {
   }
 }
 
+/**
+ * Send an ApiError as a JSON response. A 503 comes from a full worker-pool
+ * queue, such as password hashing or certificate rendering, so it also asks
+ * the client to retry shortly.
+ */
+export const sendApiError = (res, error) => {
+  if (error.statusCode === 503) {
+    res.setHeader('Retry-After', '1');
+  }
+  return res.status(error.statusCode).json({ error: error.message });
+};
+
 /**
  * Not Found Error (404)
  */
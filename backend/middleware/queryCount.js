@@ -0,0 +1,20 @@
+import { queryContext } from '../db/index.js';
+
+/**
+ * Query count middleware
+ * Counts the database queries issued while handling a request and reports
+ * the total in an X-DB-Query-Count response header
+ */
+export const countQueries = (req, res, next) => {
+  const store = { queries: 0 };
+  const writeHead = res.writeHead;
+  res.writeHead = function writeHeadWithQueryCount(...args) {
+    if (!res.headersSent) {
+      res.setHeader('X-DB-Query-Count', String(store.queries));
+    }
+    return writeHead.apply(this, args);
+  };
+  queryContext.run(store, next);
+};
+
+export default countQueries;
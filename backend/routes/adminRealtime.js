@@ -9,6 +9,8 @@ import {
   coupons,
 } from '../db/schema.js';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
+import { ApiError } from '../middleware/errorHandler.js';
+import { readDelta, streamDelta } from '../services/realtimeDelta.js';
 import { desc } from 'drizzle-orm';
 
 const router = Router();
@@ -49,6 +51,20 @@ const normalizeCoupon = (record) => {
   };
 };
 
+const sanitizeUser = (user) => {
+  const clone = { ...user };
+  delete clone.password;
+  return clone;
+};
+
+const deltaSources = {
+  courses: { table: courses, toChange: (row) => ({ row }) },
+  enrollments: { table: enrollments, toChange: (row) => ({ row: normalizeEnrollment(row) }) },
+  users: { table: users, toChange: (row) => ({ row: sanitizeUser(row) }) },
+  payments: { table: payments, toChange: (row) => ({ row }) },
+  coupons: { table: coupons, toChange: (row) => ({ row: normalizeCoupon(row) }) },
+};
+
 router.use(authenticateToken, requireAdmin);
 
 router.get('/', async (req, res) => {
@@ -62,11 +78,7 @@ router.get('/', async (req, res) => {
     ]);
 
     const normalizedEnrollments = enrollmentsList.map(normalizeEnrollment).filter(Boolean);
-    const sanitizedUsers = usersList.map((user) => {
-      const clone = { ...user };
-      delete clone.password;
-      return clone;
-    });
+    const sanitizedUsers = usersList.map(sanitizeUser);
 
     const normalizedCoupons = couponsList.map(normalizeCoupon).filter(Boolean);
 
@@ -115,4 +127,26 @@ router.get('/', async (req, res) => {
   }
 });
 
+/**
+ * Rows changed since a cursor, one page per table
+ * GET /api/admin/realtime/delta?cursor=
+ */
+router.get('/delta', async (req, res) => {
+  try {
+    res.json(await readDelta(deltaSources, req.query.cursor));
+  } catch (error) {
+    if (error instanceof ApiError) {
+      return res.status(error.statusCode).json({ error: error.message });
+    }
+    console.error('Admin realtime delta error:', error);
+    res.status(500).json({ error: 'Failed to fetch realtime admin changes' });
+  }
+});
+
+/**
+ * The same changes pushed as server-sent events
+ * GET /api/admin/realtime/stream
+ */
+router.get('/stream', (req, res) => streamDelta(req, res, deltaSources));
+
 export default router;
@@ -1,13 +1,14 @@
 /* eslint-disable no-console */
 import { Router } from 'express';
-import bcrypt from 'bcryptjs';
 import { randomUUID, randomBytes, createHash } from 'crypto';
 import { OAuth2Client } from 'google-auth-library';
 import { db } from '../db/index.js';
 import { users } from '../db/schema.js';
 import { eq } from 'drizzle-orm';
 import { generateToken, authenticateToken } from '../middleware/auth.js';
-import { sendOtpEmail, sendWelcomeEmail } from '../services/email.js';
+import { queueOtpEmail, queueWelcomeEmail } from '../services/emailQueue.js';
+import { hashPassword, verifyPassword } from '../services/passwordHasher.js';
+import { ApiError, sendApiError } from '../middleware/errorHandler.js';
 import {
   generateOTPWithExpiry,
   hashOTP,
@@ -60,7 +61,7 @@ router.post('/signup', validateBody(SignupDTO), async (req, res) => {
       return res.status(400).json({ error: 'User already exists with this email' });
     }
 
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await hashPassword(password);
 
     const userId = randomUUID();
     const resolvedDisplayName = displayName || [firstName, lastName].filter(Boolean).join(' ').trim() || normalizedEmail;
@@ -78,8 +79,8 @@ router.post('/signup', validateBody(SignupDTO), async (req, res) => {
 
     const [newUser] = await db.select().from(users).where(eq(users.id, userId)).limit(1);
 
-    // Send welcome email (non-blocking)
-    sendWelcomeEmail(normalizedEmail, resolvedDisplayName).catch(err => {
+    // Queue the welcome email (non-blocking)
+    queueWelcomeEmail(normalizedEmail, resolvedDisplayName).catch(err => {
       console.error('Welcome email failed:', err);
     });
 
@@ -95,6 +96,9 @@ router.post('/signup', validateBody(SignupDTO), async (req, res) => {
       message: 'Account created successfully'
     });
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Signup error:', error);
     res.status(500).json({ error: 'Failed to create user' });
   }
@@ -116,7 +120,7 @@ router.post('/login', validateBody(LoginDTO), async (req, res) => {
       return res.status(401).json({ error: 'Invalid credentials' });
     }
 
-    const validPassword = await bcrypt.compare(password, user.password);
+    const validPassword = await verifyPassword(password, user.password);
     if (!validPassword) {
       return res.status(401).json({ error: 'Invalid credentials' });
     }
@@ -134,6 +138,9 @@ router.post('/login', validateBody(LoginDTO), async (req, res) => {
 
     res.json({ user: sanitizeUser(user), token });
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Login error:', error);
     res.status(500).json({ error: 'Login failed' });
   }
@@ -150,7 +157,7 @@ router.post('/forgot-password', validateBody(ForgotPasswordDTO), async (req, res
     const normalizedEmail = normalizeEmail(email);
 
     // Check rate limit
-    const rateLimit = checkOTPRateLimit(normalizedEmail, 3, 15);
+    const rateLimit = await checkOTPRateLimit(normalizedEmail, 3, 15);
     if (!rateLimit.allowed) {
       return res.status(429).json({
         error: rateLimit.error,
@@ -191,12 +198,12 @@ router.post('/forgot-password', validateBody(ForgotPasswordDTO), async (req, res
       .where(eq(users.id, user.id))
       .execute();
 
-    // Send OTP via email
-    const emailResult = await sendOtpEmail(user.email, otp, expiryMinutes);
+    // Queue the OTP email; the background sender delivers it, so SMTP latency never reaches this response
+    const jobId = await queueOtpEmail(user.email, otp, expiryMinutes, expiresAt);
 
-    if (emailResult.success) {
-      console.log(`[OTP] Email sent successfully to ${user.email}`);
-    } else if (emailResult.skipped) {
+    if (jobId) {
+      console.log(`[OTP] Email queued for ${user.email}`);
+    } else {
       console.warn(`[OTP] Email service not configured. OTP for ${email}: ${otp}`);
       // In development, show OTP in response when email is not configured
       if (process.env.NODE_ENV !== 'production') {
@@ -204,8 +211,6 @@ router.post('/forgot-password', validateBody(ForgotPasswordDTO), async (req, res
         genericResponse.expiresAt = expiresAt.toISOString();
         genericResponse.emailSkipped = true;
       }
-    } else {
-      console.error(`[OTP] Failed to send email: ${emailResult.message}`);
     }
 
     // Always show OTP in development mode for testing
@@ -313,7 +318,7 @@ router.post('/reset-password', validateBody(ResetPasswordDTO), async (req, res)
       return res.status(400).json({ error: 'Invalid or expired reset token' });
     }
 
-    const hashedPassword = await bcrypt.hash(resolvedPassword, 10);
+    const hashedPassword = await hashPassword(resolvedPassword);
 
     await db
       .update(users)
@@ -345,6 +350,9 @@ router.post('/reset-password', validateBody(ResetPasswordDTO), async (req, res)
       token: authToken,
     });
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Reset password error:', error);
     res.status(500).json({ error: 'Failed to reset password' });
   }
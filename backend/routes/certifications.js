@@ -2,11 +2,12 @@
 import { Router } from 'express';
 import { randomUUID } from 'crypto';
 import { and, desc, eq } from 'drizzle-orm';
-import PDFDocument from 'pdfkit';
 import { db } from '../db/index.js';
 import { certifications, users, courses } from '../db/schema.js';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
-import { sendCertificateIssuedEmail } from '../services/email.js';
+import { ApiError, sendApiError } from '../middleware/errorHandler.js';
+import { getCertificatePdf, invalidateCertificatePdf } from '../services/certificatePdfCache.js';
+import { queueCertificateIssuedEmail } from '../services/emailQueue.js';
 
 const router = Router();
 
@@ -382,6 +383,9 @@ router.put('/:id', requireAdmin, async (req, res) => {
       .where(eq(certifications.id, certificationId))
       .limit(1);
 
+    // Any change can alter the certificate or revoke it, so drop its rendered PDF
+    await invalidateCertificatePdf(certificationId);
+
     // Send email notification when certificate is newly issued
     const wasNotIssued = existing.status !== 'ISSUED';
     const isNowIssued = nextStatus === 'ISSUED';
@@ -395,17 +399,15 @@ router.put('/:id', requireAdmin, async (req, res) => {
 
         if (certUser?.email) {
           const courseTitle = updated.metadata?.courseTitle || 'your course';
-          const emailResult = await sendCertificateIssuedEmail({
+          const jobId = await queueCertificateIssuedEmail({
             email: certUser.email,
             userName: certUser.displayName || certUser.firstName || 'Graduate',
             courseTitle,
             certificateId: updated.id,
           });
 
-          if (emailResult.success) {
-            console.log(`[Certificate] Email sent to ${certUser.email} for certificate: ${updated.id}`);
-          } else if (!emailResult.skipped) {
-            console.warn(`[Certificate] Failed to send email: ${emailResult.message}`);
+          if (jobId) {
+            console.log(`[Certificate] Email queued for ${certUser.email} for certificate: ${updated.id}`);
           }
         }
       } catch (emailError) {
@@ -429,6 +431,7 @@ router.delete('/:id', requireAdmin, async (req, res) => {
     if (!existing) return res.status(404).json({ error: 'Not found' });
 
     await db.delete(certifications).where(eq(certifications.id, certificationId)).execute();
+    await invalidateCertificatePdf(certificationId);
 
     res.status(204).send();
   } catch (error) {
@@ -438,7 +441,7 @@ router.delete('/:id', requireAdmin, async (req, res) => {
 });
 
 /**
- * Generate and download certificate PDF
+ * Download certificate PDF, rendered once and then served from the on-disk cache
  * GET /api/certifications/:id/pdf
  */
 router.get('/:id/pdf', async (req, res) => {
@@ -446,15 +449,18 @@ router.get('/:id/pdf', async (req, res) => {
     const certificationId = req.params.id;
     
     // Get certification with user and course data
-    const [certRecord] = await db
-      .select()
+    const [row] = await db
+      .select({ certRecord: certifications, certUser: users, course: courses })
       .from(certifications)
+      .leftJoin(users, eq(users.id, certifications.userId))
+      .leftJoin(courses, eq(courses.id, certifications.courseId))
       .where(eq(certifications.id, certificationId))
       .limit(1);
 
-    if (!certRecord) {
+    if (!row) {
       return res.status(404).json({ error: 'Certification not found' });
     }
+    const { certRecord, certUser, course } = row;
 
     // Security check: Must be owner or admin
     if (certRecord.userId !== req.user.id && !req.user.isAdmin) {
@@ -466,20 +472,6 @@ router.get('/:id/pdf', async (req, res) => {
       return res.status(400).json({ error: 'Certificate has not been issued yet' });
     }
 
-    // Get user details
-    const [certUser] = await db
-      .select()
-      .from(users)
-      .where(eq(users.id, certRecord.userId))
-      .limit(1);
-
-    // Get course details
-    const [course] = await db
-      .select()
-      .from(courses)
-      .where(eq(courses.id, certRecord.courseId))
-      .limit(1);
-
     // Extract metadata
     const metadata = toObject(certRecord.metadata);
     const studentName = certUser?.displayName || certUser?.firstName 
@@ -487,12 +479,12 @@ router.get('/:id/pdf', async (req, res) => {
       : metadata.recipientName || 'Student';
     const courseName = course?.title || metadata.courseTitle || metadata.courseName || 'Course';
     const instructor = course?.instructor || metadata.instructor || 'JNTU-GV Faculty';
-    const completionDate = certRecord.issuedAt || certRecord.createdAt || new Date();
+    const completionDate = new Date(certRecord.issuedAt || certRecord.createdAt || Date.now()).toISOString();
     const score = certRecord.overallScore || metadata.score || null;
     const grade = metadata.grade || scoreToGrade(score);
 
-    // Generate PDF
-    const pdfBuffer = await generateCertificatePDF({
+    // Render on a miss; the file is named by the hash of these details
+    const pdf = await getCertificatePdf({
       certificateId: certificationId,
       studentName,
       courseName,
@@ -509,10 +501,20 @@ router.get('/:id/pdf', async (req, res) => {
     
     res.setHeader('Content-Type', 'application/pdf');
     res.setHeader('Content-Disposition', `attachment; filename="${fileName}"`);
-    res.setHeader('Content-Length', pdfBuffer.length);
-    
-    res.send(pdfBuffer);
+    res.setHeader('ETag', `"${pdf.hash}"`);
+    res.setHeader('Cache-Control', 'private, no-cache');
+
+    // Streams the file and answers Range, If-Range and If-None-Match against the ETag above
+    res.sendFile(pdf.path, { dotfiles: 'allow', lastModified: false }, (error) => {
+      if (error && !res.headersSent) {
+        console.error('Send certificate PDF error:', error);
+        res.status(500).json({ error: 'Failed to generate certificate PDF' });
+      }
+    });
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Generate PDF error:', error);
     res.status(500).json({ error: 'Failed to generate certificate PDF' });
   }
@@ -530,199 +532,4 @@ const scoreToGrade = (score) => {
   return 'Pass';
 };
 
-/**
- * Helper: Format date for certificate
- */
-const formatCertDate = (date) => {
-  const d = new Date(date);
-  const options = { year: 'numeric', month: 'long', day: 'numeric' };
-  return d.toLocaleDateString('en-US', options);
-};
-
-/**
- * Generate Certificate PDF using PDFKit
- */
-const generateCertificatePDF = async ({
-  certificateId,
-  studentName,
-  courseName,
-  completionDate,
-  instructor,
-  score,
-  grade,
-  duration,
-}) => {
-  return new Promise((resolve, reject) => {
-    try {
-      const doc = new PDFDocument({
-        size: 'A4',
-        layout: 'landscape',
-        margins: { top: 40, bottom: 40, left: 50, right: 50 },
-        info: {
-          Title: `Certificate - ${courseName}`,
-          Author: 'JNTU-GV NxtGen Certification',
-          Subject: 'Course Completion Certificate',
-        },
-      });
-
-      const chunks = [];
-      doc.on('data', (chunk) => chunks.push(chunk));
-      doc.on('end', () => resolve(Buffer.concat(chunks)));
-      doc.on('error', reject);
-
-      const pageWidth = doc.page.width;
-      const pageHeight = doc.page.height;
-
-      // Background
-      doc.rect(0, 0, pageWidth, pageHeight).fill('#FAFBFC');
-      
-      // Decorative border - JNTU-GV blue
-      doc.rect(20, 20, pageWidth - 40, pageHeight - 40)
-        .lineWidth(8)
-        .stroke('#004080');
-      
-      // Inner gold accent border
-      doc.rect(30, 30, pageWidth - 60, pageHeight - 60)
-        .lineWidth(2)
-        .stroke('#D4AF37');
-
-      // Corner decorations
-      const corners = [
-        { x: 40, y: 40 },
-        { x: pageWidth - 70, y: 40 },
-        { x: 40, y: pageHeight - 70 },
-        { x: pageWidth - 70, y: pageHeight - 70 },
-      ];
-      corners.forEach(({ x, y }) => {
-        doc.rect(x, y, 30, 30).lineWidth(1).stroke('#D4AF37');
-      });
-
-      // Header
-      let yPos = 60;
-      doc.fontSize(16)
-        .font('Helvetica-Bold')
-        .fillColor('#004080')
-        .text('JNTU-GV', 0, yPos, { align: 'center' });
-      
-      yPos += 20;
-      doc.fontSize(10)
-        .font('Helvetica')
-        .fillColor('#666666')
-        .text('Jawaharlal Nehru Technological University - Gurajada Vishakhapatnam', 0, yPos, { align: 'center' });
-
-      // Certificate Title
-      yPos += 45;
-      doc.fontSize(38)
-        .font('Helvetica-Bold')
-        .fillColor('#004080')
-        .text('CERTIFICATE', 0, yPos, { align: 'center' });
-      
-      yPos += 45;
-      doc.fontSize(18)
-        .font('Helvetica')
-        .fillColor('#666666')
-        .text('OF COMPLETION', 0, yPos, { align: 'center' });
-
-      // Decorative line
-      yPos += 30;
-      const lineWidth = 200;
-      doc.moveTo((pageWidth - lineWidth) / 2, yPos)
-        .lineTo((pageWidth + lineWidth) / 2, yPos)
-        .lineWidth(2)
-        .stroke('#D4AF37');
-
-      // Main content
-      yPos += 25;
-      doc.fontSize(14)
-        .font('Helvetica')
-        .fillColor('#333333')
-        .text('This is to certify that', 0, yPos, { align: 'center' });
-
-      // Student Name
-      yPos += 30;
-      doc.fontSize(28)
-        .font('Helvetica-Bold')
-        .fillColor('#004080')
-        .text(studentName, 0, yPos, { align: 'center' });
-
-      // Underline for name
-      yPos += 35;
-      const nameWidth = 300;
-      doc.moveTo((pageWidth - nameWidth) / 2, yPos)
-        .lineTo((pageWidth + nameWidth) / 2, yPos)
-        .lineWidth(1)
-        .stroke('#D4AF37');
-
-      yPos += 15;
-      doc.fontSize(14)
-        .font('Helvetica')
-        .fillColor('#333333')
-        .text('has successfully completed the course', 0, yPos, { align: 'center' });
-
-      // Course Name
-      yPos += 30;
-      doc.fontSize(22)
-        .font('Helvetica-Bold')
-        .fillColor('#004080')
-        .text(`"${courseName}"`, 0, yPos, { align: 'center' });
-
-      // Course details
-      yPos += 35;
-      let detailsText = `Completed on: ${formatCertDate(completionDate)}`;
-      if (duration) detailsText += `  |  Duration: ${duration} hours`;
-      if (score !== null && score > 0) detailsText += `  |  Score: ${score}%`;
-      
-      doc.fontSize(11)
-        .font('Helvetica')
-        .fillColor('#666666')
-        .text(detailsText, 0, yPos, { align: 'center' });
-
-      // Signature section
-      yPos += 55;
-      
-      // Left signature (Instructor)
-      const leftX = 150;
-      doc.moveTo(leftX, yPos).lineTo(leftX + 150, yPos).lineWidth(1).stroke('#333333');
-      doc.fontSize(12)
-        .font('Helvetica-Bold')
-        .fillColor('#333333')
-        .text(instructor, leftX, yPos + 10, { width: 150, align: 'center' });
-      doc.fontSize(10)
-        .font('Helvetica')
-        .fillColor('#666666')
-        .text('Course Instructor', leftX, yPos + 25, { width: 150, align: 'center' });
-
-      // Right signature (Director)
-      const rightX = pageWidth - 300;
-      doc.moveTo(rightX, yPos).lineTo(rightX + 150, yPos).lineWidth(1).stroke('#333333');
-      doc.fontSize(12)
-        .font('Helvetica-Bold')
-        .fillColor('#333333')
-        .text('Dr. A. Srinivasa Rao', rightX, yPos + 10, { width: 150, align: 'center' });
-      doc.fontSize(10)
-        .font('Helvetica')
-        .fillColor('#666666')
-        .text('Director, JNTU-GV', rightX, yPos + 25, { width: 150, align: 'center' });
-
-      // Footer
-      yPos = pageHeight - 75;
-      doc.fontSize(9)
-        .font('Helvetica')
-        .fillColor('#888888')
-        .text(`Certificate ID: ${certificateId}`, 60, yPos, { align: 'left' });
-      
-      doc.text(`Grade: ${grade}`, pageWidth - 150, yPos, { align: 'right' });
-
-      yPos += 15;
-      doc.fontSize(8)
-        .fillColor('#666666')
-        .text('Verify this certificate at: https://certification.jntugv.edu.in/verify', 0, yPos, { align: 'center' });
-
-      doc.end();
-    } catch (error) {
-      reject(error);
-    }
-  });
-};
-
 export default router;
\ No newline at end of file
@@ -5,6 +5,7 @@ import { db } from '../db/index.js';
 import { coupons } from '../db/schema.js';
 import { eq } from 'drizzle-orm';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
+import { writeWithStatChanges } from '../services/statistics.js';
 
 const router = Router();
 
@@ -284,12 +285,12 @@ router.post('/', authenticateToken, requireAdmin, async (req, res) => {
       return res.status(400).json({ error: 'Coupon name is required' });
     }
 
-    await db.insert(coupons).values({
-      id: couponId,
-      ...normalizedInput,
-    }).execute();
-
-    const [newCoupon] = await db.select().from(coupons).where(eq(coupons.id, couponId)).limit(1);
+    const { after: newCoupon } = await writeWithStatChanges('coupon', coupons, eq(coupons.id, couponId), (tx) => tx
+      .insert(coupons)
+      .values({
+        id: couponId,
+        ...normalizedInput,
+      }));
     res.status(201).json(newCoupon);
   } catch (error) {
     console.error('Create coupon error:', error);
@@ -310,12 +311,10 @@ router.put('/:id', authenticateToken, requireAdmin, async (req, res) => {
       isNew: false,
     });
 
-    await db.update(coupons)
+    const { after: updatedCoupon } = await writeWithStatChanges('coupon', coupons, eq(coupons.id, req.params.id), (tx) => tx
+      .update(coupons)
       .set(normalizedInput)
-      .where(eq(coupons.id, req.params.id))
-      .execute();
-
-    const [updatedCoupon] = await db.select().from(coupons).where(eq(coupons.id, req.params.id)).limit(1);
+      .where(eq(coupons.id, req.params.id)));
 
     res.json(updatedCoupon);
   } catch (error) {
@@ -326,7 +325,9 @@ router.put('/:id', authenticateToken, requireAdmin, async (req, res) => {
 
 router.delete('/:id', authenticateToken, requireAdmin, async (req, res) => {
   try {
-    await db.delete(coupons).where(eq(coupons.id, req.params.id));
+    await writeWithStatChanges('coupon', coupons, eq(coupons.id, req.params.id), (tx) => tx
+      .delete(coupons)
+      .where(eq(coupons.id, req.params.id)));
     res.json({ message: 'Coupon deleted successfully' });
   } catch (error) {
     console.error('Delete coupon error:', error);
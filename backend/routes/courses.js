@@ -2,10 +2,18 @@
 /* eslint-disable no-console */
 import { Router } from 'express';
 import { randomUUID } from 'crypto';
+import readline from 'readline';
 import { db } from '../db/index.js';
+import { config } from '../config/index.js';
+import catalogCache from '../services/catalogCache.js';
+import { CONTENT_SCOPES } from '../services/contentVersions.js';
+import { recordStatChanges, requestStatisticsReconcile, writeWithStatChanges } from '../services/statistics.js';
+import { parseFields, readPage, setPageHeaders } from '../services/keysetPagination.js';
 import { courses, courseModules, moduleLessons, quizzes, quizQuestions } from '../db/schema.js';
 import { and, eq, ilike, desc } from 'drizzle-orm';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
+import { conditionalGet } from '../middleware/contentVersion.js';
+import { ApiError } from '../middleware/errorHandler.js';
 import { validateBody, validateUUID } from '../middleware/validation.middleware.js';
 import { CreateCourseDTO, UpdateCourseDTO } from '../dto/index.js';
 
@@ -261,125 +269,164 @@ const coerceNumber = (value, fallback = 0) => {
   return Number.isFinite(numericValue) ? numericValue : fallback;
 };
 
-const syncCourseStructure = async (courseId, modulesData = [], { replaceExisting = false } = {}) => {
-  if (!Array.isArray(modulesData) || modulesData.length === 0) {
-    return;
+// Rows per multi-row INSERT, well under MySQL's 65,535 placeholder limit for these tables
+const INSERT_CHUNK_SIZE = 1000;
+
+const insertInChunks = async (tx, table, rows) => {
+  for (let start = 0; start < rows.length; start += INSERT_CHUNK_SIZE) {
+    await tx.insert(table).values(rows.slice(start, start + INSERT_CHUNK_SIZE));
   }
+};
 
-  await db.transaction(async (tx) => {
-    if (replaceExisting) {
-      await tx.delete(courseModules).where(eq(courseModules.courseId, courseId));
-    }
+/**
+ * Flatten nested module data into the module, lesson, quiz and question rows to insert
+ */
+const buildCourseStructureRows = (courseId, modulesData = []) => {
+  const rows = { modules: [], lessons: [], quizzes: [], questions: [] };
+
+  for (let moduleIndex = 0; moduleIndex < modulesData.length; moduleIndex += 1) {
+    const moduleData = modulesData[moduleIndex] || {};
+    const moduleId = isUuid(moduleData.id) ? moduleData.id : randomUUID();
+
+    rows.modules.push({
+      id: moduleId,
+      courseId,
+      title: moduleData.title || '',
+      description: moduleData.description || null,
+      summary: moduleData.summary || null,
+      orderIndex: coerceInt(moduleData.order, moduleIndex + 1),
+      duration: coerceInt(moduleData.duration, 0),
+      contentType: toTrimmedString(moduleData.contentType) || 'video',
+      contentUrl: toTrimmedString(moduleData.contentUrl ?? moduleData.content) || null,
+      contentData: moduleData.contentData ? JSON.stringify(moduleData.contentData) : null,
+      isFreePreview: Boolean(moduleData.isFreePreview),
+      isPublished: moduleData.isPublished !== false,
+      requiresPreviousCompletion: moduleData.requiresPreviousCompletion !== false,
+      passingScore: coerceInt(moduleData.passingScore ?? moduleData?.quiz?.passingScore, 70),
+      resources: JSON.stringify(moduleData.resources || []),
+    });
+
+    const lessons = Array.isArray(moduleData.lessons) ? moduleData.lessons : [];
+    for (let lessonIndex = 0; lessonIndex < lessons.length; lessonIndex += 1) {
+      const lessonData = lessons[lessonIndex] || {};
+      const lessonId = isUuid(lessonData.id) ? lessonData.id : randomUUID();
+
+      const resourcesPayload = Array.isArray(lessonData.resources) && lessonData.resources.length > 0
+        ? { resources: lessonData.resources }
+        : null;
+      const serializedContentData = lessonData.contentData
+        ? JSON.stringify(lessonData.contentData)
+        : resourcesPayload
+          ? JSON.stringify(resourcesPayload)
+          : null;
 
-    for (let moduleIndex = 0; moduleIndex < modulesData.length; moduleIndex += 1) {
-      const moduleData = modulesData[moduleIndex] || {};
-      const moduleId = isUuid(moduleData.id) ? moduleData.id : randomUUID();
-
-      await tx.insert(courseModules).values({
-        id: moduleId,
-        courseId,
-        title: moduleData.title || '',
-        description: moduleData.description || null,
-        summary: moduleData.summary || null,
-        orderIndex: coerceInt(moduleData.order, moduleIndex + 1),
-        duration: coerceInt(moduleData.duration, 0),
-        contentType: toTrimmedString(moduleData.contentType) || 'video',
-        contentUrl: toTrimmedString(moduleData.contentUrl ?? moduleData.content) || null,
-        contentData: moduleData.contentData ? JSON.stringify(moduleData.contentData) : null,
-        isFreePreview: Boolean(moduleData.isFreePreview),
-        isPublished: moduleData.isPublished !== false,
-        requiresPreviousCompletion: moduleData.requiresPreviousCompletion !== false,
-        passingScore: coerceInt(moduleData.passingScore ?? moduleData?.quiz?.passingScore, 70),
-        resources: JSON.stringify(moduleData.resources || []),
+      rows.lessons.push({
+        id: lessonId,
+        moduleId,
+        title: lessonData.title || '',
+        description: lessonData.description || null,
+        orderIndex: coerceInt(lessonData.order, lessonIndex + 1),
+        duration: coerceInt(lessonData.duration, 0),
+        contentType: toTrimmedString(lessonData.type) || 'video',
+        contentUrl: toTrimmedString(lessonData.content) || null,
+        contentData: serializedContentData,
+        isFreePreview: Boolean(lessonData.isFreePreview),
+        isPublished: lessonData.isPublished !== false,
       });
 
-      const lessons = Array.isArray(moduleData.lessons) ? moduleData.lessons : [];
-      for (let lessonIndex = 0; lessonIndex < lessons.length; lessonIndex += 1) {
-        const lessonData = lessons[lessonIndex] || {};
-        const lessonId = isUuid(lessonData.id) ? lessonData.id : randomUUID();
+      const quizData = lessonData.quiz;
+      const questions = Array.isArray(quizData?.questions) ? quizData.questions : [];
+      if (quizData && questions.length > 0) {
+        const quizId = isUuid(quizData.id) ? quizData.id : randomUUID();
+        const totalPoints = questions.length * DEFAULT_QUIZ_POINTS;
 
-        const resourcesPayload = Array.isArray(lessonData.resources) && lessonData.resources.length > 0
-          ? { resources: lessonData.resources }
-          : null;
-        const serializedContentData = lessonData.contentData
-          ? JSON.stringify(lessonData.contentData)
-          : resourcesPayload
-            ? JSON.stringify(resourcesPayload)
-            : null;
-
-        await tx.insert(moduleLessons).values({
-          id: lessonId,
+        rows.quizzes.push({
+          id: quizId,
+          courseId,
           moduleId,
-          title: lessonData.title || '',
-          description: lessonData.description || null,
-          orderIndex: coerceInt(lessonData.order, lessonIndex + 1),
-          duration: coerceInt(lessonData.duration, 0),
-          contentType: toTrimmedString(lessonData.type) || 'video',
-          contentUrl: toTrimmedString(lessonData.content) || null,
-          contentData: serializedContentData,
-          isFreePreview: Boolean(lessonData.isFreePreview),
-          isPublished: lessonData.isPublished !== false,
+          lessonId,
+          title: quizData.title || `${lessonData.title || 'Lesson'} Quiz`,
+          description: quizData.description || null,
+          instructions: quizData.instructions || null,
+          passingScore: coerceInt(quizData.passingScore, 70),
+          timeLimit: toPositiveIntegerOrNull(quizData.timeLimit),
+          maxAttempts: toPositiveIntegerOrNull(quizData.maxAttempts),
+          shuffleQuestions: Boolean(quizData.shuffleQuestions),
+          shuffleOptions: Boolean(quizData.shuffleOptions),
+          showCorrectAnswers: quizData.showCorrectAnswers === true,
+          showScore: quizData.showScore !== false,
+          isRequired: quizData.isRequired !== false,
+          isPublished: quizData.isPublished !== false,
+          orderIndex: coerceInt(quizData.orderIndex, lessonIndex + 1),
+          totalQuestions: questions.length,
+          totalPoints,
         });
 
-        const quizData = lessonData.quiz;
-        const questions = Array.isArray(quizData?.questions) ? quizData.questions : [];
-        if (quizData && questions.length > 0) {
-          const quizId = isUuid(quizData.id) ? quizData.id : randomUUID();
-          const totalPoints = questions.length * DEFAULT_QUIZ_POINTS;
-
-          await tx.insert(quizzes).values({
-            id: quizId,
-            courseId,
-            moduleId,
-            lessonId,
-            title: quizData.title || `${lessonData.title || 'Lesson'} Quiz`,
-            description: quizData.description || null,
-            instructions: quizData.instructions || null,
-            passingScore: coerceInt(quizData.passingScore, 70),
-            timeLimit: toPositiveIntegerOrNull(quizData.timeLimit),
-            maxAttempts: toPositiveIntegerOrNull(quizData.maxAttempts),
-            shuffleQuestions: Boolean(quizData.shuffleQuestions),
-            shuffleOptions: Boolean(quizData.shuffleOptions),
-            showCorrectAnswers: quizData.showCorrectAnswers === true,
-            showScore: quizData.showScore !== false,
-            isRequired: quizData.isRequired !== false,
-            isPublished: quizData.isPublished !== false,
-            orderIndex: coerceInt(quizData.orderIndex, lessonIndex + 1),
-            totalQuestions: questions.length,
-            totalPoints,
+        for (let questionIndex = 0; questionIndex < questions.length; questionIndex += 1) {
+          const questionData = questions[questionIndex] || {};
+          const questionId = isUuid(questionData.id) ? questionData.id : randomUUID();
+          const options = ensureArray(questionData.options);
+          const correctIndex = Number.isFinite(Number(questionData.correctOptionIndex))
+            ? Number(questionData.correctOptionIndex)
+            : options.findIndex((option) => option === questionData.correctAnswer);
+          const boundedIndex = correctIndex >= 0 && correctIndex < options.length ? correctIndex : 0;
+          const correctAnswer = typeof questionData.correctAnswer === 'string'
+            ? questionData.correctAnswer
+            : options[boundedIndex];
+
+          rows.questions.push({
+            id: questionId,
+            quizId,
+            questionText: questionData.questionText || '',
+            questionType: toTrimmedString(questionData.questionType) || 'multiple_choice',
+            options: JSON.stringify(options),
+            correctAnswer: correctAnswer || '',
+            explanation: questionData.explanation || null,
+            points: coerceInt(questionData.points, DEFAULT_QUIZ_POINTS),
+            orderIndex: coerceInt(questionData.orderIndex, questionIndex + 1),
+            difficulty: toTrimmedString(questionData.difficulty) || 'medium',
+            tags: JSON.stringify(questionData.tags || []),
+            isActive: questionData.isActive !== false,
           });
-
-          for (let questionIndex = 0; questionIndex < questions.length; questionIndex += 1) {
-            const questionData = questions[questionIndex] || {};
-            const questionId = isUuid(questionData.id) ? questionData.id : randomUUID();
-            const options = ensureArray(questionData.options);
-            const correctIndex = Number.isFinite(Number(questionData.correctOptionIndex))
-              ? Number(questionData.correctOptionIndex)
-              : options.findIndex((option) => option === questionData.correctAnswer);
-            const boundedIndex = correctIndex >= 0 && correctIndex < options.length ? correctIndex : 0;
-            const correctAnswer = typeof questionData.correctAnswer === 'string'
-              ? questionData.correctAnswer
-              : options[boundedIndex];
-
-            await tx.insert(quizQuestions).values({
-              id: questionId,
-              quizId,
-              questionText: questionData.questionText || '',
-              questionType: toTrimmedString(questionData.questionType) || 'multiple_choice',
-              options: JSON.stringify(options),
-              correctAnswer: correctAnswer || '',
-              explanation: questionData.explanation || null,
-              points: coerceInt(questionData.points, DEFAULT_QUIZ_POINTS),
-              orderIndex: coerceInt(questionData.orderIndex, questionIndex + 1),
-              difficulty: toTrimmedString(questionData.difficulty) || 'medium',
-              tags: JSON.stringify(questionData.tags || []),
-              isActive: questionData.isActive !== false,
-            });
-          }
         }
       }
     }
-  });
+  }
+
+  return rows;
+};
+
+/**
+ * Insert course rows and their nested structure inside an open transaction,
+ * one multi-row INSERT per table instead of one per module, lesson and question
+ * @param {Object} tx - Drizzle transaction
+ * @param {Array<Object>} courseRows - Courses to insert; may be empty when only the structure changes
+ * @param {Array<{courseId: string, modules: Array}>} structures - Module trees per course
+ * @param {Object} options
+ * @param {boolean} options.replaceExisting - Delete each course's current modules first
+ */
+const writeCourses = async (tx, courseRows, structures, { replaceExisting = false } = {}) => {
+  const rows = { modules: [], lessons: [], quizzes: [], questions: [] };
+  for (const { courseId, modules } of structures) {
+    if (!Array.isArray(modules) || modules.length === 0) {
+      continue;
+    }
+    if (replaceExisting) {
+      await tx.delete(courseModules).where(eq(courseModules.courseId, courseId));
+    }
+    const courseStructure = buildCourseStructureRows(courseId, modules);
+    for (const key of Object.keys(rows)) {
+      rows[key].push(...courseStructure[key]);
+    }
+  }
+
+  // Parents before children so every foreign key already exists
+  await insertInChunks(tx, courses, courseRows);
+  await recordStatChanges(courseRows.map((row) => ({ kind: 'course', before: null, after: row })), tx);
+  await insertInChunks(tx, courseModules, rows.modules);
+  await insertInChunks(tx, moduleLessons, rows.lessons);
+  await insertInChunks(tx, quizzes, rows.quizzes);
+  await insertInChunks(tx, quizQuestions, rows.questions);
 };
 
 const normalizeCourseInput = (input = {}, { isNew = false, userId } = {}) => {
@@ -598,38 +645,47 @@ const normalizeCourseInput = (input = {}, { isNew = false, userId } = {}) => {
   );
 };
 
-router.get('/', async (req, res) => {
-  try {
-    const { category, featured, q, limit, includeDrafts } = req.query || {};
+const listPublicCourses = async ({ category, featured, q, limit, includeDrafts }) => {
+  const conditions = [];
+  if (!includeDrafts) {
+    conditions.push(eq(courses.isPublished, true));
+  }
+  if (category) {
+    conditions.push(ilike(courses.category, `%${category}%`));
+  }
+  if (featured) {
+    conditions.push(eq(courses.isFeatured, String(featured).toLowerCase() === 'true'));
+  }
+  if (q) {
+    conditions.push(ilike(courses.title, `%${q}%`));
+  }
 
-    const conditions = [];
-    if (!includeDrafts) {
-      conditions.push(eq(courses.isPublished, true));
-    }
-    if (category) {
-      conditions.push(ilike(courses.category, `%${category}%`));
-    }
-    if (featured) {
-      conditions.push(eq(courses.isFeatured, String(featured).toLowerCase() === 'true'));
-    }
-    if (q) {
-      conditions.push(ilike(courses.title, `%${q}%`));
-    }
+  let query = db.select().from(courses).orderBy(desc(courses.createdAt));
+  if (conditions.length === 1) {
+    query = query.where(conditions[0]);
+  } else if (conditions.length > 1) {
+    query = query.where(and(...conditions));
+  }
 
-    let query = db.select().from(courses).orderBy(desc(courses.createdAt));
-    if (conditions.length === 1) {
-      query = query.where(conditions[0]);
-    } else if (conditions.length > 1) {
-      query = query.where(and(...conditions));
-    }
+  const numericLimit = Number.parseInt(limit, 10);
+  if (Number.isFinite(numericLimit) && numericLimit > 0) {
+    query = query.limit(numericLimit);
+  }
 
-    const numericLimit = Number.parseInt(limit, 10);
-    if (Number.isFinite(numericLimit) && numericLimit > 0) {
-      query = query.limit(numericLimit);
-    }
+  return query;
+};
 
-    const allCourses = await query;
-    res.json(allCourses);
+router.get('/', conditionalGet([CONTENT_SCOPES.catalog]), async (req, res) => {
+  try {
+    const { category, featured, q, limit, includeDrafts } = req.query || {};
+    const filters = { category, featured, q, limit, includeDrafts };
+
+    const body = await catalogCache.get(
+      `courses:${JSON.stringify(filters)}`,
+      () => listPublicCourses(filters),
+      { version: req.contentEtag },
+    );
+    res.type('json').send(body);
   } catch (error) {
     if (error?.code === 'ER_NO_SUCH_TABLE') {
       console.warn('Courses table missing; returning empty list');
@@ -642,7 +698,7 @@ router.get('/', async (req, res) => {
 
 router.get('/admin', authenticateToken, requireAdmin, async (req, res) => {
   try {
-    const { category, status, featured, q, limit } = req.query || {};
+    const { category, status, featured, q, limit, cursor, fields } = req.query || {};
     const conditions = [];
 
     if (category) {
@@ -665,21 +721,18 @@ router.get('/admin', authenticateToken, requireAdmin, async (req, res) => {
       conditions.push(ilike(courses.title, `%${q}%`));
     }
 
-    let query = db.select().from(courses).orderBy(desc(courses.createdAt));
-    if (conditions.length === 1) {
-      query = query.where(conditions[0]);
-    } else if (conditions.length > 1) {
-      query = query.where(and(...conditions));
-    }
-
-    const numericLimit = Number.parseInt(limit, 10);
-    if (Number.isFinite(numericLimit) && numericLimit > 0) {
-      query = query.limit(numericLimit);
-    }
-
-    const allCourses = await query;
-    res.json(allCourses);
+    const { rows, nextCursor } = await readPage(courses, {
+      filters: conditions,
+      selection: parseFields(courses, fields),
+      limit,
+      cursor,
+    });
+    setPageHeaders(req, res, nextCursor);
+    res.json(rows);
   } catch (error) {
+    if (error instanceof ApiError) {
+      return res.status(error.statusCode).json({ error: error.message });
+    }
     if (error?.code === 'ER_NO_SUCH_TABLE') {
       console.warn('Courses table missing; returning empty list for admin view');
       return res.json([]);
@@ -689,7 +742,7 @@ router.get('/admin', authenticateToken, requireAdmin, async (req, res) => {
   }
 });
 
-router.get('/:id', async (req, res) => {
+router.get('/:id', conditionalGet([CONTENT_SCOPES.catalog]), async (req, res) => {
   try {
     const [course] = await db.select().from(courses).where(eq(courses.id, req.params.id)).limit(1);
     
@@ -721,14 +774,12 @@ router.post('/', authenticateToken, requireAdmin, async (req, res) => {
 
     const courseId = req.body?.id || randomUUID();
 
-    await db.insert(courses).values({
-      id: courseId,
-      ...normalizedInput,
-    }).execute();
-
-    if (Array.isArray(normalizedInput.modules) && normalizedInput.modules.length > 0) {
-      await syncCourseStructure(courseId, normalizedInput.modules, { replaceExisting: true });
-    }
+    await db.transaction((tx) => writeCourses(
+      tx,
+      [{ id: courseId, ...normalizedInput }],
+      [{ courseId, modules: normalizedInput.modules }],
+      { replaceExisting: true },
+    ));
 
     const [newCourse] = await db.select().from(courses).where(eq(courses.id, courseId)).limit(1);
     res.status(201).json({
@@ -741,6 +792,112 @@ router.post('/', authenticateToken, requireAdmin, async (req, res) => {
   }
 });
 
+/**
+ * Bulk import courses from an NDJSON stream, one course object (as accepted by
+ * POST /api/courses) per line. Courses are written in batches, each batch in one
+ * transaction; a failing batch is retried course by course so one bad line does
+ * not reject its neighbours.
+ * POST /api/courses/import
+ */
+router.post('/import', authenticateToken, requireAdmin, async (req, res) => {
+  if (!req.is('application/x-ndjson')) {
+    return res.status(415).json({ error: 'Send courses as application/x-ndjson, one JSON object per line' });
+  }
+
+  const { batchSize, maxBytes } = config.courseImport;
+  const imported = [];
+  const errors = [];
+  let batch = [];
+
+  const importedCourses = () => imported.map(({ line, course }) => ({ line, id: course.id, title: course.title }));
+
+  const importCourses = (entries) => db.transaction((tx) => writeCourses(
+    tx,
+    entries.map(({ course }) => course),
+    entries.map(({ course }) => ({ courseId: course.id, modules: course.modules })),
+  ));
+
+  const flushBatch = async () => {
+    const entries = batch;
+    batch = [];
+    if (entries.length === 0) {
+      return;
+    }
+    try {
+      await importCourses(entries);
+      imported.push(...entries);
+    } catch (batchError) {
+      for (const entry of entries) {
+        try {
+          await importCourses([entry]);
+          imported.push(entry);
+        } catch (error) {
+          console.error(`Course import error on line ${entry.line}:`, error);
+          errors.push({
+            line: entry.line,
+            error: error?.code === 'ER_DUP_ENTRY' ? 'Course or content id already exists' : 'Failed to import course',
+          });
+        }
+      }
+    }
+  };
+
+  try {
+    const lines = readline.createInterface({ input: req, crlfDelay: Infinity });
+    let lineNumber = 0;
+    let bytesRead = 0;
+
+    for await (const line of lines) {
+      lineNumber += 1;
+      bytesRead += Buffer.byteLength(line) + 1;
+      if (bytesRead > maxBytes) {
+        lines.close();
+        await flushBatch();
+        return res.status(413).json({
+          error: `Import exceeds ${maxBytes} bytes; courses before line ${lineNumber} were processed`,
+          imported: imported.length,
+          courses: importedCourses(),
+          errors,
+        });
+      }
+      if (!line.trim()) {
+        continue;
+      }
+
+      let input;
+      try {
+        input = JSON.parse(line);
+      } catch {
+        errors.push({ line: lineNumber, error: 'Invalid JSON' });
+        continue;
+      }
+
+      const normalizedInput = normalizeCourseInput(input, { isNew: true, userId: req.user?.id });
+      if (!normalizedInput.title) {
+        errors.push({ line: lineNumber, error: 'Course title is required' });
+        continue;
+      }
+
+      batch.push({ line: lineNumber, course: { id: input.id || randomUUID(), ...normalizedInput } });
+      if (batch.length >= batchSize) {
+        await flushBatch();
+      }
+    }
+    await flushBatch();
+
+    res.status(errors.length > 0 ? 207 : 201).json({
+      message: `Imported ${imported.length} course(s)`,
+      imported: imported.length,
+      failed: errors.length,
+      courses: importedCourses(),
+      errors,
+    });
+  } catch (error) {
+    console.error('Import courses error:', error);
+    res.status(500).json({ error: 'Failed to import courses' });
+  }
+});
+
 router.put('/:id', authenticateToken, requireAdmin, async (req, res) => {
   try {
     const [existingCourse] = await db.select().from(courses).where(eq(courses.id, req.params.id)).limit(1);
@@ -762,14 +919,15 @@ router.put('/:id', authenticateToken, requireAdmin, async (req, res) => {
       normalizedUpdates.status = existingCourse.status;
     }
 
-    await db.update(courses)
-      .set(normalizedUpdates)
-      .where(eq(courses.id, req.params.id))
-      .execute();
-
-    if (Array.isArray(normalizedUpdates.modules) && normalizedUpdates.modules.length > 0) {
-      await syncCourseStructure(req.params.id, normalizedUpdates.modules, { replaceExisting: true });
-    }
+    await db.transaction(async (tx) => {
+      await writeWithStatChanges('course', courses, eq(courses.id, req.params.id), (lockedTx) => lockedTx
+        .update(courses)
+        .set(normalizedUpdates)
+        .where(eq(courses.id, req.params.id)), tx);
+      await writeCourses(tx, [], [{ courseId: req.params.id, modules: normalizedUpdates.modules }], {
+        replaceExisting: true,
+      });
+    });
 
     const [updatedCourse] = await db.select().from(courses).where(eq(courses.id, req.params.id)).limit(1);
 
@@ -792,6 +950,8 @@ router.delete('/:id', authenticateToken, requireAdmin, async (req, res) => {
     }
 
     await db.delete(courses).where(eq(courses.id, req.params.id));
+    // The delete cascades to the course's enrollments, so recount rather than adjust
+    requestStatisticsReconcile();
     res.json({ message: 'Course deleted successfully' });
   } catch (error) {
     console.error('Delete course error:', error);
@@ -2,11 +2,14 @@
 /* eslint-disable no-unused-vars */
 import { Router } from 'express';
 import { randomUUID } from 'crypto';
-import { and, eq, desc } from 'drizzle-orm';
+import { and, eq } from 'drizzle-orm';
 import { db } from '../db/index.js';
 import { enrollments, certifications, users, coupons } from '../db/schema.js';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
-import { sendEnrollmentEmail } from '../services/email.js';
+import { queueEnrollmentEmail } from '../services/emailQueue.js';
+import { getUserEnrollmentStats, writeWithStatChanges } from '../services/statistics.js';
+import { parseFields, readPage, setPageHeaders } from '../services/keysetPagination.js';
+import { ApiError } from '../middleware/errorHandler.js';
 import { validateBody, validateUUID } from '../middleware/validation.middleware.js';
 import { CreateEnrollmentDTO } from '../dto/index.js';
 
@@ -155,27 +158,15 @@ router.get('/user/:userId/stats', authenticateToken, async (req, res) => {
       return res.status(403).json({ error: 'Not authorized' });
     }
 
-    const rows = await db.select().from(enrollments)
-      .where(eq(enrollments.userId, requestedUserId));
+    // Counts come from the materialized counters; the rows themselves only when asked for
+    const stats = await getUserEnrollmentStats(requestedUserId);
+    if (req.query.include === 'enrollments') {
+      const rows = await db.select().from(enrollments)
+        .where(eq(enrollments.userId, requestedUserId));
+      stats.enrollments = rows.map(normalizeEnrollment);
+    }
 
-    const formatted = rows.map(normalizeEnrollment);
-    const successful = formatted.filter((item) => (item.status || '').toUpperCase() === 'SUCCESS');
-
-    const totalEnrollments = successful.length;
-    const offlineEnrollments = successful.filter((item) => (item.paymentDetails?.method || '').toLowerCase() === 'offline').length;
-    const onlineEnrollments = successful.filter((item) => (item.paymentDetails?.method || '').toLowerCase() === 'online').length;
-    const freeEnrollments = successful.filter((item) => (
-      (item.paymentDetails?.method || '').toLowerCase() === 'free'
-      || Number(item.paidAmount || 0) === 0
-    )).length;
-
-    res.json({
-      totalEnrollments,
-      offlineEnrollments,
-      onlineEnrollments,
-      freeEnrollments,
-      enrollments: formatted,
-    });
+    res.json(stats);
   } catch (error) {
     console.error('Get user enrollment stats error:', error);
     res.status(500).json({ error: 'Failed to fetch enrollment stats' });
@@ -184,7 +175,7 @@ router.get('/user/:userId/stats', authenticateToken, async (req, res) => {
 
 router.get('/', authenticateToken, requireAdmin, async (req, res) => {
   try {
-    const { status, userId, courseId, limit } = req.query || {};
+    const { status, userId, courseId, limit, cursor, fields } = req.query || {};
 
     const filters = [];
     if (userId) {
@@ -197,21 +188,15 @@ router.get('/', authenticateToken, requireAdmin, async (req, res) => {
       filters.push(eq(enrollments.status, String(status).toUpperCase()));
     }
 
-    let query = db.select().from(enrollments).orderBy(desc(enrollments.enrolledAt));
-    if (filters.length === 1) {
-      query = query.where(filters[0]);
-    } else if (filters.length > 1) {
-      query = query.where(and(...filters));
-    }
-
-    const numericLimit = Number.parseInt(limit, 10);
-    if (Number.isFinite(numericLimit) && numericLimit > 0) {
-      query = query.limit(numericLimit);
-    }
-
-    const rows = await query;
-    res.json(rows.map(normalizeEnrollment));
+    const selection = parseFields(enrollments, fields);
+    const { rows, nextCursor } = await readPage(enrollments, { filters, selection, limit, cursor });
+    setPageHeaders(req, res, nextCursor);
+    // Projected rows are returned as selected; normalizing would fill in the columns left out
+    res.json(selection ? rows : rows.map(normalizeEnrollment));
   } catch (error) {
+    if (error instanceof ApiError) {
+      return res.status(error.statusCode).json({ error: error.message });
+    }
     console.error('Admin enrollments list error:', error);
     res.status(500).json({ error: 'Failed to fetch enrollments' });
   }
@@ -328,7 +313,9 @@ router.post('/', authenticateToken, async (req, res) => {
       values.moduleProgress = enrollmentData.moduleProgress;
     }
 
-    await db.insert(enrollments).values(values).execute();
+    await writeWithStatChanges('enrollment', enrollments, eq(enrollments.id, enrollmentId), (tx) => tx
+      .insert(enrollments)
+      .values(values));
 
     if (status === 'SUCCESS' && normalizedCouponCode) {
       try {
@@ -368,17 +355,15 @@ router.post('/', authenticateToken, async (req, res) => {
           .limit(1);
 
         if (enrolledUser?.email) {
-          const emailResult = await sendEnrollmentEmail({
+          const jobId = await queueEnrollmentEmail({
             email: enrolledUser.email,
             userName: enrolledUser.displayName || enrolledUser.firstName || 'Student',
             courseTitle: enrollmentData.courseTitle || 'a new course',
             enrolledBy: req.user.displayName || req.user.email || 'Admin',
           });
 
-          if (emailResult.success) {
-            console.log(`[Enrollment] Email sent to ${enrolledUser.email} for course: ${enrollmentData.courseTitle}`);
-          } else if (!emailResult.skipped) {
-            console.warn(`[Enrollment] Failed to send email: ${emailResult.message}`);
+          if (jobId) {
+            console.log(`[Enrollment] Email queued for ${enrolledUser.email} for course: ${enrollmentData.courseTitle}`);
           }
         }
       } catch (emailError) {
@@ -513,14 +498,12 @@ router.put('/:id', authenticateToken, async (req, res) => {
 
     updates.updatedAt = new Date();
 
-    await db.update(enrollments)
-      .set(updates)
-      .where(eq(enrollments.id, req.params.id))
-      .execute();
-
-    const [updated] = await db.select().from(enrollments)
-      .where(eq(enrollments.id, req.params.id))
-      .limit(1);
+    const { after: updated } = await writeWithStatChanges(
+      'enrollment',
+      enrollments,
+      eq(enrollments.id, req.params.id),
+      (tx) => tx.update(enrollments).set(updates).where(eq(enrollments.id, req.params.id)),
+    );
 
     res.json(normalizeEnrollment(updated));
   } catch (error) {
@@ -547,9 +530,9 @@ router.delete('/:id', authenticateToken, async (req, res) => {
       return res.status(403).json({ error: 'Not authorized' });
     }
 
-    await db.delete(enrollments)
-      .where(eq(enrollments.id, req.params.id))
-      .execute();
+    await writeWithStatChanges('enrollment', enrollments, eq(enrollments.id, req.params.id), (tx) => tx
+      .delete(enrollments)
+      .where(eq(enrollments.id, req.params.id)));
 
     res.json({ success: true });
   } catch (error) {
@@ -1,7 +1,7 @@
 /* eslint-disable no-console */
 import { Router } from 'express';
 import { randomUUID } from 'crypto';
-import { and, eq, asc, sql } from 'drizzle-orm';
+import { and, eq, asc, inArray, sql } from 'drizzle-orm';
 import { db } from '../db/index.js';
 import { 
   userModuleProgress, 
@@ -15,9 +15,26 @@ import {
   quizAttempts,
 } from '../db/schema.js';
 import { authenticateToken } from '../middleware/auth.js';
+import lessonProgressBuffer from '../services/lessonProgressBuffer.js';
+import { bumpContentVersions, CONTENT_SCOPES } from '../services/contentVersions.js';
+import { writeWithStatChanges } from '../services/statistics.js';
 
 const router = Router();
 
+const groupBy = (rows, keyOf) => {
+  const groups = new Map();
+  for (const row of rows) {
+    const key = keyOf(row);
+    const group = groups.get(key);
+    if (group) {
+      group.push(row);
+    } else {
+      groups.set(key, [row]);
+    }
+  }
+  return groups;
+};
+
 /**
  * Get complete progress for a course
  * GET /api/learning-progress/:courseId
@@ -40,55 +57,59 @@ router.get('/:courseId', authenticateToken, async (req, res) => {
       return res.status(403).json({ error: 'You are not enrolled in this course' });
     }
     
+    await lessonProgressBuffer.flushUser(userId);
+    
     // Get all modules for the course
     const modules = await db
       .select()
       .from(courseModules)
       .where(eq(courseModules.courseId, courseId))
       .orderBy(asc(courseModules.orderIndex));
+    const moduleIds = modules.map(module => module.id);
     
-    // Get user's module progress
-    const moduleProgress = await db
-      .select()
-      .from(userModuleProgress)
-      .where(and(
-        eq(userModuleProgress.userId, userId),
-        eq(userModuleProgress.courseId, courseId)
-      ));
+    // Fetch the rest of the tree with one set-based query per table, whatever the course size
+    const [moduleProgress, courseLessons, courseLessonProgress, courseQuizzes] = moduleIds.length > 0
+      ? await Promise.all([
+        db
+          .select()
+          .from(userModuleProgress)
+          .where(and(
+            eq(userModuleProgress.userId, userId),
+            eq(userModuleProgress.courseId, courseId)
+          )),
+        db
+          .select()
+          .from(moduleLessons)
+          .where(inArray(moduleLessons.moduleId, moduleIds))
+          .orderBy(asc(moduleLessons.orderIndex)),
+        db
+          .select()
+          .from(userLessonProgress)
+          .where(and(
+            eq(userLessonProgress.userId, userId),
+            inArray(userLessonProgress.moduleId, moduleIds)
+          )),
+        db
+          .select()
+          .from(quizzes)
+          .where(inArray(quizzes.moduleId, moduleIds)),
+      ])
+      : [[], [], [], []];
     
-    // Create a map for quick lookup
+    // Create maps for quick lookup
     const progressMap = new Map(moduleProgress.map(p => [p.moduleId, p]));
+    const lessonsByModule = groupBy(courseLessons, lesson => lesson.moduleId);
+    const lessonProgressMap = new Map(courseLessonProgress.map(p => [p.lessonId, p]));
+    const quizzesByModule = groupBy(courseQuizzes, quiz => quiz.moduleId);
     
     // Calculate overall progress
     let totalCompleted = 0;
     let totalModules = modules.length;
     
-    const moduleDetails = await Promise.all(modules.map(async (module, index) => {
+    const moduleDetails = modules.map((module, index) => {
       const progress = progressMap.get(module.id);
-      
-      // Get lessons for this module
-      const lessons = await db
-        .select()
-        .from(moduleLessons)
-        .where(eq(moduleLessons.moduleId, module.id))
-        .orderBy(asc(moduleLessons.orderIndex));
-      
-      // Get lesson progress
-      const lessonProgress = await db
-        .select()
-        .from(userLessonProgress)
-        .where(and(
-          eq(userLessonProgress.userId, userId),
-          eq(userLessonProgress.moduleId, module.id)
-        ));
-      
-      const lessonProgressMap = new Map(lessonProgress.map(p => [p.lessonId, p]));
-      
-      // Get quizzes for this module
-      const moduleQuizzes = await db
-        .select()
-        .from(quizzes)
-        .where(eq(quizzes.moduleId, module.id));
+      const lessons = lessonsByModule.get(module.id) || [];
+      const moduleQuizzes = quizzesByModule.get(module.id) || [];
 
       const lessonQuizMap = new Map();
       const moduleLevelQuizzes = [];
@@ -109,13 +130,8 @@ router.get('/:courseId', authenticateToken, async (req, res) => {
         const previousProgress = progressMap.get(previousModule.id);
         
         // Check if previous module's quiz was passed (if required)
-        const previousQuizzes = await db
-          .select()
-          .from(quizzes)
-          .where(and(
-            eq(quizzes.moduleId, previousModule.id),
-            eq(quizzes.isRequired, true)
-          ));
+        const previousQuizzes = (quizzesByModule.get(previousModule.id) || [])
+          .filter(quiz => quiz.isRequired);
         
         if (previousQuizzes.length > 0) {
           // Need to pass quiz to unlock
@@ -167,7 +183,7 @@ router.get('/:courseId', authenticateToken, async (req, res) => {
         })),
         quizzes: moduleLevelQuizzes,
       };
-    }));
+    });
     
     const overallProgress = totalModules > 0 
       ? Math.round((totalCompleted / totalModules) * 100) 
@@ -197,6 +213,9 @@ router.put('/module/:moduleId', authenticateToken, async (req, res) => {
     const userId = req.user.id;
     const { progressPercentage, timeSpentMinutes, status } = req.body;
     
+    // A pending heartbeat would recompute this module from its lessons when it flushes later
+    await lessonProgressBuffer.flushUser(userId);
+    
     // Get module and verify enrollment
     const [module] = await db
       .select()
@@ -292,32 +311,67 @@ router.put('/lesson/:lessonId', authenticateToken, async (req, res) => {
     const userId = req.user.id;
     const { progressPercentage, timeSpentMinutes, lastPosition, notes, status } = req.body;
     
-    // Get lesson and module
-    const [lesson] = await db
-      .select()
-      .from(moduleLessons)
-      .where(eq(moduleLessons.id, lessonId));
-    
-    if (!lesson) {
-      return res.status(404).json({ error: 'Lesson not found' });
+    // A lesson with a heartbeat already waiting in the buffer was checked when that was recorded
+    let target = lessonProgressBuffer.get(userId, lessonId);
+    if (!target) {
+      // Get lesson and module
+      const [lesson] = await db
+        .select()
+        .from(moduleLessons)
+        .where(eq(moduleLessons.id, lessonId));
+      
+      if (!lesson) {
+        return res.status(404).json({ error: 'Lesson not found' });
+      }
+      
+      const [module] = await db
+        .select()
+        .from(courseModules)
+        .where(eq(courseModules.id, lesson.moduleId));
+      
+      // Verify enrollment
+      const [enrollment] = await db
+        .select()
+        .from(enrollments)
+        .where(and(
+          eq(enrollments.userId, userId),
+          eq(enrollments.courseId, module.courseId)
+        ));
+      
+      if (!enrollment) {
+        return res.status(403).json({ error: 'You are not enrolled in this course' });
+      }
+      
+      target = { moduleId: lesson.moduleId, enrollmentId: enrollment.id, courseId: module.courseId };
     }
     
-    const [module] = await db
-      .select()
-      .from(courseModules)
-      .where(eq(courseModules.id, lesson.moduleId));
-    
-    // Verify enrollment
-    const [enrollment] = await db
-      .select()
-      .from(enrollments)
-      .where(and(
-        eq(enrollments.userId, userId),
-        eq(enrollments.courseId, module.courseId)
-      ));
-    
-    if (!enrollment) {
-      return res.status(403).json({ error: 'You are not enrolled in this course' });
+    if (lessonProgressBuffer.enabled) {
+      const isCompleted = progressPercentage >= 100 || status === 'completed';
+      const pending = lessonProgressBuffer.record({
+        userId,
+        lessonId,
+        moduleId: target.moduleId,
+        enrollmentId: target.enrollmentId,
+        courseId: target.courseId,
+        progressPercentage,
+        timeSpentMinutes,
+        lastPosition,
+        notes,
+        status,
+        isCompleted,
+        at: new Date(),
+      });
+      
+      // Completion changes module and course progress, so write it straight away
+      if (isCompleted) {
+        await lessonProgressBuffer.flush(userId);
+      }
+      
+      return res.json({
+        message: 'Lesson progress updated successfully',
+        progress: pending,
+        buffered: !isCompleted,
+      });
     }
     
     // Get or create lesson progress
@@ -348,9 +402,9 @@ router.put('/lesson/:lessonId', authenticateToken, async (req, res) => {
       await db.insert(userLessonProgress).values({
         id: progressId,
         userId,
-        moduleId: lesson.moduleId,
+        moduleId: target.moduleId,
         lessonId,
-        enrollmentId: enrollment.id,
+        enrollmentId: target.enrollmentId,
         status: status || 'in_progress',
         progressPercentage: progressPercentage || 0,
         isCompleted,
@@ -363,7 +417,7 @@ router.put('/lesson/:lessonId', authenticateToken, async (req, res) => {
     }
     
     // Update module progress based on lesson completions
-    await updateModuleProgress(userId, lesson.moduleId, enrollment.id, module.courseId);
+    await updateModuleProgress(userId, target.moduleId, target.enrollmentId, target.courseId);
     
     // Get updated progress
     const [updatedProgress] = await db
@@ -393,6 +447,9 @@ router.post('/module/:moduleId/complete', authenticateToken, async (req, res) =>
     const { moduleId } = req.params;
     const userId = req.user.id;
     
+    // A pending heartbeat would recompute this module from its lessons when it flushes later
+    await lessonProgressBuffer.flushUser(userId);
+    
     const [module] = await db
       .select()
       .from(courseModules)
@@ -580,12 +637,17 @@ async function updateCourseProgress(userId, courseId, enrollmentId) {
     
     // Check if course is completed
     if (progressPercentage >= 100) {
-      await db.update(enrollments).set({
+      const completion = {
         status: 'COMPLETED',
         completedAt: new Date(),
         certificateDownloadable: true,
         certificateUnlockedAt: new Date(),
-      }).where(eq(enrollments.id, enrollmentId));
+      };
+      // Leaving SUCCESS takes the enrollment out of the user's counts
+      await writeWithStatChanges('enrollment', enrollments, eq(enrollments.id, enrollmentId), (tx) => tx
+        .update(enrollments)
+        .set(completion)
+        .where(eq(enrollments.id, enrollmentId)));
       
       // Create certification if it doesn't exist
       const [existingCert] = await db
@@ -609,7 +671,19 @@ async function updateCourseProgress(userId, courseId, enrollmentId) {
         });
       }
     }
+
+    // Also runs from buffered flushes, outside any request the write middleware sees
+    await bumpContentVersions([CONTENT_SCOPES.activity]);
   }
 }
 
+// Buffered heartbeats skip the per-request module recalculation; run it once per
+// user and module whenever their lesson progress is written
+lessonProgressBuffer.onFlush(async (entries) => {
+  const modules = new Map(entries.map((entry) => [`${entry.userId}:${entry.moduleId}`, entry]));
+  for (const entry of modules.values()) {
+    await updateModuleProgress(entry.userId, entry.moduleId, entry.enrollmentId, entry.courseId);
+  }
+});
+
 export default router;
@@ -9,6 +9,9 @@ import {
   courses 
 } from '../db/schema.js';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
+import { conditionalGet } from '../middleware/contentVersion.js';
+import catalogCache from '../services/catalogCache.js';
+import { CONTENT_SCOPES } from '../services/contentVersions.js';
 
 const router = Router();
 
@@ -16,33 +19,35 @@ const router = Router();
  * Get all modules for a course
  * GET /api/modules/:courseId
  */
-router.get('/:courseId', async (req, res) => {
+router.get('/:courseId', conditionalGet([CONTENT_SCOPES.catalog]), async (req, res) => {
   try {
     const { courseId } = req.params;
     
-    const modules = await db
-      .select()
-      .from(courseModules)
-      .where(eq(courseModules.courseId, courseId))
-      .orderBy(asc(courseModules.orderIndex));
-    
-    // Get lessons for each module
-    const modulesWithLessons = await Promise.all(
-      modules.map(async (module) => {
-        const lessons = await db
-          .select()
-          .from(moduleLessons)
-          .where(eq(moduleLessons.moduleId, module.id))
-          .orderBy(asc(moduleLessons.orderIndex));
-        
-        return {
-          ...module,
-          lessons,
-        };
-      })
-    );
-    
-    res.json(modulesWithLessons);
+    const body = await catalogCache.get(`modules:${courseId}`, async () => {
+      const modules = await db
+        .select()
+        .from(courseModules)
+        .where(eq(courseModules.courseId, courseId))
+        .orderBy(asc(courseModules.orderIndex));
+      
+      // Get lessons for each module
+      return Promise.all(
+        modules.map(async (module) => {
+          const lessons = await db
+            .select()
+            .from(moduleLessons)
+            .where(eq(moduleLessons.moduleId, module.id))
+            .orderBy(asc(moduleLessons.orderIndex));
+          
+          return {
+            ...module,
+            lessons,
+          };
+        })
+      );
+    }, { version: req.contentEtag });
+    
+    res.type('json').send(body);
   } catch (error) {
     console.error('Error fetching modules:', error);
     res.status(500).json({ error: 'Failed to fetch modules' });
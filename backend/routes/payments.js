@@ -3,9 +3,9 @@ import { Router } from 'express';
 import { randomUUID } from 'crypto';
 import { db } from '../db/index.js';
 import { payments, courses, enrollments } from '../db/schema.js';
-import { and, eq, desc } from 'drizzle-orm';
+import { and, eq } from 'drizzle-orm';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
-import { asyncHandler } from '../middleware/errorHandler.js';
+import { ApiError, asyncHandler } from '../middleware/errorHandler.js';
 import {
   createRazorpayOrder,
   verifyRazorpaySignature,
@@ -13,12 +13,14 @@ import {
   generateReceiptId,
   validatePaymentData,
 } from '../services/payment.js';
+import { writeWithStatChanges } from '../services/statistics.js';
+import { parseFields, readPage, setPageHeaders } from '../services/keysetPagination.js';
 
 const router = Router();
 
 router.get('/', authenticateToken, requireAdmin, async (req, res) => {
   try {
-    const { userId, courseId, status, limit } = req.query || {};
+    const { userId, courseId, status, limit, cursor, fields } = req.query || {};
     const filters = [];
 
     if (userId) {
@@ -31,21 +33,18 @@ router.get('/', authenticateToken, requireAdmin, async (req, res) => {
       filters.push(eq(payments.status, String(status).toLowerCase()));
     }
 
-    let query = db.select().from(payments).orderBy(desc(payments.createdAt));
-    if (filters.length === 1) {
-      query = query.where(filters[0]);
-    } else if (filters.length > 1) {
-      query = query.where(and(...filters));
-    }
-
-    const numericLimit = Number.parseInt(limit, 10);
-    if (Number.isFinite(numericLimit) && numericLimit > 0) {
-      query = query.limit(numericLimit);
-    }
-
-    const rows = await query;
+    const { rows, nextCursor } = await readPage(payments, {
+      filters,
+      selection: parseFields(payments, fields),
+      limit,
+      cursor,
+    });
+    setPageHeaders(req, res, nextCursor);
     res.json(rows);
   } catch (error) {
+    if (error instanceof ApiError) {
+      return res.status(error.statusCode).json({ error: error.message });
+    }
     console.error('Admin payments list error:', error);
     res.status(500).json({ error: 'Failed to fetch payments' });
   }
@@ -130,7 +129,7 @@ router.post('/', authenticateToken, asyncHandler(async (req, res) => {
   const paymentRecordId = randomUUID();
   const now = new Date();
 
-  await db.insert(payments).values({
+  const record = {
     id: paymentRecordId,
     userId: req.user.id,
     courseId: course.id,
@@ -149,11 +148,10 @@ router.post('/', authenticateToken, asyncHandler(async (req, res) => {
     }),
     createdAt: now,
     updatedAt: now,
-  }).execute();
-
-  const [newPayment] = await db.select().from(payments)
-    .where(eq(payments.id, paymentRecordId))
-    .limit(1);
+  };
+  const { after: newPayment } = await writeWithStatChanges('payment', payments, eq(payments.id, paymentRecordId), (tx) => tx
+    .insert(payments)
+    .values(record));
 
   res.status(201).json({
     payment: newPayment,
@@ -184,14 +182,12 @@ router.put('/:paymentId', authenticateToken, async (req, res) => {
       return res.status(403).json({ error: 'Not authorized to update this payment' });
     }
 
-    await db.update(payments)
-      .set(req.body)
-      .where(eq(payments.paymentId, req.params.paymentId))
-      .execute();
-
-    const [updatedPayment] = await db.select().from(payments)
-      .where(eq(payments.paymentId, req.params.paymentId))
-      .limit(1);
+    const { after: updatedPayment } = await writeWithStatChanges(
+      'payment',
+      payments,
+      eq(payments.paymentId, req.params.paymentId),
+      (tx) => tx.update(payments).set(req.body).where(eq(payments.paymentId, req.params.paymentId)),
+    );
 
     res.json(updatedPayment);
   } catch (error) {
@@ -233,41 +229,42 @@ router.post('/verify', authenticateToken, asyncHandler(async (req, res) => {
     return res.status(404).json({ error: 'Payment record not found' });
   }
 
-  // Update payment status
-  await db.update(payments)
-    .set({
-      paymentId,
-      status: 'completed',
-      updatedAt: new Date(),
-    })
-    .where(eq(payments.id, payment.id))
-    .execute();
-
-  // Create enrollment if not exists
-  const [existingEnrollment] = await db.select().from(enrollments)
-    .where(and(
-      eq(enrollments.userId, req.user.id),
-      eq(enrollments.courseId, payment.courseId)
-    ))
-    .limit(1);
-
-  if (!existingEnrollment) {
-    const enrollmentId = randomUUID();
-    await db.insert(enrollments).values({
-      id: enrollmentId,
-      userId: req.user.id,
-      courseId: payment.courseId,
-      status: 'active',
-      progress: 0,
-      enrolledAt: new Date(),
-      createdAt: new Date(),
-      updatedAt: new Date(),
-    }).execute();
-  }
+  const updatedPayment = await db.transaction(async (tx) => {
+    // Update payment status
+    const { after } = await writeWithStatChanges('payment', payments, eq(payments.id, payment.id), (lockedTx) => lockedTx
+      .update(payments)
+      .set({
+        paymentId,
+        status: 'completed',
+        updatedAt: new Date(),
+      })
+      .where(eq(payments.id, payment.id)), tx);
+
+    // Create enrollment if not exists; the payment row lock keeps a repeated verify from creating a second one
+    const [existingEnrollment] = await tx.select().from(enrollments)
+      .where(and(
+        eq(enrollments.userId, req.user.id),
+        eq(enrollments.courseId, payment.courseId)
+      ))
+      .limit(1);
 
-  const [updatedPayment] = await db.select().from(payments)
-    .where(eq(payments.id, payment.id))
-    .limit(1);
+    if (!existingEnrollment) {
+      const enrollmentId = randomUUID();
+      await writeWithStatChanges('enrollment', enrollments, eq(enrollments.id, enrollmentId), (lockedTx) => lockedTx
+        .insert(enrollments)
+        .values({
+          id: enrollmentId,
+          userId: req.user.id,
+          courseId: payment.courseId,
+          status: 'active',
+          progress: 0,
+          enrolledAt: new Date(),
+          createdAt: new Date(),
+          updatedAt: new Date(),
+        }), tx);
+    }
+    return after;
+  });
 
   res.json({
     success: true,
@@ -3,6 +3,11 @@ import { Router } from 'express';
 import { db } from '../db/index.js';
 import { courses, enrollments, payments, coupons } from '../db/schema.js';
 import { desc } from 'drizzle-orm';
+import { conditionalGet } from '../middleware/contentVersion.js';
+import { ApiError } from '../middleware/errorHandler.js';
+import { CONTENT_SCOPES } from '../services/contentVersions.js';
+import { readDelta, streamDelta } from '../services/realtimeDelta.js';
+import { getPlatformStats } from '../services/statistics.js';
 
 const router = Router();
 
@@ -20,13 +25,32 @@ const safeJsonArray = (value) => {
   return [];
 };
 
-router.get('/', async (req, res) => {
+const normalizeCoupon = (coupon) => ({
+  ...coupon,
+  applicableCourses: safeJsonArray(coupon.applicableCourses),
+  applicableCategories: safeJsonArray(coupon.applicableCategories),
+});
+
+// Unpublished courses and inactive coupons leave the public view, so they go out as removals
+const deltaSources = {
+  courses: {
+    table: courses,
+    toChange: (course) => (course.isPublished !== false ? { row: course } : { removed: course.id }),
+  },
+  coupons: {
+    table: coupons,
+    toChange: (coupon) => (coupon.isActive !== false ? { row: normalizeCoupon(coupon) } : { removed: coupon.id }),
+  },
+};
+
+router.get('/', conditionalGet([CONTENT_SCOPES.catalog, CONTENT_SCOPES.activity]), async (req, res) => {
   try {
-    const [publishedCourses, recentEnrollments, capturedPayments, activeCoupons] = await Promise.all([
+    const [publishedCourses, recentEnrollments, capturedPayments, activeCoupons, platformStats] = await Promise.all([
       db.select().from(courses).orderBy(desc(courses.createdAt)),
       db.select().from(enrollments).orderBy(desc(enrollments.enrolledAt)).limit(25),
       db.select().from(payments).orderBy(desc(payments.createdAt)).limit(25),
       db.select().from(coupons).orderBy(desc(coupons.createdAt)),
+      getPlatformStats(),
     ]);
 
     const filteredCourses = publishedCourses.filter((course) => course.isPublished !== false);
@@ -34,18 +58,15 @@ router.get('/', async (req, res) => {
 
     const normalizedCoupons = activeCoupons
       .filter((coupon) => coupon.isActive !== false)
-      .map((coupon) => ({
-        ...coupon,
-        applicableCourses: safeJsonArray(coupon.applicableCourses),
-        applicableCategories: safeJsonArray(coupon.applicableCategories),
-      }));
+      .map(normalizeCoupon);
 
+    // Platform-wide totals from the materialized counters, not just the recent rows above
     const stats = {
-      totalCourses: filteredCourses.length,
-      featuredCourses: featuredCourses.length,
-      totalEnrollments: recentEnrollments.length,
-      totalCapturedPayments: capturedPayments.filter((payment) => (payment.status || '').toLowerCase() === 'captured').length,
-      activeCoupons: normalizedCoupons.length,
+      totalCourses: platformStats.totalCourses,
+      featuredCourses: platformStats.featuredCourses,
+      totalEnrollments: platformStats.totalEnrollments,
+      totalCapturedPayments: platformStats.capturedPayments,
+      activeCoupons: platformStats.activeCoupons,
     };
 
     res.json({
@@ -79,4 +100,26 @@ router.get('/', async (req, res) => {
   }
 });
 
+/**
+ * Course and coupon changes since a cursor
+ * GET /api/public/realtime/delta?cursor=
+ */
+router.get('/delta', async (req, res) => {
+  try {
+    res.json(await readDelta(deltaSources, req.query.cursor));
+  } catch (error) {
+    if (error instanceof ApiError) {
+      return res.status(error.statusCode).json({ error: error.message });
+    }
+    console.error('Public realtime delta error:', error);
+    res.status(500).json({ error: 'Failed to fetch public realtime changes' });
+  }
+});
+
+/**
+ * The same changes pushed as server-sent events
+ * GET /api/public/realtime/stream
+ */
+router.get('/stream', (req, res) => streamDelta(req, res, deltaSources));
+
 export default router;
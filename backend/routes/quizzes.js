@@ -1,7 +1,7 @@
 /* eslint-disable no-console */
 import { Router } from 'express';
 import { randomUUID } from 'crypto';
-import { and, eq, asc, desc } from 'drizzle-orm';
+import { and, eq, asc, desc, sql } from 'drizzle-orm';
 import { db } from '../db/index.js';
 import { 
   quizzes, 
@@ -15,12 +15,19 @@ import {
   userLessonProgress,
 } from '../db/schema.js';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
+import { conditionalGet } from '../middleware/contentVersion.js';
+import { getAnswerKey, prefetchAnswerKey, evictAnswerKey, isAnswerCorrect } from '../services/quizCache.js';
+import lessonProgressBuffer from '../services/lessonProgressBuffer.js';
+import { CONTENT_SCOPES } from '../services/contentVersions.js';
 
 const router = Router();
 
 const QUIZ_CORRECT_POINTS = 5;
 const QUIZ_WRONG_PENALTY = 1;
 
+// Invalidates cached answer keys in every server process
+const bumpAnswerKeyVersion = sql`${quizzes.answerKeyVersion} + 1`;
+
 // =====================================================
 // Quiz Management (Admin)
 // =====================================================
@@ -29,7 +36,8 @@ const QUIZ_WRONG_PENALTY = 1;
  * Get all quizzes for a course
  * GET /api/quizzes/course/:courseId
  */
-router.get('/course/:courseId', async (req, res) => {
+// Deleting a course removes its quizzes, so the list also depends on the catalog
+router.get('/course/:courseId', conditionalGet([CONTENT_SCOPES.catalog, CONTENT_SCOPES.quizzes]), async (req, res) => {
   try {
     const { courseId } = req.params;
     
@@ -317,6 +325,7 @@ router.delete('/:quizId', authenticateToken, requireAdmin, async (req, res) => {
     }
     
     await db.delete(quizzes).where(eq(quizzes.id, quizId));
+    evictAnswerKey(quizId);
     
     res.json({ message: 'Quiz deleted successfully' });
   } catch (error) {
@@ -386,6 +395,7 @@ router.post('/:quizId/questions', authenticateToken, requireAdmin, async (req, r
     await db.update(quizzes).set({
       totalQuestions: allQuestions.length,
       totalPoints,
+      answerKeyVersion: bumpAnswerKeyVersion,
     }).where(eq(quizzes.id, quizId));
     
     const [newQuestion] = await db.select().from(quizQuestions).where(eq(quizQuestions.id, questionId));
@@ -434,12 +444,13 @@ router.put('/questions/:questionId', authenticateToken, requireAdmin, async (req
     
     await db.update(quizQuestions).set(updateData).where(eq(quizQuestions.id, questionId));
     
-    // Update quiz totals if points changed
+    // Update quiz totals if points changed, and invalidate cached answer keys
+    const quizUpdate = { answerKeyVersion: bumpAnswerKeyVersion };
     if (updates.points !== undefined) {
       const allQuestions = await db.select().from(quizQuestions).where(eq(quizQuestions.quizId, existingQuestion.quizId));
-      const totalPoints = allQuestions.length * QUIZ_CORRECT_POINTS;
-      await db.update(quizzes).set({ totalPoints }).where(eq(quizzes.id, existingQuestion.quizId));
+      quizUpdate.totalPoints = allQuestions.length * QUIZ_CORRECT_POINTS;
     }
+    await db.update(quizzes).set(quizUpdate).where(eq(quizzes.id, existingQuestion.quizId));
     
     const [updatedQuestion] = await db.select().from(quizQuestions).where(eq(quizQuestions.id, questionId));
     
@@ -475,6 +486,7 @@ router.delete('/questions/:questionId', authenticateToken, requireAdmin, async (
     await db.update(quizzes).set({
       totalQuestions: allQuestions.length,
       totalPoints,
+      answerKeyVersion: bumpAnswerKeyVersion,
     }).where(eq(quizzes.id, existingQuestion.quizId));
     
     res.json({ message: 'Question deleted successfully' });
@@ -519,6 +531,9 @@ router.post('/:quizId/start', authenticateToken, async (req, res) => {
       return res.status(403).json({ error: 'You must be enrolled in the course to take this quiz' });
     }
     
+    // Have the answer key compiled before the attempt is submitted
+    prefetchAnswerKey(quiz);
+    
     // Check max attempts
     if (quiz.maxAttempts) {
       const userAttempts = await db
@@ -615,12 +630,9 @@ router.post('/:quizId/submit', authenticateToken, async (req, res) => {
       return res.status(400).json({ error: 'This attempt has already been submitted' });
     }
     
-    // Get quiz and questions
+    // Get quiz and its compiled answer key
     const [quiz] = await db.select().from(quizzes).where(eq(quizzes.id, quizId));
-    const questions = await db
-      .select()
-      .from(quizQuestions)
-      .where(eq(quizQuestions.quizId, quizId));
+    const questions = await getAnswerKey(quiz);
     
     const maxPoints = (questions.length || 0) * QUIZ_CORRECT_POINTS;
     const normalizedAnswers = answers && typeof answers === 'object' ? answers : {};
@@ -631,31 +643,9 @@ router.post('/:quizId/submit', authenticateToken, async (req, res) => {
     
     for (const question of questions) {
       const userAnswer = normalizedAnswers[question.id];
-      const correctAnswer = question.correctAnswer;
-      
-      let parsedCorrectAnswer = correctAnswer;
-      try {
-        parsedCorrectAnswer = JSON.parse(correctAnswer);
-      } catch (e) {
-        // Not JSON, keep as-is
-      }
-      
-      let isCorrect = false;
-      const questionType = question.questionType || 'multiple_choice';
+      const isCorrect = isAnswerCorrect(question, userAnswer);
       const userProvidedAnswer = userAnswer !== undefined && userAnswer !== null && userAnswer !== '';
       
-      if (questionType === 'multiple_choice' || questionType === 'true_false') {
-        isCorrect = userAnswer === parsedCorrectAnswer;
-      } else if (questionType === 'multiple_select') {
-        const userAnswerSet = new Set(Array.isArray(userAnswer) ? userAnswer : []);
-        const correctSet = new Set(Array.isArray(parsedCorrectAnswer) ? parsedCorrectAnswer : []);
-        isCorrect = userAnswerSet.size === correctSet.size &&
-          [...userAnswerSet].every((value) => correctSet.has(value));
-      } else if (questionType === 'short_answer') {
-        isCorrect = typeof userAnswer === 'string' &&
-          String(userAnswer).toLowerCase().trim() === String(parsedCorrectAnswer).toLowerCase().trim();
-      }
-      
       let pointsForQuestion = 0;
       if (isCorrect) {
         correctAnswers += 1;
@@ -668,7 +658,7 @@ router.post('/:quizId/submit', authenticateToken, async (req, res) => {
       questionResults.push({
         questionId: question.id,
         userAnswer,
-        correctAnswer: quiz.showCorrectAnswers ? parsedCorrectAnswer : undefined,
+        correctAnswer: quiz.showCorrectAnswers ? question.answer : undefined,
         isCorrect,
         points: pointsForQuestion,
         maxPoints: QUIZ_CORRECT_POINTS,
@@ -748,6 +738,7 @@ router.post('/:quizId/submit', authenticateToken, async (req, res) => {
 
     // Update lesson progress if quiz is linked to a lesson
     if (quiz.lessonId) {
+      await lessonProgressBuffer.flushUser(userId);
       const [existingLessonProgress] = await db
         .select()
         .from(userLessonProgress)
@@ -1,11 +1,13 @@
 /* eslint-disable no-console */
 import { Router } from 'express';
-import bcrypt from 'bcryptjs';
 import { randomUUID } from 'crypto';
 import { db } from '../db/index.js';
 import { users, enrollments } from '../db/schema.js';
 import { authenticateToken, requireAdmin } from '../middleware/auth.js';
-import { eq, desc } from 'drizzle-orm';
+import { eq } from 'drizzle-orm';
+import { ApiError, sendApiError } from '../middleware/errorHandler.js';
+import { parseFields, readPage, setPageHeaders } from '../services/keysetPagination.js';
+import { hashPassword } from '../services/passwordHasher.js';
 
 const router = Router();
 
@@ -22,15 +24,16 @@ router.use(authenticateToken, requireAdmin);
 
 router.get('/', async (req, res) => {
   try {
-    const limit = req.query.limit ? Number.parseInt(req.query.limit, 10) : undefined;
-    let query = db.select().from(users).orderBy(desc(users.createdAt));
-    if (limit && Number.isFinite(limit) && limit > 0) {
-      query = query.limit(limit);
-    }
-    const results = await query;
-    const normalized = results.map((user) => sanitizeUser(user));
-    res.json(normalized);
+    const { limit, cursor, fields } = req.query;
+    // Password hashes never leave the database, even when every column is selected
+    const selection = parseFields(users, fields, { hidden: ['password'] });
+    const { rows, nextCursor } = await readPage(users, { selection, limit, cursor });
+    setPageHeaders(req, res, nextCursor);
+    res.json(rows);
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Admin users list error:', error);
     res.status(500).json({ error: 'Failed to fetch users' });
   }
@@ -60,7 +63,7 @@ router.post('/', async (req, res) => {
       return res.status(400).json({ error: 'User already exists' });
     }
 
-    const hashedPassword = await bcrypt.hash(password, 10);
+    const hashedPassword = await hashPassword(password);
     const userId = randomUUID();
 
     await db.insert(users).values({
@@ -79,6 +82,9 @@ router.post('/', async (req, res) => {
     const [newUser] = await db.select().from(users).where(eq(users.id, userId)).limit(1);
     res.status(201).json(sanitizeUser(newUser));
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Admin create user error:', error);
     res.status(500).json({ error: 'Failed to create user' });
   }
@@ -114,7 +120,7 @@ router.put('/:id', async (req, res) => {
     }
 
     if (updates.password) {
-      updates.password = await bcrypt.hash(updates.password, 10);
+      updates.password = await hashPassword(updates.password);
     }
 
     if (updates.role) {
@@ -150,6 +156,9 @@ router.put('/:id', async (req, res) => {
 
     res.json(sanitizeUser(updatedUser));
   } catch (error) {
+    if (error instanceof ApiError) {
+      return sendApiError(res, error);
+    }
     console.error('Admin update user error:', error);
     res.status(500).json({ error: 'Failed to update user' });
   }
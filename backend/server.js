@@ -1,17 +1,58 @@
 import "dotenv/config"; // Ensure dotenv is loaded first for safety, though config/index.js also checks it.
-import app from "./app.js";
+import cluster from "cluster";
 import { config } from "./config/index.js";
-import { dbReady } from "./db/index.js";
 import logger from "./utils/logger.js";
 
+/**
+ * With CLUSTER_WORKERS above 1 the primary process prepares the database, runs
+ * the statistics reconciler and keeps that many HTTP workers listening on one
+ * port. SIGHUP replaces the workers one at a time without dropping the port.
+ */
+
+// Resolve once the server has stopped accepting and its in-flight requests are done, or after the timeout
+const closeServer = (server) => new Promise((resolve) => {
+  if (!server) return resolve();
+  const timer = setTimeout(() => {
+    server.closeAllConnections();
+    resolve();
+  }, config.cluster.shutdownTimeoutMs);
+  timer.unref();
+  server.close(() => {
+    clearTimeout(timer);
+    resolve();
+  });
+});
+
 const startServer = async () => {
+  // Loaded here so a cluster primary never loads the API itself
+  const { default: app } = await import("./app.js");
+  const { dbReady } = await import("./db/index.js");
+  const { default: lessonProgressBuffer } = await import("./services/lessonProgressBuffer.js");
+  const { startStatisticsReconciler, stopStatisticsReconciler } = await import("./services/statistics.js");
+  const { startEmailQueue, stopEmailQueue } = await import("./services/emailQueue.js");
+  const { closePasswordHasher } = await import("./services/passwordHasher.js");
+  const { closeCertificatePdfCache } = await import("./services/certificatePdfCache.js");
+
+  let server;
   try {
     // Wait for Database Connection
     await dbReady;
     logger.info("Database connection established successfully.");
 
+    // Seed or repair the statistic counters before serving reads from them; in a cluster the primary does this
+    if (cluster.isPrimary) {
+      await startStatisticsReconciler();
+    }
+
+    // Every process sends queued emails; claims keep two processes from sending the same job
+    startEmailQueue();
+
     // Start Express Server
-    app.listen(config.port, () => {
+    server = app.listen(config.port, () => {
+      if (cluster.isWorker) {
+        logger.info(`🚀 Worker ${cluster.worker.id} (pid ${process.pid}) listening on port ${config.port}`);
+        return;
+      }
       logger.info(`🚀 Backend server running on port ${config.port}`);
       logger.info(`📊 API endpoints available at ${config.baseUrl}/api/health`);
       logger.info(`🔧 Environment: ${config.env}`);
@@ -21,9 +62,119 @@ const startServer = async () => {
     logger.error("Failed to start server due to initialization error:", error);
     process.exit(1);
   }
+
+  // Stop accepting requests, let in-flight ones finish, then write buffered lesson progress before exiting
+  let shuttingDown = false;
+  const shutdown = async (signal) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    logger.info(`${signal} received, shutting down...`);
+    await closeServer(server);
+    stopStatisticsReconciler();
+    await stopEmailQueue();
+    // No request is left to hash a password or render a certificate
+    await Promise.all([closePasswordHasher(), closeCertificatePdfCache()]);
+    try {
+      await lessonProgressBuffer.close();
+      process.exit(0);
+    } catch (error) {
+      logger.error(`Failed to flush lesson progress on shutdown: ${error.message}`);
+      process.exit(1);
+    }
+  };
+
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+};
+
+const startPrimary = async () => {
+  const { dbReady } = await import("./db/index.js");
+  const {
+    serveReconcileRequests,
+    startStatisticsReconciler,
+    stopStatisticsReconciler,
+  } = await import("./services/statistics.js");
+
+  try {
+    // Create tables and indexes once, before any worker connects
+    await dbReady;
+  } catch (error) {
+    logger.error("Failed to start cluster due to initialization error:", error);
+    process.exit(1);
+  }
+  // One reconciler for the whole cluster; a run per worker would apply the same correction several times
+  await startStatisticsReconciler();
+  // Workers ask for a recount after cascading deletes instead of reconciling themselves
+  serveReconcileRequests();
+
+  const retiring = new Set();
+  let stopping = false;
+  let restarting = false;
+
+  // Resolves with the worker once it is listening, or null if it exits first
+  const fork = () => new Promise((resolve) => {
+    const worker = cluster.fork();
+    worker.once('listening', () => resolve(worker));
+    worker.once('exit', () => resolve(null));
+  });
+
+  const stopWorker = (worker) => new Promise((resolve) => {
+    if (worker.isDead()) return resolve();
+    retiring.add(worker);
+    worker.once('exit', resolve);
+    worker.process.kill('SIGTERM');
+  });
+
+  cluster.on('exit', (worker, code, signal) => {
+    if (stopping || retiring.delete(worker)) return;
+    logger.error(`Worker ${worker.id} (pid ${worker.process.pid}) exited with ${signal || code}, starting a replacement`);
+    setTimeout(fork, 1000);
+  });
+
+  // Start each replacement before stopping the worker it replaces, so at least N workers are always listening
+  const rollingRestart = async () => {
+    if (restarting || stopping) return;
+    restarting = true;
+    logger.info(`🔄 Rolling restart of ${Object.keys(cluster.workers).length} workers`);
+    for (const worker of Object.values(cluster.workers)) {
+      const replacement = await fork();
+      if (!replacement) {
+        logger.error("Replacement worker failed to start, leaving the remaining workers running");
+        break;
+      }
+      await stopWorker(worker);
+    }
+    restarting = false;
+    logger.info("✅ Rolling restart complete");
+  };
+
+  const shutdown = async (signal) => {
+    if (stopping) return;
+    stopping = true;
+    logger.info(`${signal} received, stopping workers...`);
+    stopStatisticsReconciler();
+    await Promise.all(Object.values(cluster.workers).map(stopWorker));
+    process.exit(0);
+  };
+
+  process.on('SIGTERM', () => shutdown('SIGTERM'));
+  process.on('SIGINT', () => shutdown('SIGINT'));
+  process.on('SIGHUP', () => rollingRestart());
+
+  logger.info(`🧵 Cluster primary ${process.pid} starting ${config.cluster.workers} workers on port ${config.port}`);
+  if (Number(process.env.PROGRESS_FLUSH_INTERVAL_MS) > 0) {
+    logger.warn("PROGRESS_FLUSH_INTERVAL_MS is ignored with several workers; lesson heartbeats are written through");
+  }
+  for (let index = 0; index < config.cluster.workers; index += 1) {
+    fork();
+  }
 };
 
-startServer();
+if (cluster.isPrimary && config.cluster.workers > 1) {
+  startPrimary();
+} else {
+  startServer();
+}
 
 // Handle Unhandled Promise Rejections
 process.on('unhandledRejection', (err) => {
@@ -0,0 +1,96 @@
+/**
+ * Catalog Read Cache
+ * Serialized responses for the public course catalog and course module trees,
+ * held for a TTL under a size cap and dropped whenever a catalog write succeeds.
+ * Entries are tagged with the shared catalog content version they were loaded
+ * under, so a write made through another server process, which cannot clear
+ * this process's entries, still makes them miss.
+ */
+
+import { config } from '../config/index.js';
+
+export class CatalogCache {
+  /**
+   * @param {Object} options
+   * @param {number} options.ttlMs - How long an entry is served (0 disables the cache)
+   * @param {number} options.maxEntries - Entries kept before the least recently used is evicted
+   */
+  constructor({ ttlMs, maxEntries }) {
+    this.ttlMs = ttlMs;
+    this.maxEntries = maxEntries;
+    this.entries = new Map();
+    // Bumped by every invalidation, so it identifies the catalog content being served
+    this.version = 0;
+    this.stats = { hits: 0, misses: 0, evictions: 0, invalidations: 0 };
+  }
+
+  get enabled() {
+    return this.ttlMs > 0 && this.maxEntries > 0;
+  }
+
+  /**
+   * Cached JSON body for `key`, loading and serializing it on a miss. Concurrent
+   * misses for the same key share one load.
+   * @param {string} key - Cache key including every query option that shapes the result
+   * @param {Function} load - async () => value to serialize
+   * @param {Object} [options]
+   * @param {string} [options.version] - Content version the response is served under; an entry loaded under another version is reloaded
+   * @returns {Promise<string>} - Serialized JSON body
+   */
+  async get(key, load, { version } = {}) {
+    if (!this.enabled) {
+      this.stats.misses += 1;
+      return JSON.stringify(await load());
+    }
+
+    const entry = this.entries.get(key);
+    if (entry && entry.expiresAt > Date.now() && entry.version === version) {
+      this.stats.hits += 1;
+      // Re-insert to mark as most recently used
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+      return entry.body;
+    }
+
+    this.stats.misses += 1;
+    const body = Promise.resolve().then(load).then((value) => JSON.stringify(value));
+    this.entries.delete(key);
+    this.entries.set(key, { body, version, expiresAt: Date.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      this.entries.delete(this.entries.keys().next().value);
+      this.stats.evictions += 1;
+    }
+
+    try {
+      return await body;
+    } catch (error) {
+      if (this.entries.get(key)?.body === body) {
+        this.entries.delete(key);
+      }
+      throw error;
+    }
+  }
+
+  /**
+   * Drop every entry; called after any course, module or lesson write. A load
+   * still in flight is dropped with it, so its possibly stale result is never reused.
+   */
+  invalidate() {
+    this.version += 1;
+    this.stats.invalidations += 1;
+    this.entries.clear();
+  }
+
+  getStats() {
+    return {
+      enabled: this.enabled,
+      ttlMs: this.ttlMs,
+      size: this.entries.size,
+      maxEntries: this.maxEntries,
+      version: this.version,
+      ...this.stats,
+    };
+  }
+}
+
+export default new CatalogCache(config.catalogCache);
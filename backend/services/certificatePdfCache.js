@@ -0,0 +1,137 @@
+import { createHash, randomUUID } from 'crypto';
+import { mkdir, readdir, rename, rm, stat, unlink, writeFile } from 'fs/promises';
+import path from 'path';
+import { config } from '../config/index.js';
+import logger from '../utils/logger.js';
+import { generateCertificatePDF } from './certificatePdfRenderer.js';
+import { WorkerPool } from './workerPool.js';
+
+/**
+ * Certificate PDF Cache
+ * Issued certificates are rendered once and kept on disk, one directory per
+ * certificate and one file per SHA-256 of everything drawn on it. A download
+ * whose details hash to an existing file streams that file; otherwise the PDF
+ * is rendered on a worker-thread pool, written under a temporary name and
+ * renamed into place, with concurrent downloads of the same content sharing one
+ * render. Because the file name is the content hash, a renamed student or course
+ * simply maps to a new file, and every server process sharing the directory
+ * agrees on what to serve. Updating, revoking or deleting a certificate removes
+ * its directory so stale or revoked PDFs are not kept at rest.
+ */
+
+// Bump when the certificate layout changes so earlier renders are not served
+const RENDER_VERSION = 1;
+
+const { cacheDir, workers, maxQueue } = config.certificatePdf;
+
+const pool = workers > 0
+  ? new WorkerPool(new URL('./certificatePdfWorker.js', import.meta.url), { name: 'certificate rendering', size: workers, maxQueue })
+  : null;
+
+// Renders in flight by target file, so concurrent cold downloads render once
+const rendering = new Map();
+
+const cacheStats = {
+  hits: 0,
+  misses: 0,
+  renders: 0,
+  renderFailures: 0,
+  invalidations: 0,
+  bytesWritten: 0,
+  totalRenderMs: 0,
+};
+
+// Certificate ids are UUIDs; anything else is flattened so it cannot leave the cache directory
+const certificateDir = (certificateId) => path.join(
+  cacheDir,
+  String(certificateId).replace(/[^a-zA-Z0-9_-]/g, '_'),
+);
+
+/**
+ * Content address of a certificate's render details
+ * @param {Object} details - The arguments to generateCertificatePDF
+ * @returns {string} - Hex SHA-256
+ */
+export const certificateContentHash = (details) => createHash('sha256')
+  .update(JSON.stringify({ version: RENDER_VERSION, ...details }))
+  .digest('hex');
+
+// Drop earlier renders of a certificate once a newer one is in place
+const removeOtherRenders = async (directory, keep) => {
+  const entries = await readdir(directory).catch(() => []);
+  await Promise.all(entries
+    .filter((entry) => entry.endsWith('.pdf') && entry !== keep)
+    .map((entry) => unlink(path.join(directory, entry)).catch(() => {})));
+};
+
+const renderToDisk = async (details, filePath) => {
+  const started = Date.now();
+  let pdf;
+  try {
+    pdf = pool ? await pool.run('render', [details]) : await generateCertificatePDF(details);
+  } catch (error) {
+    cacheStats.renderFailures += 1;
+    throw error;
+  }
+  const directory = path.dirname(filePath);
+  await mkdir(directory, { recursive: true });
+  // Readers only ever see a complete file
+  const tempPath = `${filePath}.${randomUUID()}.tmp`;
+  await writeFile(tempPath, pdf);
+  await rename(tempPath, filePath);
+  await removeOtherRenders(directory, path.basename(filePath));
+
+  cacheStats.renders += 1;
+  cacheStats.bytesWritten += pdf.length;
+  cacheStats.totalRenderMs += Date.now() - started;
+  return pdf.length;
+};
+
+/**
+ * Path of the rendered PDF for a certificate, rendering it first on a miss
+ * @param {Object} details - The arguments to generateCertificatePDF
+ * @returns {Promise<{path: string, size: number, hash: string}>}
+ */
+export const getCertificatePdf = async (details) => {
+  const hash = certificateContentHash(details);
+  const filePath = path.join(certificateDir(details.certificateId), `${hash}.pdf`);
+  try {
+    const { size } = await stat(filePath);
+    cacheStats.hits += 1;
+    return { path: filePath, size, hash };
+  } catch (error) {
+    if (error.code !== 'ENOENT') throw error;
+  }
+
+  cacheStats.misses += 1;
+  let pending = rendering.get(filePath);
+  if (!pending) {
+    pending = renderToDisk(details, filePath).finally(() => rendering.delete(filePath));
+    rendering.set(filePath, pending);
+  }
+  const size = await pending;
+  return { path: filePath, size, hash };
+};
+
+/**
+ * Remove every cached render of a certificate after it is updated, revoked or deleted
+ * @param {string} certificateId
+ */
+export const invalidateCertificatePdf = async (certificateId) => {
+  try {
+    await rm(certificateDir(certificateId), { recursive: true, force: true });
+    cacheStats.invalidations += 1;
+  } catch (error) {
+    logger.error(`Failed to clear cached PDF for certificate ${certificateId}: ${error.message}`);
+  }
+};
+
+export const closeCertificatePdfCache = () => pool?.close();
+
+export const getCertificatePdfStats = () => ({
+  cacheDir,
+  ...cacheStats,
+  rendering: rendering.size,
+  avgRenderMs: cacheStats.renders ? cacheStats.totalRenderMs / cacheStats.renders : 0,
+  pool: pool ? pool.getStats() : { size: 0, mode: 'event loop' },
+});
@@ -0,0 +1,20 @@
+import { parentPort } from 'worker_threads';
+import { generateCertificatePDF } from './certificatePdfRenderer.js';
+
+/**
+ * Certificate PDF Worker
+ * Renders certificates on a worker thread for services/certificatePdfCache.js.
+ * The PDF comes back as bytes; writing it to the cache stays on the main thread.
+ */
+
+const tasks = {
+  render: (details) => generateCertificatePDF(details),
+};
+
+parentPort.on('message', async ({ id, task, args }) => {
+  try {
+    parentPort.postMessage({ id, result: await tasks[task](...args) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
@@ -0,0 +1,62 @@
+import { inArray, sql } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { contentVersions } from '../db/schema.js';
+
+/**
+ * Content Versions
+ * One counter per scope of cacheable reads, bumped after every successful write
+ * to that scope. Conditional GETs build their ETag from the counters, so a
+ * revalidation costs one primary key lookup instead of the response's queries.
+ * The counters live in the database so every server process agrees on them.
+ */
+
+export const CONTENT_SCOPES = {
+  // Courses, modules and lessons
+  catalog: 'catalog',
+  // Quizzes and their questions
+  quizzes: 'quizzes',
+  // Enrollments, payments and coupons
+  activity: 'activity',
+  // Deletes of rows the realtime delta feeds track, which a changed-rows query cannot see
+  deletions: 'deletions',
+};
+
+/**
+ * Advance the version of each scope
+ * @param {Array<string>} scopes - Scopes touched by the write
+ * @returns {Promise<void>}
+ */
+export const bumpContentVersions = async (scopes) => {
+  await db
+    .insert(contentVersions)
+    .values(scopes.map((scope) => ({ scope, version: 1 })))
+    .onDuplicateKeyUpdate({ set: { version: sql.raw('version + 1') } });
+};
+
+/**
+ * Current version of each scope; a scope that was never written is at 0
+ * @param {Array<string>} scopes - Scopes to read
+ * @returns {Promise<Object>} - Map of scope to version
+ */
+export const getContentVersions = async (scopes) => {
+  const rows = await db
+    .select({ scope: contentVersions.scope, version: contentVersions.version })
+    .from(contentVersions)
+    .where(inArray(contentVersions.scope, scopes));
+
+  const versions = Object.fromEntries(scopes.map((scope) => [scope, 0]));
+  for (const row of rows) {
+    versions[row.scope] = row.version;
+  }
+  return versions;
+};
+
+/**
+ * Strong ETag for a response that depends only on the given scopes
+ * @param {Array<string>} scopes - Scopes the response is built from
+ * @returns {Promise<string>} - Quoted entity tag, e.g. "catalog-12.quizzes-3"
+ */
+export const getContentEtag = async (scopes) => {
+  const versions = await getContentVersions(scopes);
+  return `"${scopes.map((scope) => `${scope}-${versions[scope]}`).join('.')}"`;
+};
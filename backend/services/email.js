@@ -35,6 +35,30 @@ const buildTransportOptions = (config) => {
     };
 };
 
+/**
+ * Whether SMTP credentials are set; without them every send is skipped
+ * @returns {boolean}
+ */
+export const isEmailConfigured = () => {
+    const config = getSmtpConfig();
+    return Boolean(config.email && config.password);
+};
+
+// One pooled transport per SMTP configuration, so a batch of queued emails reuses open connections
+let cachedTransport = null;
+
+const getTransporter = (config) => {
+    const key = JSON.stringify(config);
+    if (!cachedTransport || cachedTransport.key !== key) {
+        cachedTransport?.transporter.close();
+        cachedTransport = {
+            key,
+            transporter: nodemailer.createTransport({ ...buildTransportOptions(config), pool: true, maxConnections: 5 }),
+        };
+    }
+    return cachedTransport.transporter;
+};
+
 /**
  * Send an email
  * @param {Object} options - Email options
@@ -59,10 +83,7 @@ export const sendEmail = async (options) => {
     }
 
     try {
-        const transporter = nodemailer.createTransport(buildTransportOptions(config));
-
-        // Verify connection
-        await transporter.verify();
+        const transporter = getTransporter(config);
 
         const info = await transporter.sendMail({
             from: options.from || `"${config.fromName}" <${config.email}>`,
@@ -410,6 +431,7 @@ export const sendCertificateIssuedEmail = async (options) => {
 };
 
 export default {
+    isEmailConfigured,
     sendEmail,
     sendOtpEmail,
     sendWelcomeEmail,
@@ -0,0 +1,289 @@
+import { randomUUID } from 'crypto';
+import { and, eq, inArray, isNull, lt, lte, or, sql } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { emailJobs } from '../db/schema.js';
+import { config } from '../config/index.js';
+import logger from '../utils/logger.js';
+import {
+  isEmailConfigured,
+  sendCertificateIssuedEmail,
+  sendEnrollmentEmail,
+  sendOtpEmail,
+  sendWelcomeEmail,
+} from './email.js';
+
+/**
+ * Email Queue
+ * Outbound emails are written to email_jobs and sent in the background, so the
+ * request that triggers one answers as soon as the row is inserted, however
+ * slow SMTP is. Every server process drains the table: it claims a batch of due
+ * jobs under a lease, sends them over the pooled SMTP transport and reschedules
+ * failures with exponential backoff. Jobs with an expiry, such as OTPs, are
+ * dropped once they would arrive too late, and payloads are cleared when a job
+ * finishes so codes are not kept at rest.
+ */
+
+const senders = {
+  otp: ({ email, otp, expiryMinutes }) => sendOtpEmail(email, otp, expiryMinutes),
+  welcome: ({ email, name }) => sendWelcomeEmail(email, name),
+  enrollment: (options) => sendEnrollmentEmail(options),
+  certificate: (options) => sendCertificateIssuedEmail(options),
+};
+
+const FINISHED_STATUSES = ['sent', 'failed', 'expired', 'skipped'];
+const PRUNE_INTERVAL_MS = 60 * 60 * 1000;
+
+// Claims made by this process are tagged with its id
+const processId = randomUUID();
+
+const queueStats = {
+  enqueued: 0,
+  sent: 0,
+  retried: 0,
+  failed: 0,
+  expired: 0,
+  skipped: 0,
+  batches: 0,
+  lastDrainAt: null,
+  lastError: null,
+};
+
+const parsePayload = (value) => {
+  if (typeof value !== 'string') return value || {};
+  try {
+    return JSON.parse(value);
+  } catch (error) {
+    return {};
+  }
+};
+
+/**
+ * Queue an email for the background sender
+ * @param {string} kind - otp, welcome, enrollment or certificate
+ * @param {Object} payload - Sender arguments, including the recipient as email
+ * @param {Object} [options]
+ * @param {Date} [options.expiresAt] - Drop the job instead of sending it after this time
+ * @returns {Promise<string|null>} - Job id, or null when SMTP is not configured and nothing was queued
+ */
+export const enqueueEmail = async (kind, payload, { expiresAt = null } = {}) => {
+  if (!isEmailConfigured()) {
+    return null;
+  }
+  const id = randomUUID();
+  await db.insert(emailJobs).values({
+    id,
+    kind,
+    recipient: payload.email,
+    payload,
+    runAt: sql`NOW(3)`,
+    expiresAt,
+  });
+  queueStats.enqueued += 1;
+  // Start sending from this process now rather than at the next poll
+  setImmediate(() => drainEmailQueue().catch(() => {}));
+  return id;
+};
+
+export const queueOtpEmail = (email, otp, expiryMinutes, expiresAt) => enqueueEmail(
+  'otp',
+  { email, otp, expiryMinutes },
+  { expiresAt },
+);
+
+export const queueWelcomeEmail = (email, name) => enqueueEmail('welcome', { email, name });
+
+export const queueEnrollmentEmail = (options) => enqueueEmail('enrollment', options);
+
+export const queueCertificateIssuedEmail = (options) => enqueueEmail('certificate', options);
+
+// Lease up to batchSize due jobs to this process; a lease left by a crashed process runs out and is claimed again
+const claimBatch = async () => {
+  const { batchSize, leaseMs } = config.emailQueue;
+  await db
+    .update(emailJobs)
+    .set({ lockedBy: processId, lockedUntil: sql`NOW(3) + INTERVAL ${leaseMs * 1000} MICROSECOND` })
+    .where(and(
+      eq(emailJobs.status, 'pending'),
+      lte(emailJobs.runAt, sql`NOW(3)`),
+      or(isNull(emailJobs.lockedUntil), lt(emailJobs.lockedUntil, sql`NOW(3)`)),
+    ))
+    .orderBy(emailJobs.runAt)
+    .limit(batchSize);
+  return db
+    .select()
+    .from(emailJobs)
+    .where(and(eq(emailJobs.status, 'pending'), eq(emailJobs.lockedBy, processId)));
+};
+
+const deliver = async (job) => {
+  if (job.expiresAt && new Date(job.expiresAt).getTime() <= Date.now()) {
+    return { status: 'expired' };
+  }
+  try {
+    const result = await senders[job.kind](parsePayload(job.payload));
+    if (result.success) return { status: 'sent' };
+    // SMTP settings were removed after the job was queued
+    if (result.skipped) return { status: 'skipped' };
+    return { error: result.error || result.message };
+  } catch (error) {
+    return { error: error.message };
+  }
+};
+
+const finishJobs = async (ids, status) => {
+  if (ids.length === 0) return;
+  await db
+    .update(emailJobs)
+    .set({
+      status,
+      payload: null,
+      attempts: sql`${emailJobs.attempts} + 1`,
+      lockedBy: null,
+      lockedUntil: null,
+      sentAt: status === 'sent' ? sql`NOW()` : null,
+    })
+    .where(inArray(emailJobs.id, ids));
+  queueStats[status] += ids.length;
+};
+
+const retryJob = async (job, error) => {
+  const { maxAttempts, retryBaseMs } = config.emailQueue;
+  const attempts = job.attempts + 1;
+  queueStats.lastError = error;
+  if (attempts >= maxAttempts) {
+    logger.error(`Email job ${job.id} (${job.kind}) failed after ${attempts} attempts: ${error}`);
+    await db
+      .update(emailJobs)
+      .set({ status: 'failed', attempts, payload: null, lockedBy: null, lockedUntil: null, lastError: error })
+      .where(eq(emailJobs.id, job.id));
+    queueStats.failed += 1;
+    return;
+  }
+  // 1x, 2x, 4x... the base delay, with jitter so a failed batch does not retry in lockstep
+  const delayMs = Math.round(retryBaseMs * 2 ** (attempts - 1) * (0.8 + Math.random() * 0.4));
+  await db
+    .update(emailJobs)
+    .set({
+      attempts,
+      runAt: sql`NOW(3) + INTERVAL ${delayMs * 1000} MICROSECOND`,
+      lockedBy: null,
+      lockedUntil: null,
+      lastError: error,
+    })
+    .where(eq(emailJobs.id, job.id));
+  queueStats.retried += 1;
+};
+
+const processBatch = async () => {
+  const jobs = await claimBatch();
+  if (jobs.length === 0) {
+    return 0;
+  }
+  queueStats.batches += 1;
+  const outcomes = await Promise.all(jobs.map(deliver));
+
+  const finished = { sent: [], expired: [], skipped: [] };
+  const failures = [];
+  jobs.forEach((job, index) => {
+    const outcome = outcomes[index];
+    if (outcome.status) {
+      finished[outcome.status].push(job.id);
+    } else {
+      failures.push([job, outcome.error]);
+    }
+  });
+  await Promise.all([
+    ...Object.entries(finished).map(([status, ids]) => finishJobs(ids, status)),
+    ...failures.map(([job, error]) => retryJob(job, error)),
+  ]);
+  return jobs.length;
+};
+
+let draining = null;
+let nudged = false;
+let stopped = false;
+
+/**
+ * Send every due job, a batch at a time. Concurrent calls share a run; one made
+ * during a run makes it check for new jobs once more before finishing.
+ * @returns {Promise<number>} - Jobs processed
+ */
+export const drainEmailQueue = () => {
+  if (draining) {
+    nudged = true;
+    return draining;
+  }
+  draining = (async () => {
+    let processed = 0;
+    do {
+      nudged = false;
+      let claimed;
+      do {
+        claimed = await processBatch();
+        processed += claimed;
+      } while (claimed === config.emailQueue.batchSize && !stopped);
+    } while (nudged && !stopped);
+    queueStats.lastDrainAt = new Date().toISOString();
+    return processed;
+  })().catch((error) => {
+    queueStats.lastError = error.message;
+    logger.error(`Email queue drain failed: ${error.message}`);
+    throw error;
+  }).finally(() => {
+    draining = null;
+  });
+  return draining;
+};
+
+let lastPrunedAt = 0;
+
+const pruneFinishedJobs = async () => {
+  if (Date.now() - lastPrunedAt < PRUNE_INTERVAL_MS) {
+    return;
+  }
+  lastPrunedAt = Date.now();
+  try {
+    await db
+      .delete(emailJobs)
+      .where(and(
+        inArray(emailJobs.status, FINISHED_STATUSES),
+        lt(emailJobs.runAt, sql`NOW(3) - INTERVAL ${config.emailQueue.retentionMs * 1000} MICROSECOND`),
+      ))
+      .limit(1000);
+  } catch (error) {
+    logger.error(`Failed to prune finished email jobs: ${error.message}`);
+  }
+};
+
+let pollTimer = null;
+
+/**
+ * Send anything already due, then poll for due jobs and retries on the configured interval
+ */
+export const startEmailQueue = () => {
+  if (pollTimer) return;
+  stopped = false;
+  drainEmailQueue().catch(() => {});
+  pollTimer = setInterval(() => {
+    drainEmailQueue().catch(() => {});
+    pruneFinishedJobs();
+  }, config.emailQueue.pollIntervalMs);
+  pollTimer.unref();
+};
+
+/**
+ * Stop polling and wait for the batch in flight; unsent jobs stay queued for the next start
+ */
+export const stopEmailQueue = async () => {
+  stopped = true;
+  clearInterval(pollTimer);
+  pollTimer = null;
+  await draining?.catch(() => {});
+};
+
+export const getEmailQueueStats = () => ({
+  pollIntervalMs: config.emailQueue.pollIntervalMs,
+  batchSize: config.emailQueue.batchSize,
+  draining: Boolean(draining),
+  ...queueStats,
+});
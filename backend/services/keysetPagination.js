@@ -0,0 +1,109 @@
+import { and, desc, eq, getTableColumns, lt, or } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { config } from '../config/index.js';
+import { ApiError } from '../middleware/errorHandler.js';
+
+/**
+ * Keyset Pagination
+ * Admin list endpoints return one page at a time, newest first, ordered by
+ * (created_at, id). The next page starts after the last row of this one, read
+ * through a (created_at, id) index, so a deep page costs the same as the first
+ * and no response holds a whole table. `?fields=` narrows the SELECT itself.
+ */
+
+const encodeCursor = (row) => Buffer.from(JSON.stringify([new Date(row.createdAt).toISOString(), row.id]))
+  .toString('base64url');
+
+const decodeCursor = (token) => {
+  try {
+    const [createdAt, id] = JSON.parse(Buffer.from(String(token), 'base64url').toString('utf8'));
+    const at = new Date(createdAt);
+    if (Number.isNaN(at.getTime()) || typeof id !== 'string') {
+      throw new Error('malformed position');
+    }
+    return { at, id };
+  } catch (error) {
+    throw new ApiError(400, 'Invalid page cursor');
+  }
+};
+
+/**
+ * Columns to select for a ?fields= list; id and createdAt are always included
+ * because the cursor is built from them
+ * @param {Object} table - Drizzle table
+ * @param {string} [fields] - Comma-separated column property names
+ * @param {Object} [options]
+ * @param {Array<string>} [options.hidden] - Columns that may never be selected, e.g. password
+ * @returns {Object} - Drizzle selection, or undefined for every visible column
+ */
+export const parseFields = (table, fields, { hidden = [] } = {}) => {
+  const columns = getTableColumns(table);
+  for (const name of hidden) {
+    delete columns[name];
+  }
+  if (!fields) {
+    return hidden.length > 0 ? columns : undefined;
+  }
+
+  const selection = { id: columns.id, createdAt: columns.createdAt };
+  for (const name of String(fields).split(',').map((field) => field.trim()).filter(Boolean)) {
+    if (!columns[name]) {
+      throw new ApiError(400, `Unknown field: ${name}`);
+    }
+    selection[name] = columns[name];
+  }
+  return selection;
+};
+
+/**
+ * Read one page of a table, newest first
+ * @param {Object} table - Drizzle table with createdAt and id columns
+ * @param {Object} options
+ * @param {Array} [options.filters] - Conditions every row must match
+ * @param {Object} [options.selection] - Columns from parseFields
+ * @param {string|number} [options.limit] - Requested page size, clamped to the configured maximum
+ * @param {string} [options.cursor] - nextCursor of the previous page
+ * @returns {Promise<Object>} - { rows, nextCursor }, nextCursor null on the last page
+ */
+export const readPage = async (table, { filters = [], selection, limit, cursor } = {}) => {
+  const requested = Number.parseInt(limit, 10);
+  const pageSize = Math.min(
+    Number.isFinite(requested) && requested > 0 ? requested : config.pagination.defaultLimit,
+    config.pagination.maxLimit,
+  );
+
+  const conditions = [...filters];
+  if (cursor) {
+    const { at, id } = decodeCursor(cursor);
+    conditions.push(or(lt(table.createdAt, at), and(eq(table.createdAt, at), lt(table.id, id))));
+  }
+
+  let query = (selection ? db.select(selection) : db.select()).from(table);
+  if (conditions.length > 0) {
+    query = query.where(and(...conditions));
+  }
+  // One extra row tells whether another page follows without a COUNT
+  const rows = await query.orderBy(desc(table.createdAt), desc(table.id)).limit(pageSize + 1);
+
+  const hasMore = rows.length > pageSize;
+  if (hasMore) {
+    rows.length = pageSize;
+  }
+  return { rows, nextCursor: hasMore ? encodeCursor(rows[rows.length - 1]) : null };
+};
+
+/**
+ * Advertise the next page in X-Next-Cursor and a Link header, keeping the body a plain array
+ * @param {Object} req - Express request
+ * @param {Object} res - Express response
+ * @param {string|null} nextCursor - From readPage
+ */
+export const setPageHeaders = (req, res, nextCursor) => {
+  if (!nextCursor) {
+    return;
+  }
+  const url = new URL(req.originalUrl, 'http://placeholder');
+  url.searchParams.set('cursor', nextCursor);
+  res.setHeader('X-Next-Cursor', nextCursor);
+  res.setHeader('Link', `<${url.pathname}${url.search}>; rel="next"`);
+};
@@ -0,0 +1,318 @@
+/**
+ * Lesson Progress Write-Behind Buffer
+ * Coalesces lesson progress heartbeats per (user, lesson) in memory and writes
+ * them as batched multi-row upserts on an interval or once the buffer is full.
+ * A failing batch is retried row by row, so one row whose lesson, user or
+ * enrollment was deleted meanwhile is dropped instead of failing every row with it.
+ */
+
+import { randomUUID } from 'crypto';
+import { sql } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { userLessonProgress } from '../db/schema.js';
+import { config } from '../config/index.js';
+import logger from '../utils/logger.js';
+
+// Rows per INSERT ... ON DUPLICATE KEY UPDATE statement
+const UPSERT_BATCH_SIZE = 500;
+
+// Failed flushes an entry survives before it is dropped
+const MAX_REQUEUES = 10;
+
+// Errors that retrying the same row can never fix
+const PERMANENT_ERRORS = new Set([
+  'ER_NO_REFERENCED_ROW',
+  'ER_NO_REFERENCED_ROW_2',
+  'ER_BAD_NULL_ERROR',
+  'ER_DATA_TOO_LONG',
+  'ER_TRUNCATED_WRONG_VALUE',
+  'ER_TRUNCATED_WRONG_VALUE_FOR_FIELD',
+  'ER_WARN_DATA_OUT_OF_RANGE',
+]);
+
+const isPermanent = (error) => PERMANENT_ERRORS.has(error?.code ?? error?.cause?.code);
+
+// A zero in a batched row means "not sent", matching the route's `value || existing` updates
+const keepUnlessZero = (column) => sql.raw(`IF(VALUES(${column}) <> 0, VALUES(${column}), ${column})`);
+
+const upsertSet = {
+  status: sql.raw('VALUES(status)'),
+  progressPercentage: keepUnlessZero('progress_percentage'),
+  isCompleted: sql.raw('VALUES(is_completed)'),
+  completedAt: sql.raw('IF(VALUES(is_completed) AND completed_at IS NULL, VALUES(completed_at), completed_at)'),
+  lastAccessedAt: sql.raw('VALUES(last_accessed_at)'),
+  lastPosition: keepUnlessZero('last_position'),
+  timeSpentMinutes: sql.raw('time_spent_minutes + VALUES(time_spent_minutes)'),
+};
+
+// Rows that carry notes overwrite them, so an explicit null clears the lesson's notes
+const upsertSetWithNotes = { ...upsertSet, notes: sql.raw('VALUES(notes)') };
+
+// Entries only have a notes key once an update sent notes, even if it sent null
+const hasNotes = (entry) => Object.prototype.hasOwnProperty.call(entry, 'notes');
+
+/**
+ * Fold a newer update into an older pending entry for the same lesson
+ * @param {Object} entry - Pending entry, or undefined for the first update
+ * @param {Object} update - Newer update
+ * @returns {Object} - Coalesced entry
+ */
+const coalesce = (entry, update) => {
+  const isCompleted = Boolean(update.isCompleted);
+  let notes = {};
+  if (update.notes !== undefined) {
+    notes = { notes: update.notes };
+  } else if (entry && hasNotes(entry)) {
+    notes = { notes: entry.notes };
+  }
+  return {
+    id: entry?.id || randomUUID(),
+    userId: update.userId,
+    lessonId: update.lessonId,
+    moduleId: update.moduleId,
+    enrollmentId: update.enrollmentId,
+    courseId: update.courseId,
+    status: update.status || (isCompleted ? 'completed' : 'in_progress'),
+    progressPercentage: update.progressPercentage || entry?.progressPercentage || 0,
+    isCompleted,
+    completedAt: isCompleted ? (entry?.completedAt || update.at) : null,
+    lastAccessedAt: update.at,
+    lastPosition: update.lastPosition || entry?.lastPosition || 0,
+    timeSpentMinutes: (entry?.timeSpentMinutes || 0) + (update.timeSpentMinutes || 0),
+    ...notes,
+  };
+};
+
+export class LessonProgressBuffer {
+  /**
+   * @param {Object} options
+   * @param {number} options.flushIntervalMs - Time between background flushes (0 disables buffering)
+   * @param {number} options.maxPending - Pending (user, lesson) pairs that trigger an early flush
+   */
+  constructor({ flushIntervalMs, maxPending }) {
+    this.flushIntervalMs = flushIntervalMs;
+    this.maxPending = maxPending;
+    this.pending = new Map();
+    // Key -> failed flushes of its pending entry
+    this.requeues = new Map();
+    this.flushHandlers = [];
+    this.writing = Promise.resolve();
+    this.timer = null;
+    this.stats = { updates: 0, flushes: 0, rowsWritten: 0, statements: 0, failedFlushes: 0, droppedRows: 0 };
+  }
+
+  get enabled() {
+    return this.flushIntervalMs > 0;
+  }
+
+  key(userId, lessonId) {
+    return `${userId}:${lessonId}`;
+  }
+
+  /**
+   * Pending entry for a user's lesson, if one is waiting to be written
+   */
+  get(userId, lessonId) {
+    return this.pending.get(this.key(userId, lessonId));
+  }
+
+  hasPending(userId) {
+    for (const entry of this.pending.values()) {
+      if (entry.userId === userId) {
+        return true;
+      }
+    }
+    return false;
+  }
+
+  /**
+   * Register a handler run with the entries of every successful flush
+   * @param {Function} handler - async (entries) => void
+   */
+  onFlush(handler) {
+    this.flushHandlers.push(handler);
+  }
+
+  /**
+   * Buffer one heartbeat
+   * @param {Object} update - userId, lessonId, moduleId, enrollmentId, courseId, progress fields and `at`
+   * @returns {Object} - The coalesced pending entry
+   */
+  record(update) {
+    const key = this.key(update.userId, update.lessonId);
+    const entry = coalesce(this.pending.get(key), update);
+    this.pending.set(key, entry);
+    this.stats.updates += 1;
+
+    if (!this.timer) {
+      this.timer = setInterval(() => this.flush().catch(() => {}), this.flushIntervalMs);
+      this.timer.unref();
+    }
+    if (this.pending.size >= this.maxPending) {
+      this.flush().catch(() => {});
+    }
+    return { ...entry };
+  }
+
+  /**
+   * Write pending entries, or only one user's when userId is given. Flushes run one
+   * at a time so a forced flush never overtakes a batch that is still being written.
+   * @param {string} [userId] - Only flush this user's entries
+   * @returns {Promise<void>}
+   */
+  flush(userId) {
+    const run = this.writing.then(() => this.writeBatch(this.take(userId)));
+    this.writing = run.catch(() => {});
+    return run;
+  }
+
+  /**
+   * Flush a user's entries before reading their lesson progress from the database
+   */
+  async flushUser(userId) {
+    if (this.hasPending(userId)) {
+      await this.flush(userId);
+    }
+  }
+
+  take(userId) {
+    const entries = [];
+    for (const [key, entry] of this.pending) {
+      if (!userId || entry.userId === userId) {
+        entries.push(entry);
+        this.pending.delete(key);
+      }
+    }
+    return entries;
+  }
+
+  async upsert(chunk, set) {
+    const rows = chunk.map(({ courseId, ...row }) => row);
+    await db.insert(userLessonProgress).values(rows).onDuplicateKeyUpdate({ set });
+    this.stats.statements += 1;
+  }
+
+  async writeBatch(entries) {
+    if (entries.length === 0) {
+      return;
+    }
+
+    const written = [];
+    const failed = [];
+    let failure = null;
+    // Every row of a multi-row upsert shares one column list, so rows with and without notes go separately
+    const groups = [
+      [entries.filter(hasNotes), upsertSetWithNotes],
+      [entries.filter((entry) => !hasNotes(entry)), upsertSet],
+    ];
+    for (const [group, set] of groups) {
+      for (let start = 0; start < group.length; start += UPSERT_BATCH_SIZE) {
+        const chunk = group.slice(start, start + UPSERT_BATCH_SIZE);
+        // Once the database itself is failing, keep the rest for the next flush
+        if (failure) {
+          failed.push(...chunk);
+          continue;
+        }
+        try {
+          await this.upsert(chunk, set);
+          written.push(...chunk);
+          continue;
+        } catch (batchError) {
+          if (chunk.length === 1) {
+            if (isPermanent(batchError)) {
+              this.drop(chunk[0], batchError);
+            } else {
+              failure = batchError;
+              failed.push(...chunk);
+            }
+            continue;
+          }
+        }
+        // Retry the chunk row by row, so one bad row does not hold back the others
+        for (const entry of chunk) {
+          if (failure) {
+            failed.push(entry);
+            continue;
+          }
+          try {
+            await this.upsert([entry], set);
+            written.push(entry);
+          } catch (error) {
+            if (isPermanent(error)) {
+              this.drop(entry, error);
+            } else {
+              failure = error;
+              failed.push(entry);
+            }
+          }
+        }
+      }
+    }
+
+    for (const entry of written) {
+      this.requeues.delete(this.key(entry.userId, entry.lessonId));
+    }
+    if (failed.length > 0) {
+      this.stats.failedFlushes += 1;
+      this.requeue(failed);
+      logger.error(`Failed to flush ${failed.length} lesson progress update(s): ${failure.message}`);
+    }
+
+    if (written.length > 0) {
+      this.stats.flushes += 1;
+      this.stats.rowsWritten += written.length;
+      try {
+        for (const handler of this.flushHandlers) {
+          await handler(written);
+        }
+      } catch (error) {
+        logger.error(`Lesson progress flush handler failed: ${error.message}`);
+        throw error;
+      }
+    }
+    if (failure) {
+      throw failure;
+    }
+  }
+
+  drop(entry, error) {
+    this.requeues.delete(this.key(entry.userId, entry.lessonId));
+    this.stats.droppedRows += 1;
+    logger.error(`Dropped lesson progress for user ${entry.userId}, lesson ${entry.lessonId}: ${error.message}`);
+  }
+
+  // Put failed entries back, underneath anything recorded while they were being written
+  requeue(entries) {
+    for (const entry of entries) {
+      const key = this.key(entry.userId, entry.lessonId);
+      const attempts = (this.requeues.get(key) || 0) + 1;
+      if (attempts > MAX_REQUEUES) {
+        this.drop(entry, new Error(`still failing after ${MAX_REQUEUES} flushes`));
+        continue;
+      }
+      this.requeues.set(key, attempts);
+      const newer = this.pending.get(key);
+      this.pending.set(key, newer ? coalesce(entry, { ...newer, at: newer.lastAccessedAt }) : entry);
+    }
+  }
+
+  /**
+   * Stop the background timer and write everything still pending, for shutdown
+   */
+  async close() {
+    clearInterval(this.timer);
+    this.timer = null;
+    await this.flush();
+  }
+
+  getStats() {
+    return {
+      enabled: this.enabled,
+      flushIntervalMs: this.flushIntervalMs,
+      pending: this.pending.size,
+      ...this.stats,
+    };
+  }
+}
+
+export default new LessonProgressBuffer(config.progressBuffer);
@@ -1,5 +1,6 @@
 /* eslint-disable no-console */
 import crypto from 'crypto';
+import { incrementCounter, sweepCounters } from './sharedCounters.js';
 
 /**
  * OTP Generation and Verification Service
@@ -108,84 +109,41 @@ export const generateVerificationCode = (length = 8) => {
 
 /**
  * Rate limiting for OTP requests
- * Prevents abuse by limiting requests per email
+ * Prevents abuse by limiting requests per email. Counted in the shared counters
+ * so the limit holds however many server processes receive the requests.
  */
-const otpRequestTracker = new Map();
 
 /**
  * Check if OTP request is allowed
  * @param {string} email - User email
  * @param {number} maxRequests - Max requests per window (default 3)
  * @param {number} windowMinutes - Time window in minutes (default 15)
- * @returns {Object} - Rate limit result
+ * @returns {Promise<Object>} - Rate limit result
  */
-export const checkOTPRateLimit = (email, maxRequests = 3, windowMinutes = 15) => {
-  const key = email.toLowerCase();
-  const now = Date.now();
-  const windowMs = windowMinutes * 60 * 1000;
-  
-  if (!otpRequestTracker.has(key)) {
-    otpRequestTracker.set(key, {
-      requests: 1,
-      firstRequest: now,
-    });
-    return {
-      allowed: true,
-      remaining: maxRequests - 1,
-    };
-  }
-  
-  const data = otpRequestTracker.get(key);
-  
-  // Reset if window has passed
-  if (now - data.firstRequest > windowMs) {
-    otpRequestTracker.set(key, {
-      requests: 1,
-      firstRequest: now,
-    });
-    return {
-      allowed: true,
-      remaining: maxRequests - 1,
-    };
-  }
-  
+export const checkOTPRateLimit = async (email, maxRequests = 3, windowMinutes = 15) => {
+  const key = `otp:${email.toLowerCase()}`;
+  const { totalHits, resetTime } = await incrementCounter(key, windowMinutes * 60 * 1000);
+
   // Check if limit reached
-  if (data.requests >= maxRequests) {
-    const resetTime = new Date(data.firstRequest + windowMs);
+  if (totalHits > maxRequests) {
     return {
       allowed: false,
       error: 'Too many OTP requests. Please try again later.',
       resetTime,
     };
   }
-  
-  // Increment requests
-  data.requests++;
-  otpRequestTracker.set(key, data);
-  
+
   return {
     allowed: true,
-    remaining: maxRequests - data.requests,
+    remaining: maxRequests - totalHits,
   };
 };
 
 /**
  * Clean up expired rate limit entries
- * Call this periodically to prevent memory leak
+ * The shared counters also sweep themselves periodically
  */
-export const cleanupOTPRateLimit = () => {
-  const now = Date.now();
-  const windowMs = 15 * 60 * 1000; // 15 minutes
-  
-  for (const [key, data] of otpRequestTracker.entries()) {
-    if (now - data.firstRequest > windowMs) {
-      otpRequestTracker.delete(key);
-    }
-  }
-};
-
-// Clean up every 5 minutes
-setInterval(cleanupOTPRateLimit, 5 * 60 * 1000);
+export const cleanupOTPRateLimit = () => sweepCounters();
 
 export default {
   generateOTP,
@@ -0,0 +1,21 @@
+import { parentPort } from 'worker_threads';
+import bcrypt from 'bcryptjs';
+
+/**
+ * Password Hash Worker
+ * Runs bcrypt on a worker thread for services/passwordHasher.js. The synchronous
+ * calls are fine here: this thread does nothing else while a hash runs.
+ */
+
+const tasks = {
+  hash: (password, rounds) => bcrypt.hashSync(password, rounds),
+  compare: (password, hash) => bcrypt.compareSync(password, hash),
+};
+
+parentPort.on('message', ({ id, task, args }) => {
+  try {
+    parentPort.postMessage({ id, result: tasks[task](...args) });
+  } catch (error) {
+    parentPort.postMessage({ id, error: error.message });
+  }
+});
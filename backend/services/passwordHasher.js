@@ -0,0 +1,44 @@
+import bcrypt from 'bcryptjs';
+import { config } from '../config/index.js';
+import { WorkerPool } from './workerPool.js';
+
+/**
+ * Password Hasher
+ * bcrypt hashes and comparisons run on a small worker-thread pool, so a burst
+ * of signups or logins queues behind the pool instead of blocking every other
+ * request on the event loop. When the queue is full callers get a 503 to retry.
+ * Hashes are ordinary bcrypt strings and compare reads the cost from the stored
+ * hash, so passwords hashed before, or at another BCRYPT_ROUNDS, still verify.
+ */
+
+const { workers, maxQueue, rounds } = config.passwordHashing;
+
+const pool = workers > 0
+  ? new WorkerPool(new URL('./passwordHashWorker.js', import.meta.url), { name: 'password hashing', size: workers, maxQueue })
+  : null;
+
+/**
+ * Hash a new password at the configured cost
+ * @param {string} password - Plain text password
+ * @returns {Promise<string>} - bcrypt hash
+ */
+export const hashPassword = (password) => (pool
+  ? pool.run('hash', [password, rounds])
+  : bcrypt.hash(password, rounds));
+
+/**
+ * Check a password against a stored bcrypt hash
+ * @param {string} password - Plain text password
+ * @param {string} hash - Stored hash
+ * @returns {Promise<boolean>}
+ */
+export const verifyPassword = (password, hash) => (pool
+  ? pool.run('compare', [password, hash])
+  : bcrypt.compare(password, hash));
+
+export const closePasswordHasher = () => pool?.close();
+
+export const getPasswordHashStats = () => ({
+  rounds,
+  ...(pool ? pool.getStats() : { size: 0, mode: 'event loop' }),
+});
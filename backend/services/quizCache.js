@@ -0,0 +1,141 @@
+import { eq } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { quizQuestions } from '../db/schema.js';
+import { config } from '../config/index.js';
+import logger from '../utils/logger.js';
+
+/**
+ * Compiled Quiz Answer Key Cache
+ * Keeps each quiz's questions with their answers already parsed, so grading a
+ * submission needs no question query and no JSON.parse. Entries are tagged with
+ * quizzes.answer_key_version, which the question routes bump on every change,
+ * and the least recently used quiz is evicted once the cache is full.
+ */
+
+const entries = new Map();
+const stats = { hits: 0, misses: 0, evictions: 0 };
+
+const parseAnswer = (value) => {
+  try {
+    return JSON.parse(value);
+  } catch (e) {
+    // Not JSON, keep as-is
+    return value;
+  }
+};
+
+/**
+ * Parse a question row into what grading needs
+ * @param {Object} question - quiz_questions row
+ * @returns {Object} - Compiled question
+ */
+export const compileQuestion = (question) => {
+  const answer = parseAnswer(question.correctAnswer);
+  const type = question.questionType || 'multiple_choice';
+
+  return {
+    id: question.id,
+    type,
+    answer,
+    answerSet: type === 'multiple_select' ? new Set(Array.isArray(answer) ? answer : []) : null,
+    normalizedAnswer: type === 'short_answer' ? String(answer).toLowerCase().trim() : null,
+    explanation: question.explanation,
+  };
+};
+
+/**
+ * Check one answer against a compiled question
+ * @param {Object} compiled - Result of compileQuestion
+ * @param {*} userAnswer - Answer submitted for the question
+ * @returns {boolean} - Whether the answer is correct
+ */
+export const isAnswerCorrect = (compiled, userAnswer) => {
+  switch (compiled.type) {
+    case 'multiple_choice':
+    case 'true_false':
+      return userAnswer === compiled.answer;
+    case 'multiple_select': {
+      const userAnswerSet = new Set(Array.isArray(userAnswer) ? userAnswer : []);
+      return userAnswerSet.size === compiled.answerSet.size &&
+        [...userAnswerSet].every((value) => compiled.answerSet.has(value));
+    }
+    case 'short_answer':
+      return typeof userAnswer === 'string' && userAnswer.toLowerCase().trim() === compiled.normalizedAnswer;
+    default:
+      return false;
+  }
+};
+
+const compileQuiz = async (quizId) => {
+  const questions = await db
+    .select()
+    .from(quizQuestions)
+    .where(eq(quizQuestions.quizId, quizId));
+  return questions.map(compileQuestion);
+};
+
+/**
+ * Compiled questions for a quiz row, loading them only when the cached key is
+ * missing or older than the quiz's answer key version. Concurrent misses for the
+ * same version share one load.
+ * @param {Object} quiz - quizzes row
+ * @returns {Promise<Array>} - Compiled questions
+ */
+export const getAnswerKey = (quiz) => {
+  const version = quiz.answerKeyVersion || 0;
+  const entry = entries.get(quiz.id);
+
+  if (entry && entry.version === version) {
+    stats.hits += 1;
+    // Re-insert to mark as most recently used
+    entries.delete(quiz.id);
+    entries.set(quiz.id, entry);
+    return entry.questions;
+  }
+
+  stats.misses += 1;
+  const questions = compileQuiz(quiz.id);
+  if (config.quizCache.maxEntries <= 0) {
+    return questions;
+  }
+
+  entries.delete(quiz.id);
+  entries.set(quiz.id, { version, questions });
+  questions.catch((error) => {
+    logger.error(`Failed to compile answer key for quiz ${quiz.id}: ${error.message}`);
+    if (entries.get(quiz.id)?.questions === questions) {
+      entries.delete(quiz.id);
+    }
+  });
+
+  while (entries.size > config.quizCache.maxEntries) {
+    entries.delete(entries.keys().next().value);
+    stats.evictions += 1;
+  }
+  return questions;
+};
+
+/**
+ * Compile a quiz's answer key ahead of its first submission. Does nothing when
+ * caching is disabled; failures are logged by getAnswerKey.
+ * @param {Object} quiz - quizzes row
+ */
+export const prefetchAnswerKey = (quiz) => {
+  if (config.quizCache.maxEntries > 0 && entries.get(quiz.id)?.version !== (quiz.answerKeyVersion || 0)) {
+    getAnswerKey(quiz).catch(() => {});
+  }
+};
+
+/**
+ * Drop a quiz's compiled key, e.g. when the quiz is deleted
+ * @param {string} quizId - Quiz ID
+ */
+export const evictAnswerKey = (quizId) => {
+  entries.delete(quizId);
+};
+
+export const getQuizCacheStats = () => ({
+  size: entries.size,
+  maxEntries: config.quizCache.maxEntries,
+  ...stats,
+});
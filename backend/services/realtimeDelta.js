@@ -0,0 +1,243 @@
+import { createHash } from 'crypto';
+import { and, asc, desc, eq, gt, gte, lt, lte, or, sql } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { config } from '../config/index.js';
+import { CONTENT_SCOPES, getContentVersions } from './contentVersions.js';
+import { ApiError } from '../middleware/errorHandler.js';
+import logger from '../utils/logger.js';
+
+/**
+ * Realtime Delta Feed
+ * Returns only the rows of a dashboard's tables whose (updated_at, id) is past
+ * the caller's cursor, read through (updated_at, id) indexes so a poll costs the
+ * rows that changed rather than the size of the tables. Deletes are invisible to
+ * such a query, so any tracked delete makes the next poll ask for a resync.
+ * Rows from transactions that commit after the cursor has passed them are
+ * picked up by re-reading a trailing overlap window below the cursor.
+ */
+
+const encodeCursor = (cursor) => Buffer.from(JSON.stringify(cursor)).toString('base64url');
+
+const decodeCursor = (token) => {
+  if (!token) {
+    return null;
+  }
+  try {
+    const cursor = JSON.parse(Buffer.from(String(token), 'base64url').toString('utf8'));
+    if (typeof cursor !== 'object' || typeof cursor.tables !== 'object') {
+      throw new Error('missing tables');
+    }
+    return cursor;
+  } catch (error) {
+    throw new ApiError(400, 'Invalid realtime cursor');
+  }
+};
+
+const settled = (table) => sql`${table.updatedAt} < UTC_TIMESTAMP() - INTERVAL ${config.realtime.settleSeconds} SECOND`;
+
+// Rows past a table's cursor position, oldest first, stopping short of the settle window
+const readChangedRows = (table, at) => {
+  const conditions = [settled(table)];
+  if (at) {
+    const updatedAt = new Date(at[0]);
+    conditions.push(or(gt(table.updatedAt, updatedAt), and(eq(table.updatedAt, updatedAt), gt(table.id, at[1]))));
+  }
+  return db
+    .select()
+    .from(table)
+    .where(and(...conditions))
+    .orderBy(asc(table.updatedAt), asc(table.id))
+    .limit(config.realtime.deltaLimit);
+};
+
+// Rows at or below the cursor inside its overlap window, newest first; any not yet seen committed late
+const readOverlapRows = (table, at, since) => {
+  const updatedAt = new Date(at[0]);
+  return db
+    .select()
+    .from(table)
+    .where(and(
+      settled(table),
+      gte(table.updatedAt, new Date(since)),
+      or(lt(table.updatedAt, updatedAt), and(eq(table.updatedAt, updatedAt), lte(table.id, at[1]))),
+    ))
+    .orderBy(desc(table.updatedAt), desc(table.id))
+    // Room for the rows the cursor has seen plus a page of late ones
+    .limit(config.realtime.overlapRows + config.realtime.deltaLimit);
+};
+
+// Short digest of one version of a row, so the cursor can list what it has seen in a few bytes each
+const fingerprint = (row) => createHash('sha1')
+  .update(`${row.id}@${new Date(row.updatedAt).getTime()}`)
+  .digest('base64url')
+  .slice(0, 8);
+
+const compareRows = (left, right) => (new Date(left.updatedAt) - new Date(right.updatedAt))
+  || (left.id < right.id ? -1 : left.id > right.id ? 1 : 0);
+
+/**
+ * Overlap window for the next poll: the rows delivered within overlapSeconds of the
+ * cursor, newest first and at most overlapRows of them. When that cap cuts the
+ * window short it starts just after the oldest row kept. It never reaches below
+ * the previous window, whose older rows were not re-read by this poll.
+ */
+const nextWindow = (at, delivered, previousSince) => {
+  const floor = Math.max(
+    new Date(at[0]).getTime() - config.realtime.overlapSeconds * 1000,
+    previousSince ? new Date(previousSince).getTime() : -Infinity,
+  );
+  const recent = delivered
+    .filter((row) => new Date(row.updatedAt).getTime() >= floor)
+    .sort((left, right) => compareRows(right, left));
+  const kept = recent.slice(0, config.realtime.overlapRows);
+  const since = kept.length < recent.length
+    ? new Date(kept[kept.length - 1].updatedAt).getTime() + 1
+    : floor;
+  return { since: new Date(since).toISOString(), seen: kept.map(fingerprint) };
+};
+
+/**
+ * Read one page of changes for a feed. A row is stamped with updated_at when it is
+ * written but only becomes visible when its transaction commits, which may be after
+ * a poll has moved the cursor past it. Each poll therefore also re-reads the last
+ * overlapSeconds below the cursor and returns the rows there that the cursor's
+ * digest list has not seen.
+ * @param {Object} sources - Map of feed key to { table, toChange(row) => { row } | { removed: id } }
+ * @param {string} [token] - Cursor from the previous response; omit to start from the beginning
+ * @returns {Promise<Object>} - { reset, cursor, hasMore, changes, removed, rowsRead }
+ */
+export const readDelta = async (sources, token) => {
+  const cursor = decodeCursor(token);
+  const { [CONTENT_SCOPES.deletions]: deletions } = await getContentVersions([CONTENT_SCOPES.deletions]);
+  if (cursor && cursor.deletions !== deletions) {
+    return { reset: true, cursor: null, hasMore: false, changes: {}, removed: {}, rowsRead: 0 };
+  }
+
+  const keys = Object.keys(sources);
+  // Cursors issued before the overlap window was added are a bare [updatedAt, id] position
+  const positions = keys.map((key) => {
+    const position = cursor?.tables[key];
+    return Array.isArray(position) ? { at: position, since: position[0], seen: [] } : position;
+  });
+  const pages = await Promise.all(keys.map((key, index) => readChangedRows(sources[key].table, positions[index]?.at)));
+  const overlaps = await Promise.all(keys.map((key, index) => (positions[index]
+    ? readOverlapRows(sources[key].table, positions[index].at, positions[index].since)
+    : [])));
+
+  const next = { deletions, tables: { ...cursor?.tables } };
+  const changes = {};
+  const removed = {};
+  let hasMore = false;
+  let rowsRead = 0;
+  keys.forEach((key, index) => {
+    const position = positions[index];
+    const rows = pages[index];
+    const overlap = overlaps[index];
+    const seen = new Set(position?.seen);
+    const late = overlap.filter((row) => !seen.has(fingerprint(row))).sort(compareRows);
+    changes[key] = [];
+    removed[key] = [];
+    rowsRead += rows.length + overlap.length;
+    hasMore = hasMore || rows.length === config.realtime.deltaLimit;
+
+    const at = rows.length > 0
+      ? [new Date(rows[rows.length - 1].updatedAt).toISOString(), rows[rows.length - 1].id]
+      : position?.at;
+    if (at) {
+      next.tables[key] = { at, ...nextWindow(at, [...overlap, ...rows], position?.since) };
+    }
+    for (const row of [...late, ...rows]) {
+      const change = sources[key].toChange(row);
+      if (change.removed) {
+        removed[key].push(change.removed);
+      } else {
+        changes[key].push(change.row);
+      }
+    }
+  });
+
+  return { reset: false, cursor: encodeCursor(next), hasMore, changes, removed, rowsRead };
+};
+
+let openStreams = 0;
+
+/**
+ * Serve a feed as server-sent events. Each `delta` event carries one page and
+ * uses its cursor as the event id, so a reconnecting client resumes from
+ * Last-Event-ID; a `reset` event tells it to drop its state before the stream
+ * starts over from the beginning.
+ * @param {Object} req - Express request; cursor from Last-Event-ID or ?cursor=
+ * @param {Object} res - Express response
+ * @param {Object} sources - Same as readDelta
+ */
+export const streamDelta = async (req, res, sources) => {
+  if (openStreams >= config.realtime.maxStreams) {
+    return res.status(503).json({ error: 'Too many realtime streams open, poll the delta endpoint instead' });
+  }
+
+  let cursor = req.get('Last-Event-ID') || req.query.cursor;
+  try {
+    decodeCursor(cursor);
+  } catch (error) {
+    return res.status(error.statusCode).json({ error: error.message });
+  }
+
+  openStreams += 1;
+  res.writeHead(200, {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    Connection: 'keep-alive',
+    // Keep reverse proxies from buffering the stream
+    'X-Accel-Buffering': 'no',
+  });
+
+  let timer = null;
+  let closed = false;
+  const send = (chunk) => {
+    res.write(chunk);
+    // compression() holds writes until flushed
+    res.flush?.();
+  };
+
+  const poll = async () => {
+    try {
+      const delta = await readDelta(sources, cursor);
+      if (closed) {
+        return;
+      }
+      if (delta.reset) {
+        cursor = null;
+        send('event: reset\ndata: {}\n\n');
+        timer = setTimeout(poll, 0);
+        return;
+      }
+      if (delta.rowsRead > 0) {
+        cursor = delta.cursor;
+        send(`id: ${cursor}\nevent: delta\ndata: ${JSON.stringify(delta)}\n\n`);
+      } else {
+        send(': keep-alive\n\n');
+      }
+      // A full page means more rows are waiting, so fetch the next one straight away
+      timer = setTimeout(poll, delta.hasMore ? 0 : config.realtime.streamIntervalMs);
+    } catch (error) {
+      logger.error(`Realtime stream poll failed: ${error.message}`);
+      if (!closed) {
+        send(`event: error\ndata: ${JSON.stringify({ error: 'Failed to read realtime changes' })}\n\n`);
+        res.end();
+      }
+    }
+  };
+
+  res.on('close', () => {
+    closed = true;
+    openStreams -= 1;
+    clearTimeout(timer);
+  });
+  send(`retry: ${config.realtime.streamIntervalMs}\n\n`);
+  await poll();
+};
+
+export const getRealtimeStreamStats = () => ({
+  openStreams,
+  maxStreams: config.realtime.maxStreams,
+});
@@ -0,0 +1,268 @@
+import { eq, sql } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { sharedCounters } from '../db/schema.js';
+import { config } from '../config/index.js';
+import logger from '../utils/logger.js';
+
+/**
+ * Shared Counters
+ * Fixed-window hit counters behind the API rate limit and the OTP request
+ * limit. The memory store counts within this process, which is all a single
+ * process or a test run needs; the database store keeps the counters in
+ * shared_counters so every cluster worker and host counts against one limit.
+ * The memory store is capped at maxEntries and expires windows on a timing
+ * wheel, so a flood of distinct keys costs a fixed amount of heap. Each
+ * limit (the key prefix before the first colon) gets its own memory store
+ * and cap, so a flood of OTP addresses cannot evict the API limit's
+ * per-IP counters.
+ */
+
+// Memory store expiry runs on a timing wheel of one-second slots
+const WHEEL_TICK_MS = 1000;
+// Rough heap cost of one counter: its map entry, { hits, resetAt } object and wheel slot entry
+const ENTRY_OVERHEAD_BYTES = 160;
+
+class MemoryCounterStore {
+  constructor({ maxEntries }) {
+    this.name = 'memory';
+    this.maxEntries = maxEntries;
+    // Keys are re-inserted when a new window opens, so the first key always has the oldest window
+    this.counters = new Map();
+    // Wheel slot -> keys whose window ends within it
+    this.wheel = new Map();
+    this.cursor = Math.floor(Date.now() / WHEEL_TICK_MS);
+    this.keyChars = 0;
+    this.expired = 0;
+    this.evicted = 0;
+    this.timer = setInterval(() => this.advance(Date.now()), WHEEL_TICK_MS);
+    this.timer.unref();
+  }
+
+  slotOf(resetAt) {
+    return Math.ceil(resetAt / WHEEL_TICK_MS);
+  }
+
+  remove(key) {
+    const entry = this.counters.get(key);
+    if (!entry) {
+      return false;
+    }
+    const slot = this.wheel.get(this.slotOf(entry.resetAt));
+    slot?.delete(key);
+    if (slot?.size === 0) {
+      this.wheel.delete(this.slotOf(entry.resetAt));
+    }
+    this.counters.delete(key);
+    this.keyChars -= key.length;
+    return true;
+  }
+
+  // Drop every counter whose window ended in a slot the wheel has now passed
+  advance(now) {
+    const target = Math.floor(now / WHEEL_TICK_MS);
+    let removed = 0;
+    for (; this.cursor <= target; this.cursor += 1) {
+      const keys = this.wheel.get(this.cursor);
+      if (!keys) continue;
+      this.wheel.delete(this.cursor);
+      for (const key of keys) {
+        this.counters.delete(key);
+        this.keyChars -= key.length;
+      }
+      removed += keys.size;
+    }
+    this.expired += removed;
+    return removed;
+  }
+
+  async increment(key, windowMs) {
+    const now = Date.now();
+    let entry = this.counters.get(key);
+    if (!entry || entry.resetAt <= now) {
+      this.remove(key);
+      // At capacity the oldest window goes first, so a flood of new keys cannot grow the heap
+      if (this.counters.size >= this.maxEntries) {
+        this.remove(this.counters.keys().next().value);
+        this.evicted += 1;
+      }
+      entry = { hits: 0, resetAt: now + windowMs };
+      this.counters.set(key, entry);
+      this.keyChars += key.length;
+      const slot = this.slotOf(entry.resetAt);
+      if (!this.wheel.has(slot)) {
+        this.wheel.set(slot, new Set());
+      }
+      this.wheel.get(slot).add(key);
+    }
+    entry.hits += 1;
+    return { totalHits: entry.hits, resetTime: new Date(entry.resetAt) };
+  }
+
+  async decrement(key) {
+    const entry = this.counters.get(key);
+    if (entry && entry.hits > 0) {
+      entry.hits -= 1;
+    }
+  }
+
+  async reset(key) {
+    this.remove(key);
+  }
+
+  async sweep() {
+    return this.advance(Date.now());
+  }
+
+  getStats() {
+    return {
+      keys: this.counters.size,
+      maxEntries: this.maxEntries,
+      wheelSlots: this.wheel.size,
+      expired: this.expired,
+      evicted: this.evicted,
+      estimatedBytes: this.counters.size * ENTRY_OVERHEAD_BYTES + this.keyChars * 2,
+    };
+  }
+}
+
+class DatabaseCounterStore {
+  constructor() {
+    this.name = 'database';
+  }
+
+  async increment(key, windowMs) {
+    // An ended window restarts at one hit; hits is assigned first, so both columns test the old reset_at
+    await db
+      .insert(sharedCounters)
+      .values({ key, hits: 1, resetAt: sql`NOW(3) + INTERVAL ${windowMs * 1000} MICROSECOND` })
+      .onDuplicateKeyUpdate({
+        set: {
+          hits: sql.raw('IF(reset_at <= NOW(3), 1, hits + 1)'),
+          resetAt: sql.raw('IF(reset_at <= NOW(3), VALUES(reset_at), reset_at)'),
+        },
+      });
+    const [counter] = await db
+      .select({ hits: sharedCounters.hits, resetAt: sharedCounters.resetAt })
+      .from(sharedCounters)
+      .where(eq(sharedCounters.key, key))
+      .limit(1);
+    return {
+      totalHits: counter?.hits ?? 1,
+      resetTime: counter ? new Date(counter.resetAt) : new Date(Date.now() + windowMs),
+    };
+  }
+
+  async decrement(key) {
+    await db
+      .update(sharedCounters)
+      .set({ hits: sql.raw('GREATEST(hits - 1, 0)') })
+      .where(eq(sharedCounters.key, key));
+  }
+
+  async reset(key) {
+    await db.delete(sharedCounters).where(eq(sharedCounters.key, key));
+  }
+
+  async sweep() {
+    const [result] = await db.delete(sharedCounters).where(sql`${sharedCounters.resetAt} <= NOW(3)`);
+    return result?.affectedRows ?? 0;
+  }
+
+  getStats() {
+    return {};
+  }
+}
+
+const useDatabase = config.sharedState.store === 'database';
+const databaseStore = useDatabase ? new DatabaseCounterStore() : null;
+// Limit name -> its memory store
+const memoryStores = new Map();
+
+const limitOf = (key) => {
+  const separator = key.indexOf(':');
+  return separator === -1 ? '' : key.slice(0, separator);
+};
+
+// Every key lives in the one database table, but each limit has a memory store of its own
+const storeFor = (key) => {
+  if (databaseStore) {
+    return databaseStore;
+  }
+  const limit = limitOf(key);
+  if (!memoryStores.has(limit)) {
+    memoryStores.set(limit, new MemoryCounterStore({ maxEntries: config.sharedState.maxEntries }));
+  }
+  return memoryStores.get(limit);
+};
+
+const sweepAll = async () => {
+  if (databaseStore) {
+    return databaseStore.sweep();
+  }
+  let swept = 0;
+  for (const store of memoryStores.values()) {
+    swept += await store.sweep();
+  }
+  return swept;
+};
+
+const sweepStats = { sweeps: 0, swept: 0 };
+
+const sweepTimer = setInterval(async () => {
+  try {
+    sweepStats.swept += await sweepAll();
+    sweepStats.sweeps += 1;
+  } catch (error) {
+    logger.error(`Failed to sweep expired shared counters: ${error.message}`);
+  }
+}, config.sharedState.sweepIntervalMs);
+sweepTimer.unref();
+
+/**
+ * Count one hit against a key's window, opening a new window if the last one ended
+ * @param {string} key - Counter key, prefixed by its limit, e.g. otp:user@example.com
+ * @param {number} windowMs - Window length
+ * @returns {Promise<Object>} - { totalHits, resetTime }
+ */
+export const incrementCounter = (key, windowMs) => storeFor(key).increment(key, windowMs);
+
+export const decrementCounter = (key) => storeFor(key).decrement(key);
+
+export const resetCounter = (key) => storeFor(key).reset(key);
+
+export const sweepCounters = () => sweepAll();
+
+export const getSharedCounterStats = () => ({
+  store: databaseStore ? databaseStore.name : 'memory',
+  ...sweepStats,
+  // Per-limit memory store counters, e.g. limits.otp.evicted
+  limits: Object.fromEntries([...memoryStores].map(([limit, store]) => [limit, store.getStats()])),
+});
+
+/**
+ * express-rate-limit store on the shared counters, so the API limit counts
+ * requests from every worker together
+ */
+export class SharedRateLimitStore {
+  constructor(prefix = 'api:') {
+    this.prefix = prefix;
+    // Hits are not kept in this process
+    this.localKeys = false;
+  }
+
+  init(options) {
+    this.windowMs = options.windowMs;
+  }
+
+  increment(key) {
+    return incrementCounter(`${this.prefix}${key}`, this.windowMs);
+  }
+
+  decrement(key) {
+    return decrementCounter(`${this.prefix}${key}`);
+  }
+
+  resetKey(key) {
+    return resetCounter(`${this.prefix}${key}`);
+  }
+}
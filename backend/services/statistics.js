@@ -0,0 +1,317 @@
+import cluster from 'cluster';
+import { eq, sql } from 'drizzle-orm';
+import { db } from '../db/index.js';
+import { courses, coupons, enrollments, payments, statCounters } from '../db/schema.js';
+import { config } from '../config/index.js';
+import logger from '../utils/logger.js';
+
+/**
+ * Materialized Statistics
+ * Platform and per-user counters stored in stat_counters and adjusted by the
+ * routes that write courses, enrollments, payments and coupons, so reading them
+ * is a primary key lookup. Each adjustment commits in the same transaction as
+ * its source row, which is locked while it is read. A reconciliation pass
+ * recomputes every counter from the source tables at startup and on an
+ * interval, and applies the difference as a correction so writes landing
+ * meanwhile are not lost. In a cluster only the primary reconciles.
+ */
+
+export const PLATFORM_SCOPE = 'platform';
+
+const userScope = (userId) => `user:${userId}`;
+
+const flag = (value) => (value ? 1 : 0);
+
+// Lower-cased payment method and amount paid, read the same way normalizeEnrollment does
+const billingMethod = (enrollment) => String(enrollment.billingInfo?.method || '').toLowerCase();
+const amountPaid = (enrollment) => Number(
+  enrollment.billingInfo?.amountPaid ?? enrollment.billingInfo?.amount ?? enrollment.amount ?? 0
+);
+
+/**
+ * What one row contributes to each counter, keyed by scope then counter name.
+ * Fields left out of an insert fall back to the column defaults.
+ */
+const contributions = {
+  course: (course) => ({
+    [PLATFORM_SCOPE]: {
+      totalCourses: flag(course.isPublished),
+      featuredCourses: flag(course.isPublished && course.isFeatured),
+    },
+  }),
+  payment: (payment) => ({
+    [PLATFORM_SCOPE]: { capturedPayments: flag(String(payment.status || '').toLowerCase() === 'captured') },
+  }),
+  coupon: (coupon) => ({
+    [PLATFORM_SCOPE]: { activeCoupons: flag(coupon.isActive !== false) },
+  }),
+  enrollment: (enrollment) => {
+    const counters = { [PLATFORM_SCOPE]: { totalEnrollments: 1 } };
+    if (String(enrollment.status || 'PENDING').toUpperCase() === 'SUCCESS') {
+      const method = billingMethod(enrollment);
+      counters[userScope(enrollment.userId)] = {
+        totalEnrollments: 1,
+        offlineEnrollments: flag(method === 'offline'),
+        onlineEnrollments: flag(method === 'online'),
+        freeEnrollments: flag(method === 'free' || amountPaid(enrollment) === 0),
+      };
+    }
+    return counters;
+  },
+};
+
+const addCounters = (totals, counters, sign) => {
+  for (const [scope, values] of Object.entries(counters)) {
+    for (const [name, value] of Object.entries(values)) {
+      const key = `${scope}\u0000${name}`;
+      totals.set(key, (totals.get(key) || 0) + sign * value);
+    }
+  }
+};
+
+// Add (scope, name, delta) rows to their counters in one statement
+const applyDeltas = async (executor, totals) => {
+  const rows = [];
+  for (const [key, value] of totals) {
+    if (value !== 0) {
+      const [scope, name] = key.split('\u0000');
+      rows.push({ scope, name, value });
+    }
+  }
+  if (rows.length === 0) {
+    return 0;
+  }
+  await executor
+    .insert(statCounters)
+    .values(rows)
+    .onDuplicateKeyUpdate({ set: { value: sql.raw('value + VALUES(value)') } });
+  return rows.length;
+};
+
+/**
+ * Adjust the counters for rows that were inserted, updated or deleted. Outside
+ * a transaction failures are logged rather than thrown and the next
+ * reconciliation repairs the drift; inside one they roll the source write back.
+ * @param {Array<Object>} changes - { kind: 'course'|'payment'|'coupon'|'enrollment', before, after }
+ *   with before null for inserts and after null for deletes
+ * @param {Object} [executor] - Transaction to write in, defaults to db
+ */
+export const recordStatChanges = async (changes, executor = db) => {
+  const totals = new Map();
+  for (const { kind, before, after } of changes) {
+    if (before) addCounters(totals, contributions[kind](before), -1);
+    if (after) addCounters(totals, contributions[kind](after), 1);
+  }
+  try {
+    await applyDeltas(executor, totals);
+  } catch (error) {
+    if (executor !== db) throw error;
+    logger.error(`Failed to update statistic counters: ${error.message}`);
+  }
+};
+
+/**
+ * Insert, update or delete one row and adjust its counters in the same
+ * transaction. The row is read FOR UPDATE before `write` runs and read again
+ * after it, so concurrent writes to the row queue, each sees the state the
+ * previous one committed, and a change is counted exactly once.
+ * @param {string} kind - course, payment, coupon or enrollment
+ * @param {Object} table - Drizzle table for the kind
+ * @param {Object} where - Condition selecting the row
+ * @param {Function} write - async (tx, before) => void, making the change through tx
+ * @param {Object} [executor] - Enclosing transaction; a new one is started by default
+ * @returns {Promise<Object>} - { before, after }, each null when the row does not exist
+ */
+export const writeWithStatChanges = (kind, table, where, write, executor = null) => {
+  const run = async (tx) => {
+    const [before = null] = await tx.select().from(table).where(where).limit(1).for('update');
+    await write(tx, before);
+    const [after = null] = await tx.select().from(table).where(where).limit(1);
+    await recordStatChanges([{ kind, before, after }], tx);
+    return { before, after };
+  };
+  return executor ? run(executor) : db.transaction(run);
+};
+
+const readScope = async (scope) => {
+  const rows = await db
+    .select({ name: statCounters.name, value: statCounters.value })
+    .from(statCounters)
+    .where(eq(statCounters.scope, scope));
+  return Object.fromEntries(rows.map((row) => [row.name, row.value]));
+};
+
+/**
+ * Platform totals: totalCourses, featuredCourses, totalEnrollments, capturedPayments, activeCoupons
+ */
+export const getPlatformStats = async () => {
+  const counters = await readScope(PLATFORM_SCOPE);
+  return {
+    totalCourses: counters.totalCourses || 0,
+    featuredCourses: counters.featuredCourses || 0,
+    totalEnrollments: counters.totalEnrollments || 0,
+    capturedPayments: counters.capturedPayments || 0,
+    activeCoupons: counters.activeCoupons || 0,
+  };
+};
+
+/**
+ * A user's successful enrollments by payment method
+ */
+export const getUserEnrollmentStats = async (userId) => {
+  const counters = await readScope(userScope(userId));
+  return {
+    totalEnrollments: counters.totalEnrollments || 0,
+    offlineEnrollments: counters.offlineEnrollments || 0,
+    onlineEnrollments: counters.onlineEnrollments || 0,
+    freeEnrollments: counters.freeEnrollments || 0,
+  };
+};
+
+const count = (condition) => sql`SUM(CASE WHEN ${condition} THEN 1 ELSE 0 END)`.mapWith(Number);
+const billingField = (field) => sql`NULLIF(JSON_UNQUOTE(JSON_EXTRACT(${enrollments.billingInfo}, ${`$.${field}`})), 'null')`;
+
+// Every counter recomputed from the source tables, in the same shape as addCounters takes
+const computeCounters = async (executor) => {
+  const total = sql`COUNT(*)`.mapWith(Number);
+  const [[courseTotals], [paymentTotals], [couponTotals], [enrollmentTotals], userTotals] = await Promise.all([
+    executor.select({
+      totalCourses: count(sql`${courses.isPublished} = 1`),
+      featuredCourses: count(sql`${courses.isPublished} = 1 AND ${courses.isFeatured} = 1`),
+    }).from(courses),
+    executor.select({ capturedPayments: count(sql`LOWER(${payments.status}) = 'captured'`) }).from(payments),
+    executor.select({ activeCoupons: count(sql`${coupons.isActive} = 1`) }).from(coupons),
+    executor.select({ totalEnrollments: total }).from(enrollments),
+    executor.select({
+      userId: enrollments.userId,
+      totalEnrollments: total,
+      offlineEnrollments: count(sql`LOWER(${billingField('method')}) = 'offline'`),
+      onlineEnrollments: count(sql`LOWER(${billingField('method')}) = 'online'`),
+      freeEnrollments: count(sql`LOWER(${billingField('method')}) = 'free'
+        OR COALESCE(${billingField('amountPaid')}, ${billingField('amount')}, ${enrollments.amount}, 0) = 0`),
+    })
+      .from(enrollments)
+      .where(sql`UPPER(${enrollments.status}) = 'SUCCESS'`)
+      .groupBy(enrollments.userId),
+  ]);
+
+  const counters = {
+    [PLATFORM_SCOPE]: {
+      totalCourses: courseTotals?.totalCourses || 0,
+      featuredCourses: courseTotals?.featuredCourses || 0,
+      totalEnrollments: enrollmentTotals?.totalEnrollments || 0,
+      capturedPayments: paymentTotals?.capturedPayments || 0,
+      activeCoupons: couponTotals?.activeCoupons || 0,
+    },
+  };
+  for (const { userId, ...values } of userTotals) {
+    counters[userScope(userId)] = values;
+  }
+  return counters;
+};
+
+const reconcileStats = {
+  reconciliations: 0,
+  failedReconciliations: 0,
+  lastReconciledAt: null,
+  lastCorrections: 0,
+  totalCorrections: 0,
+};
+
+let reconciling = null;
+let rerun = null;
+
+/**
+ * Recompute every counter and correct the ones that drifted. Source rows and
+ * counters are read from one transaction snapshot. A call made during a run
+ * waits for it and then runs once more, since that run's snapshot may predate
+ * the caller's write; calls made meanwhile share the second run. A write whose
+ * counter update commits just after the snapshot can be corrected twice, which
+ * the next run undoes.
+ * @returns {Promise<number>} - Counters corrected
+ */
+export const reconcileStatistics = () => {
+  if (reconciling) {
+    rerun ??= reconciling.catch(() => {}).then(() => {
+      rerun = null;
+      return reconcileStatistics();
+    });
+    return rerun;
+  }
+  reconciling = db.transaction(async (tx) => {
+    const expected = await computeCounters(tx);
+    const stored = await tx.select().from(statCounters);
+
+    const totals = new Map();
+    addCounters(totals, expected, 1);
+    for (const row of stored) {
+      addCounters(totals, { [row.scope]: { [row.name]: row.value } }, -1);
+    }
+    return applyDeltas(tx, totals);
+  }).then((corrections) => {
+    reconcileStats.reconciliations += 1;
+    reconcileStats.lastReconciledAt = new Date().toISOString();
+    reconcileStats.lastCorrections = corrections;
+    reconcileStats.totalCorrections += corrections;
+    if (corrections > 0) {
+      logger.info(`📊 Statistics reconciliation corrected ${corrections} counter(s)`);
+    }
+    return corrections;
+  }, (error) => {
+    reconcileStats.failedReconciliations += 1;
+    logger.error(`Statistics reconciliation failed: ${error.message}`);
+    throw error;
+  }).finally(() => {
+    reconciling = null;
+  });
+  return reconciling;
+};
+
+let reconcileTimer = null;
+
+/**
+ * Reconcile once, e.g. to seed the counters on first start, then on the configured interval
+ */
+export const startStatisticsReconciler = async () => {
+  await reconcileStatistics().catch(() => {});
+  if (config.statistics.reconcileIntervalMs > 0 && !reconcileTimer) {
+    reconcileTimer = setInterval(() => reconcileStatistics().catch(() => {}), config.statistics.reconcileIntervalMs);
+    reconcileTimer.unref();
+  }
+};
+
+const RECONCILE_MESSAGE = 'statistics:reconcile';
+
+/**
+ * Ask for a reconciliation after a write too broad to adjust, such as a delete
+ * that cascades. Cluster workers hand the request to the primary, so it is never
+ * applied by two processes at once.
+ */
+export const requestStatisticsReconcile = () => {
+  if (cluster.isWorker) {
+    process.send({ type: RECONCILE_MESSAGE });
+    return;
+  }
+  reconcileStatistics().catch(() => {});
+};
+
+/**
+ * Run the reconciliations cluster workers request; called by the cluster primary
+ */
+export const serveReconcileRequests = () => {
+  cluster.on('message', (worker, message) => {
+    if (message?.type === RECONCILE_MESSAGE) {
+      reconcileStatistics().catch(() => {});
+    }
+  });
+};
+
+export const stopStatisticsReconciler = () => {
+  clearInterval(reconcileTimer);
+  reconcileTimer = null;
+};
+
+export const getStatisticsStats = () => ({
+  reconcileIntervalMs: config.statistics.reconcileIntervalMs,
+  ...reconcileStats,
+});
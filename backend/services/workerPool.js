@@ -0,0 +1,160 @@
+import { Worker } from 'worker_threads';
+import { ApiError } from '../middleware/errorHandler.js';
+import logger from '../utils/logger.js';
+
+/**
+ * Worker Pool
+ * A fixed number of worker threads running one script, for CPU-bound work that
+ * would otherwise stall the event loop. Tasks wait in a bounded FIFO queue while
+ * every worker is busy; once the queue is full new tasks are rejected with a 503
+ * so callers shed load instead of piling up. Workers start on first use and a
+ * worker that dies is replaced, failing only the task it was running.
+ *
+ * The worker script answers each { id, task, args } message with
+ * { id, result } or { id, error }.
+ */
+export class WorkerPool {
+  /**
+   * @param {URL} script - Worker module
+   * @param {Object} options
+   * @param {string} options.name - Used in logs and errors
+   * @param {number} options.size - Worker threads
+   * @param {number} options.maxQueue - Tasks allowed to wait for a worker
+   */
+  constructor(script, { name, size, maxQueue }) {
+    this.script = script;
+    this.name = name;
+    this.size = size;
+    this.maxQueue = maxQueue;
+    this.workers = [];
+    this.idle = [];
+    this.queue = [];
+    this.running = new Map();
+    this.nextId = 1;
+    this.closed = false;
+    this.stats = {
+      completed: 0,
+      failed: 0,
+      rejected: 0,
+      workerExits: 0,
+      maxQueueDepth: 0,
+      totalWaitMs: 0,
+      maxWaitMs: 0,
+      totalRunMs: 0,
+    };
+  }
+
+  /**
+   * Run a task on the next free worker
+   * @param {string} task - Operation name understood by the worker script
+   * @param {Array} args - Structured-clonable arguments
+   * @returns {Promise<*>} - The worker's result
+   */
+  run(task, args) {
+    if (this.workers.length === 0) {
+      this.start();
+    }
+    if (this.idle.length === 0 && this.queue.length >= this.maxQueue) {
+      this.stats.rejected += 1;
+      return Promise.reject(new ApiError(503, `Server is busy (${this.name} queue full), please retry shortly`));
+    }
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, task, args, resolve, reject, queuedAt: Date.now() });
+      this.stats.maxQueueDepth = Math.max(this.stats.maxQueueDepth, this.queue.length);
+      this.dispatch();
+    });
+  }
+
+  start() {
+    for (let index = 0; index < this.size; index += 1) {
+      this.spawn();
+    }
+  }
+
+  spawn() {
+    const worker = new Worker(this.script);
+    // Idle workers must not keep a finished process alive
+    worker.unref();
+    worker.on('message', (message) => this.finish(worker, message));
+    worker.on('error', (error) => {
+      logger.error(`${this.name} worker failed: ${error.message}`);
+    });
+    worker.on('exit', (code) => this.replace(worker, code));
+    this.workers.push(worker);
+    this.idle.push(worker);
+  }
+
+  dispatch() {
+    while (this.idle.length > 0 && this.queue.length > 0) {
+      const worker = this.idle.pop();
+      const job = this.queue.shift();
+      const waitMs = Date.now() - job.queuedAt;
+      this.stats.totalWaitMs += waitMs;
+      this.stats.maxWaitMs = Math.max(this.stats.maxWaitMs, waitMs);
+      job.startedAt = Date.now();
+      this.running.set(worker, job);
+      worker.postMessage({ id: job.id, task: job.task, args: job.args });
+    }
+  }
+
+  finish(worker, message) {
+    const job = this.running.get(worker);
+    if (!job || job.id !== message.id) {
+      return;
+    }
+    this.running.delete(worker);
+    this.stats.totalRunMs += Date.now() - job.startedAt;
+    if (message.error) {
+      this.stats.failed += 1;
+      job.reject(new Error(message.error));
+    } else {
+      this.stats.completed += 1;
+      job.resolve(message.result);
+    }
+    this.idle.push(worker);
+    this.dispatch();
+  }
+
+  replace(worker, code) {
+    this.stats.workerExits += 1;
+    this.workers = this.workers.filter((candidate) => candidate !== worker);
+    this.idle = this.idle.filter((candidate) => candidate !== worker);
+    const job = this.running.get(worker);
+    if (job) {
+      this.running.delete(worker);
+      this.stats.failed += 1;
+      job.reject(new Error(`${this.name} worker exited with code ${code}`));
+    }
+    if (!this.closed) {
+      this.spawn();
+      this.dispatch();
+    }
+  }
+
+  /**
+   * Stop every worker; queued tasks are rejected
+   */
+  async close() {
+    this.closed = true;
+    for (const job of this.queue.splice(0)) {
+      job.reject(new ApiError(503, `${this.name} pool is shutting down`));
+    }
+    await Promise.all(this.workers.map((worker) => worker.terminate()));
+  }
+
+  getStats() {
+    const completed = this.stats.completed + this.stats.failed;
+    return {
+      size: this.size,
+      maxQueue: this.maxQueue,
+      workers: this.workers.length,
+      busy: this.running.size,
+      queueDepth: this.queue.length,
+      ...this.stats,
+      avgWaitMs: completed ? this.stats.totalWaitMs / completed : 0,
+      avgRunMs: completed ? this.stats.totalRunMs / completed : 0,
+    };
+  }
+}
+
+export default WorkerPool;
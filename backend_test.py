@@ -5,10 +5,18 @@ Tests all backend APIs comprehensively including validation and authorization
 """
 
 import requests
+import argparse
+import functools
 import json
 import time
 import sys
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
+
+from perf_baseline import add_baseline_arguments, apply_baseline_options, run_sample
+from perf_metrics import MetricsRecorder
+from smtp_sink import wait_for_otp
 
 # Configuration
 BASE_URL = "http://localhost:8001"
@@ -44,14 +52,106 @@ TEST_COURSE_DATA = {
     "whatYouLearn": ["API testing", "Backend validation"]
 }
 
+# Catalog cache throughput comparison in test_catalog_cache_throughput (--heavy)
+CATALOG_BENCH_REQUESTS = 200
+CATALOG_BENCH_WORKERS = 8
+# Share of each pass that must hit (cached) or miss (uncached) the catalog cache
+CATALOG_BENCH_MIN_SHARE = 0.9
+
+# Large nested course for the create and NDJSON import benchmarks
+LARGE_COURSE_MODULES = 40
+IMPORT_COURSES = 10
+
+def large_course_payload(modules: int, lessons: int = 5, questions: int = 5, title: str = "Large Payload Course") -> Dict[str, Any]:
+    """TEST_COURSE_DATA with `modules` modules, each lesson carrying a quiz"""
+    return {
+        **TEST_COURSE_DATA,
+        "title": title,
+        "isPublished": False,
+        "modules": [
+            {
+                "title": f"Module {module + 1}",
+                "description": "Benchmark module",
+                "lessons": [
+                    {
+                        "title": f"Lesson {module + 1}.{lesson + 1}",
+                        "type": "video",
+                        "content": "https://example.com/video.mp4",
+                        "duration": 10,
+                        "quiz": {
+                            "title": f"Quiz {module + 1}.{lesson + 1}",
+                            "questions": [
+                                {
+                                    "questionText": f"Question {question + 1}?",
+                                    "options": ["A", "B", "C", "D"],
+                                    "correctOptionIndex": question % 4,
+                                }
+                                for question in range(questions)
+                            ],
+                        },
+                    }
+                    for lesson in range(lessons)
+                ],
+            }
+            for module in range(modules)
+        ],
+    }
+
 # Existing test data from review request
 EXISTING_COURSE_ID = "80f49e63-b381-426c-8196-bbc09cfad7c8"
 EXISTING_MODULE_ID = "d12641ba-e8c5-4adb-940c-150e938a8e99"
 EXISTING_QUIZ_ID = "3a721760-a873-4c55-9c2e-c0dd41708a33"
 
+# Concurrent quiz submissions; compare --save-baseline runs with QUIZ_CACHE_SIZE=0 to measure the cache
+QUIZ_STRESS_USERS = 20
+QUIZ_STRESS_ROUNDS = 5
+
+# Requests per endpoint when comparing full responses with If-None-Match revalidations
+CONDITIONAL_GET_ROUNDS = 20
+
+# Users enrolling at once while the materialized enrollment statistics are checked
+STATS_USERS = 10
+
+# Admin list endpoints paged with a (created_at, id) cursor, and how much their first page may grow with the data
+ADMIN_LIST_ENDPOINTS = ["/enrollments", "/payments", "/admin/users", "/courses/admin"]
+PAGINATION_PAGE_SIZE = 20
+PAGINATION_GROWTH_USERS = 25
+PAGINATION_TOLERANCE = 1.5
+# Latency growth below this many ms is noise, not a sign of the page scanning the table
+PAGINATION_MIN_GROWTH_MS = 20.0
+
+# forgot-password only queues its email, so it must answer within this budget however slow SMTP is;
+# check by pointing the server at smtp_sink.py --delay 5
+FORGOT_PASSWORD_BUDGET_MS = 500.0
+# How long a queued OTP email may take to reach the --smtp-outbox
+OTP_DELIVERY_TIMEOUT = 30.0
+
+def step(requires=(), provides=(), consumes=(), after=(), heavy=False):
+    """Declare the tester state a test reads and writes for the parallel scheduler.
+
+    requires: attributes (e.g. "admin_token") the test needs set by earlier tests
+    provides: attributes the test sets for later tests
+    consumes: attributes whose backing data the test destroys; it runs only after
+              every test that depends, directly or transitively, on their producer
+    after: test method names that must finish first for side-effect reasons
+    heavy: the test signs up dozens of throwaway accounts or compares timings, so it
+           runs only with --heavy
+    """
+    def decorate(method):
+        method.step = {
+            "requires": tuple(requires),
+            "provides": tuple(provides),
+            "consumes": tuple(consumes),
+            "after": tuple(after),
+            "heavy": heavy,
+        }
+        return method
+    return decorate
+
 class APITester:
     def __init__(self):
-        self.session = requests.Session()
+        self._local = threading.local()
+        self._lock = threading.Lock()
         self.admin_token = None
         self.user_token = None
         self.test_course_id = None
@@ -64,32 +164,62 @@ class APITester:
         self.results = {
             "passed": 0,
             "failed": 0,
-            "errors": []
+            "errors": [],
+            "skipped": []
         }
+        self.metrics = MetricsRecorder()
+        self.endpoint_metrics = MetricsRecorder()
+        # smtp_sink.py outbox to read OTP emails from when the server does not return the OTP
+        self.smtp_outbox: Optional[str] = None
+        # Also run the @step(heavy=True) tests
+        self.heavy = False
+
+    @property
+    def session(self) -> requests.Session:
+        """Per-thread session so parallel phases never share a connection pool"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
 
     def log(self, message: str, level: str = "INFO"):
         """Log test messages"""
         print(f"[{level}] {message}")
 
+    def tally(self, passed: bool, error: Optional[str] = None):
+        """Thread-safe pass/fail bookkeeping"""
+        with self._lock:
+            self.results["passed" if passed else "failed"] += 1
+            if error:
+                self.results["errors"].append(error)
+
+    def skip(self, reason: str):
+        """Record a check that could not run against this server, listed in the summary"""
+        self.log(f"⏭️ Skipped: {reason}")
+        with self._lock:
+            self.results["skipped"].append(reason)
+
     def assert_response(self, response: requests.Response, expected_status: int, test_name: str) -> bool:
-        """Assert response status and log results"""
+        """Assert response status, record latency and body size, and log results"""
         try:
+            with self._lock:
+                self.metrics.record_response(test_name, response)
+                self.endpoint_metrics.record_endpoint(response)
             if response.status_code == expected_status:
                 self.log(f"✅ {test_name} - Status: {response.status_code}")
-                self.results["passed"] += 1
+                self.tally(True)
                 return True
             else:
                 self.log(f"❌ {test_name} - Expected: {expected_status}, Got: {response.status_code}", "ERROR")
                 self.log(f"Response: {response.text[:200]}", "ERROR")
-                self.results["failed"] += 1
-                self.results["errors"].append(f"{test_name}: Expected {expected_status}, got {response.status_code}")
+                self.tally(False, f"{test_name}: Expected {expected_status}, got {response.status_code}")
                 return False
         except Exception as e:
             self.log(f"❌ {test_name} - Exception: {str(e)}", "ERROR")
-            self.results["failed"] += 1
-            self.results["errors"].append(f"{test_name}: Exception - {str(e)}")
+            self.tally(False, f"{test_name}: Exception - {str(e)}")
             return False
 
+    @step()
     def test_health_check(self):
         """Test basic health check"""
         self.log("Testing health check...")
@@ -101,8 +231,9 @@ class APITester:
                 self.log(f"Server status: {data.get('status', 'unknown')}")
         except Exception as e:
             self.log(f"❌ Health check failed: {str(e)}", "ERROR")
-            self.results["failed"] += 1
+            self.tally(False)
 
+    @step()
     def test_auth_signup_validation(self):
         """Test signup validation"""
         self.log("Testing signup validation...")
@@ -131,6 +262,7 @@ class APITester:
         })
         self.assert_response(response, 400, "Signup - Missing Password")
 
+    @step()
     def test_auth_signup_success(self):
         """Test successful signup"""
         self.log("Testing successful signup...")
@@ -152,6 +284,7 @@ class APITester:
             else:
                 self.log("❌ Signup missing token or user data", "ERROR")
 
+    @step()
     def test_auth_login_validation(self):
         """Test login validation"""
         self.log("Testing login validation...")
@@ -169,6 +302,7 @@ class APITester:
         })
         self.assert_response(response, 400, "Login - Missing Password")
 
+    @step(provides=("admin_token", "user_token"))
     def test_auth_login_success(self):
         """Test successful login and store tokens"""
         self.log("Testing successful login...")
@@ -193,12 +327,14 @@ class APITester:
             else:
                 self.log("❌ User token not found in response", "ERROR")
 
+    @step()
     def test_auth_me_without_token(self):
         """Test /me endpoint without token"""
         self.log("Testing /me without token...")
         response = self.session.get(f"{API_BASE}/auth/me")
         self.assert_response(response, 401, "Get Me - No Token")
 
+    @step(requires=("user_token",))
     def test_auth_me_with_token(self):
         """Test /me endpoint with token"""
         self.log("Testing /me with token...")
@@ -215,6 +351,7 @@ class APITester:
             else:
                 self.log("❌ User data incomplete", "ERROR")
 
+    @step(requires=("user_token",))
     def test_auth_profile_update(self):
         """Test profile update"""
         self.log("Testing profile update...")
@@ -232,19 +369,38 @@ class APITester:
                                   })
         self.assert_response(response, 200, "Profile Update")
 
+    @step()
     def test_auth_forgot_password(self):
         """Test forgot password flow"""
         self.log("Testing forgot password...")
         
         # Test with valid email
+        requested_at = time.time()
         response = self.session.post(f"{API_BASE}/auth/forgot-password", json={
             "email": TEST_USER_CREDENTIALS["email"]
         })
         if self.assert_response(response, 200, "Forgot Password - Valid Email"):
+            elapsed_ms = response.elapsed.total_seconds() * 1000
+            within_budget = elapsed_ms <= FORGOT_PASSWORD_BUDGET_MS
+            self.log(f"{'✅' if within_budget else '❌'} Forgot Password answered in {elapsed_ms:.0f}ms "
+                     f"(budget {FORGOT_PASSWORD_BUDGET_MS:.0f}ms)", "INFO" if within_budget else "ERROR")
+            self.tally(within_budget, None if within_budget else
+                       f"Forgot Password: {elapsed_ms:.0f}ms exceeds the {FORGOT_PASSWORD_BUDGET_MS:.0f}ms budget")
+
             data = response.json()
             if "otp" in data:  # Development mode shows OTP
                 self.log(f"✅ OTP received: {data['otp']}")
                 return data["otp"]
+            if self.smtp_outbox:
+                otp = wait_for_otp(self.smtp_outbox, TEST_USER_CREDENTIALS["email"], requested_at,
+                                   OTP_DELIVERY_TIMEOUT)
+                self.tally(otp is not None, None if otp else
+                           f"Forgot Password: no OTP email reached {self.smtp_outbox} "
+                           f"within {OTP_DELIVERY_TIMEOUT:.0f}s")
+                if otp:
+                    self.log(f"✅ OTP email delivered {time.time() - requested_at:.1f}s after the request: {otp}")
+                    return otp
+                self.log(f"❌ No OTP email reached {self.smtp_outbox}", "ERROR")
         
         # Test with invalid email format
         response = self.session.post(f"{API_BASE}/auth/forgot-password", json={
@@ -254,6 +410,7 @@ class APITester:
         
         return None
 
+    @step(after=("test_auth_forgot_password",))
     def test_auth_verify_otp(self):
         """Test OTP verification"""
         self.log("Testing OTP verification...")
@@ -284,6 +441,7 @@ class APITester:
         
         return None
 
+    @step(requires=("user_token",), after=("test_auth_verify_otp",))
     def test_auth_reset_password(self):
         """Test password reset"""
         self.log("Testing password reset...")
@@ -304,6 +462,7 @@ class APITester:
             TEST_USER_CREDENTIALS["password"] = "NewTestPassword123"
             self.log("✅ Password reset successful")
 
+    @step()
     def test_auth_google_validation(self):
         """Test Google OAuth validation"""
         self.log("Testing Google OAuth validation...")
@@ -319,6 +478,7 @@ class APITester:
         # This should return 401 for invalid credential
         self.assert_response(response, 401, "Google Auth - Invalid Credential")
 
+    @step()
     def test_courses_list(self):
         """Test courses listing"""
         self.log("Testing courses listing...")
@@ -331,6 +491,74 @@ class APITester:
         response = self.session.get(f"{API_BASE}/courses?featured=true")
         self.assert_response(response, 200, "Courses List - Featured Filter")
 
+    @step(heavy=True)
+    def test_catalog_cache_throughput(self):
+        """Courses list req/s when served from the catalog cache versus a fresh query each time"""
+        self.log(f"\n🗄️ Comparing cached and uncached courses list ({CATALOG_BENCH_REQUESTS} requests each)...")
+        health = self.session.get(f"{API_BASE}/health").json()
+        if not (health.get("catalogCache") or {}).get("enabled"):
+            self.skip("Catalog cache throughput: the server's catalog cache is disabled (CATALOG_CACHE_TTL_MS=0)")
+            return
+        if (health.get("cluster") or {}).get("workers", 1) > 1:
+            self.skip("Catalog cache throughput: several workers, /api/health reports one worker's cache counters")
+            return
+
+        # A distinct, larger-than-catalog limit per request gives the same courses under a new cache key
+        catalog_size = len(self.session.get(f"{API_BASE}/courses").json())
+        uncached_urls = [f"{API_BASE}/courses?limit={catalog_size + 1000 + index}"
+                         for index in range(CATALOG_BENCH_REQUESTS)]
+        cached_urls = [f"{API_BASE}/courses"] * CATALOG_BENCH_REQUESTS
+
+        def throughput(urls, name: str) -> float:
+            def fetch(url: str) -> bool:
+                response = self.session.get(url)
+                with self._lock:
+                    self.metrics.record_response(name, response)
+                return response.status_code == 200
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=CATALOG_BENCH_WORKERS) as pool:
+                ok = all(pool.map(fetch, urls))
+            return len(urls) / (time.perf_counter() - started) if ok else 0.0
+
+        def cache_counters() -> Dict[str, int]:
+            return self.session.get(f"{API_BASE}/health").json().get("catalogCache") or {}
+
+        def delta(after: Dict[str, int], before: Dict[str, int], name: str) -> int:
+            return after.get(name, 0) - before.get(name, 0)
+
+        start = cache_counters()
+        uncached = throughput(uncached_urls, "Courses List - Uncached")
+        middle = cache_counters()
+        cached = throughput(cached_urls, "Courses List - Cached")
+        end = cache_counters()
+
+        if not uncached or not cached:
+            self.log("❌ Catalog cache comparison requests failed", "ERROR")
+            self.tally(False, "Courses List - cache comparison: request failed")
+            return
+        uncached_misses = delta(middle, start, "misses")
+        cached_hits = delta(end, middle, "hits")
+        self.log(f"📈 Courses list: {cached:.1f} req/s cached vs {uncached:.1f} req/s uncached "
+                 f"({cached / uncached:.1f}x)")
+
+        # Other tests may touch the catalog meanwhile, so allow a few requests either way
+        expected = CATALOG_BENCH_REQUESTS * CATALOG_BENCH_MIN_SHARE
+        for passed, summary in (
+            (uncached_misses >= expected,
+             f"uncached pass missed the catalog cache {uncached_misses}/{CATALOG_BENCH_REQUESTS} times"),
+            (cached_hits >= expected,
+             f"cached pass hit the catalog cache {cached_hits}/{CATALOG_BENCH_REQUESTS} times"),
+            (cached > uncached, f"cached {cached:.1f} req/s vs uncached {uncached:.1f} req/s"),
+        ):
+            if passed:
+                self.log(f"✅ Catalog cache: {summary}")
+                self.tally(True)
+            else:
+                self.log(f"❌ Catalog cache: {summary}", "ERROR")
+                self.tally(False, f"Catalog cache throughput: {summary}")
+
+    @step(requires=("admin_token", "user_token"), provides=("test_course_id",))
     def test_courses_admin_only(self):
         """Test admin-only course operations"""
         self.log("Testing admin-only course operations...")
@@ -363,6 +591,51 @@ class APITester:
                                        json=TEST_COURSE_DATA)
             self.assert_response(response, 403, "Create Course - User Token")
 
+        # Bulk import is admin only; the import benchmark itself runs with --heavy
+        if self.user_token:
+            response = self.session.post(f"{API_BASE}/courses/import",
+                                         headers={**user_headers, "Content-Type": "application/x-ndjson"},
+                                         data=json.dumps(TEST_COURSE_DATA))
+            self.assert_response(response, 403, "Import Courses - User Token")
+
+    @step(requires=("admin_token",), heavy=True)
+    def test_courses_large_import(self):
+        """Create a whole course tree in one request, then many courses via NDJSON import"""
+        self.log(f"\n📦 Benchmarking a {LARGE_COURSE_MODULES}-module course create and a "
+                 f"{IMPORT_COURSES}-course NDJSON import...")
+
+        if not self.admin_token:
+            self.log("❌ No admin token available", "ERROR")
+            return
+
+        admin_headers = {"Authorization": f"Bearer {self.admin_token}"}
+        large_course = large_course_payload(LARGE_COURSE_MODULES)
+        created_ids = []
+        try:
+            started = time.perf_counter()
+            response = self.session.post(f"{API_BASE}/courses", headers=admin_headers, json=large_course)
+            if self.assert_response(response, 201, f"Create Course - Large Payload ({LARGE_COURSE_MODULES} modules)"):
+                created_ids.append(response.json()["course"]["id"])
+                self.log(f"📦 Created {LARGE_COURSE_MODULES} modules x 5 lessons x 5 questions "
+                         f"({len(response.request.body) / 1024:.0f} KB) in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+            ndjson = "\n".join(
+                json.dumps(large_course_payload(LARGE_COURSE_MODULES // 4, title=f"Imported Course {index + 1}"))
+                for index in range(IMPORT_COURSES)
+            )
+            ndjson_headers = {**admin_headers, "Content-Type": "application/x-ndjson"}
+            started = time.perf_counter()
+            response = self.session.post(f"{API_BASE}/courses/import", headers=ndjson_headers, data=ndjson)
+            if self.assert_response(response, 201, f"Import Courses - NDJSON ({IMPORT_COURSES} courses)"):
+                data = response.json()
+                created_ids.extend(course["id"] for course in data.get("courses", []))
+                self.log(f"📦 Imported {data.get('imported', 0)} courses ({len(ndjson) / 1024:.0f} KB) "
+                         f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        finally:
+            for course_id in created_ids:
+                self.session.delete(f"{API_BASE}/courses/{course_id}", headers=admin_headers)
+
+    @step(requires=("test_course_id",))
     def test_courses_get_specific(self):
         """Test getting specific course"""
         self.log("Testing specific course retrieval...")
@@ -378,6 +651,7 @@ class APITester:
         response = self.session.get(f"{API_BASE}/courses/non-existent-id")
         self.assert_response(response, 404, "Get Non-existent Course")
 
+    @step(requires=("admin_token", "user_token", "test_course_id"))
     def test_courses_update_delete(self):
         """Test course update and delete (admin only)"""
         self.log("Testing course update and delete...")
@@ -403,6 +677,66 @@ class APITester:
                                       json=update_data)
             self.assert_response(response, 403, "Update Course - User Token")
 
+    @step(requires=("admin_token", "test_course_id"), after=("test_courses_update_delete",))
+    def test_conditional_get(self):
+        """Test ETag revalidation on read-heavy endpoints and report what a 304 saves"""
+        self.log("Testing conditional GET support...")
+
+        urls = {
+            "Courses List": f"{API_BASE}/courses",
+            "Specific Course": f"{API_BASE}/courses/{self.test_course_id}",
+            "Course Modules": f"{API_BASE}/modules/{self.test_course_id}",
+            "Course Quizzes": f"{API_BASE}/quizzes/course/{self.test_course_id}",
+            "Public Realtime": f"{API_BASE}/public/realtime",
+        }
+        for name, url in urls.items():
+            # Parallel runs may write in between; a changed tag means a new version, so refetch
+            for _ in range(3):
+                response = self.session.get(url)
+                etag = response.headers.get("ETag")
+                if response.status_code != 200 or not etag:
+                    break
+                revalidated = self.session.get(url, headers={"If-None-Match": etag})
+                if revalidated.headers.get("ETag") == etag:
+                    break
+            if response.status_code != 200 or not etag or etag.startswith("W/"):
+                self.log(f"❌ Conditional GET - {name}: expected a strong ETag, got {etag!r} "
+                         f"(status {response.status_code})", "ERROR")
+                self.tally(False, f"Conditional GET - {name}: no strong ETag")
+                continue
+            if not self.assert_response(revalidated, 304, f"Conditional GET - {name} (If-None-Match)"):
+                continue
+
+            full_ms, full_bytes, revalidate_ms = [], 0, []
+            for _ in range(CONDITIONAL_GET_ROUNDS):
+                started = time.perf_counter()
+                response = self.session.get(url)
+                full_ms.append((time.perf_counter() - started) * 1000)
+                full_bytes = len(response.content)
+                started = time.perf_counter()
+                self.session.get(url, headers={"If-None-Match": response.headers.get("ETag", etag)})
+                revalidate_ms.append((time.perf_counter() - started) * 1000)
+            full_avg = sum(full_ms) / len(full_ms)
+            revalidate_avg = sum(revalidate_ms) / len(revalidate_ms)
+            self.log(f"📉 {name}: 304 saves {full_bytes} bytes and {full_avg - revalidate_avg:.1f} ms per request "
+                     f"({revalidate_avg:.1f} ms vs {full_avg:.1f} ms)")
+
+        # A catalog write must change the tag, so the old copy is no longer revalidated
+        admin_headers = {"Authorization": f"Bearer {self.admin_token}"}
+        url = urls["Specific Course"]
+        response = self.session.get(url)
+        etag = response.headers.get("ETag")
+        if response.status_code != 200 or not etag:
+            self.tally(False, "Conditional GET - After Write: course not readable")
+            return
+        self.session.put(url, headers=admin_headers, json={"title": response.json().get("title")})
+        response = self.session.get(url, headers={"If-None-Match": etag})
+        if self.assert_response(response, 200, "Conditional GET - Stale ETag After Write"):
+            if response.headers.get("ETag") == etag:
+                self.log("❌ Conditional GET - ETag unchanged after a course update", "ERROR")
+                self.tally(False, "Conditional GET - After Write: ETag unchanged")
+
+    @step(requires=("user_token", "test_course_id"), provides=("test_enrollment_id",))
     def test_enrollments_create(self):
         """Test enrollment creation"""
         self.log("Testing enrollment creation...")
@@ -432,6 +766,7 @@ class APITester:
                 self.test_enrollment_id = data["id"]
                 self.log(f"✅ Enrollment created with ID: {self.test_enrollment_id}")
 
+    @step(requires=("user_token",))
     def test_enrollments_my_enrollments(self):
         """Test getting user's enrollments"""
         self.log("Testing my enrollments...")
@@ -451,6 +786,7 @@ class APITester:
         response = self.session.get(f"{API_BASE}/enrollments/my-enrollments")
         self.assert_response(response, 401, "My Enrollments - No Auth")
 
+    @step(requires=("user_token", "test_course_id", "test_enrollment_id"))
     def test_enrollments_get_specific(self):
         """Test getting specific enrollment"""
         self.log("Testing specific enrollment retrieval...")
@@ -465,6 +801,7 @@ class APITester:
                                   headers=user_headers)
         self.assert_response(response, 200, "Get Enrollment by Course ID")
 
+    @step(requires=("user_token", "test_enrollment_id"))
     def test_enrollments_update(self):
         """Test enrollment update"""
         self.log("Testing enrollment update...")
@@ -489,6 +826,173 @@ class APITester:
                                   json=update_data)
         self.assert_response(response, 200, "Update Enrollment")
 
+    @step(requires=("test_course_id",), heavy=True)
+    def test_enrollment_statistics(self):
+        """Enroll several new users at once and check the counters maintained on write agree with them"""
+        self.log(f"\n🔢 Checking enrollment statistics under {STATS_USERS} concurrent enrollments...")
+
+        if not self.test_course_id:
+            self.log("❌ Missing course ID for enrollment statistics test", "ERROR")
+            return
+
+        def platform_enrollments() -> Optional[int]:
+            response = self.session.get(f"{API_BASE}/public/realtime")
+            if response.status_code != 200:
+                return None
+            return response.json().get("stats", {}).get("totalEnrollments")
+
+        # Every user enrolls free in the existing course; odd users also pay offline for the test course
+        def enroll(index: int) -> Optional[Tuple[Dict[str, str], Dict[str, int]]]:
+            response = self.session.post(f"{API_BASE}/auth/signup", json={
+                "email": f"stats_{int(time.time())}_{index}@example.com",
+                "password": "TestPassword123",
+                "firstName": "Stats",
+                "lastName": f"User {index}",
+            })
+            if response.status_code != 201:
+                return None
+            headers = {"Authorization": f"Bearer {response.json()['token']}"}
+            plan = [(EXISTING_COURSE_ID, {"method": "free", "amount": 0})]
+            if index % 2:
+                plan.append((self.test_course_id, {"method": "offline", "amount": 499}))
+            expected = {"totalEnrollments": 0, "freeEnrollments": 0, "offlineEnrollments": 0}
+            for course_id, payment in plan:
+                response = self.session.post(f"{API_BASE}/enrollments", headers=headers,
+                                             json={"courseId": course_id, "paymentData": payment})
+                if response.status_code == 201:
+                    expected["totalEnrollments"] += 1
+                    expected[f"{payment['method']}Enrollments"] += 1
+            return headers, expected
+
+        before = platform_enrollments()
+        with ThreadPoolExecutor(max_workers=STATS_USERS) as pool:
+            enrolled = [result for result in pool.map(enroll, range(STATS_USERS)) if result]
+        after = platform_enrollments()
+
+        mismatches = []
+        for headers, expected in enrolled:
+            response = self.session.get(f"{API_BASE}/enrollments/user/me/stats", headers=headers)
+            if not self.assert_response(response, 200, "Enrollment Statistics - User Stats"):
+                return
+            counted = {name: response.json().get(name) for name in expected}
+            if counted != expected:
+                mismatches.append(f"expected {expected}, got {counted}")
+
+        created = sum(expected["totalEnrollments"] for _, expected in enrolled)
+        if not enrolled or mismatches:
+            self.log(f"❌ {len(mismatches)}/{len(enrolled)} users have wrong enrollment counts: "
+                     f"{mismatches[:3]}", "ERROR")
+            self.tally(False, f"Enrollment statistics: {len(mismatches)}/{len(enrolled)} users miscounted")
+            return
+        self.log(f"✅ {len(enrolled)} users' enrollment counts match the {created} enrollments they made")
+        self.tally(True)
+
+        # Other tests may enroll meanwhile, so the platform total must grow by at least ours
+        if before is None or after is None or after - before < created:
+            self.log(f"❌ Platform enrollments went from {before} to {after} after {created} enrollments", "ERROR")
+            self.tally(False, f"Enrollment statistics: platform total {before} -> {after}, expected +{created}")
+        else:
+            self.log(f"✅ Platform enrollments went from {before} to {after} after {created} enrollments")
+            self.tally(True)
+
+    @step(requires=("admin_token",), heavy=True)
+    def test_admin_list_pagination(self):
+        """Check admin list pages stay the same size and speed as the tables grow, and that cursors and ?fields= work"""
+        self.log(f"\n📄 Checking admin list pagination ({PAGINATION_PAGE_SIZE} rows per page, "
+                 f"{PAGINATION_GROWTH_USERS} users added)...")
+
+        if not self.admin_token:
+            self.log("❌ Missing admin token for pagination test", "ERROR")
+            return
+
+        admin_headers = {"Authorization": f"Bearer {self.admin_token}"}
+
+        def first_page(endpoint: str) -> Optional[Dict[str, Any]]:
+            samples = []
+            for _ in range(3):
+                response = self.session.get(f"{API_BASE}{endpoint}", headers=admin_headers,
+                                            params={"limit": PAGINATION_PAGE_SIZE})
+                if not self.assert_response(response, 200, f"Pagination - {endpoint} First Page"):
+                    return None
+                samples.append((response.elapsed.total_seconds() * 1000, response))
+            ms, response = sorted(samples, key=lambda sample: sample[0])[1]
+            return {"rows": len(response.json()), "bytes": len(response.content), "ms": ms}
+
+        def sign_up_and_enroll(index: int) -> bool:
+            response = self.session.post(f"{API_BASE}/auth/signup", json={
+                "email": f"paging_{int(time.time())}_{index}@example.com",
+                "password": "TestPassword123",
+                "firstName": "Paging",
+                "lastName": f"User {index}",
+            })
+            if response.status_code != 201:
+                return False
+            response = self.session.post(f"{API_BASE}/enrollments",
+                                         headers={"Authorization": f"Bearer {response.json()['token']}"},
+                                         json={"courseId": EXISTING_COURSE_ID,
+                                               "paymentData": {"method": "free", "amount": 0}})
+            return response.status_code == 201
+
+        before = {endpoint: first_page(endpoint) for endpoint in ADMIN_LIST_ENDPOINTS}
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            grown = sum(pool.map(sign_up_and_enroll, range(PAGINATION_GROWTH_USERS)))
+        after = {endpoint: first_page(endpoint) for endpoint in ADMIN_LIST_ENDPOINTS}
+
+        for endpoint in ADMIN_LIST_ENDPOINTS:
+            if not before[endpoint] or not after[endpoint]:
+                continue
+            old, new = before[endpoint], after[endpoint]
+            problems = []
+            if new["rows"] > PAGINATION_PAGE_SIZE:
+                problems.append(f"{new['rows']} rows on a {PAGINATION_PAGE_SIZE}-row page")
+            # A page that was already full has no reason to get bigger or slower
+            if old["rows"] == PAGINATION_PAGE_SIZE:
+                if new["bytes"] > old["bytes"] * PAGINATION_TOLERANCE:
+                    problems.append(f"size grew {old['bytes']} -> {new['bytes']} bytes")
+                if new["ms"] > max(old["ms"] * PAGINATION_TOLERANCE, old["ms"] + PAGINATION_MIN_GROWTH_MS):
+                    problems.append(f"latency grew {old['ms']:.1f} -> {new['ms']:.1f} ms")
+            summary = (f"{endpoint}: {old['bytes'] / 1024:.1f} -> {new['bytes'] / 1024:.1f} KB, "
+                       f"{old['ms']:.1f} -> {new['ms']:.1f} ms after {grown} signups")
+            if problems:
+                self.log(f"❌ {summary} ({'; '.join(problems)})", "ERROR")
+                self.tally(False, f"Pagination - {endpoint}: {'; '.join(problems)}")
+            else:
+                self.log(f"✅ {summary}")
+                self.tally(True)
+
+        # Following the cursor visits each user once
+        seen, cursor, pages = [], None, 0
+        while pages < 3:
+            params = {"limit": PAGINATION_PAGE_SIZE, "fields": "email"}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.session.get(f"{API_BASE}/admin/users", headers=admin_headers, params=params)
+            if not self.assert_response(response, 200, "Pagination - Follow Cursor"):
+                return
+            rows = response.json()
+            if any(set(row) - {"id", "createdAt", "email"} for row in rows):
+                self.log(f"❌ ?fields=email returned extra columns: {sorted(set(rows[0]))}", "ERROR")
+                self.tally(False, "Pagination - Fields: projection returned extra columns")
+                return
+            seen.extend(row["id"] for row in rows)
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        if len(seen) == len(set(seen)):
+            self.log(f"✅ {pages} cursor page(s) returned {len(seen)} distinct users with only the requested fields")
+            self.tally(True)
+        else:
+            self.log(f"❌ Cursor pages repeated {len(seen) - len(set(seen))} user(s)", "ERROR")
+            self.tally(False, "Pagination - Follow Cursor: rows repeated across pages")
+
+        response = self.session.get(f"{API_BASE}/admin/users", headers=admin_headers,
+                                    params={"fields": "password"})
+        self.assert_response(response, 400, "Pagination - Hidden Field Rejected")
+        response = self.session.get(f"{API_BASE}/payments", headers=admin_headers, params={"cursor": "not-a-cursor"})
+        self.assert_response(response, 400, "Pagination - Invalid Cursor Rejected")
+
+    @step(requires=("user_token", "test_course_id", "test_enrollment_id"))
     def test_progress_apis(self):
         """Test progress APIs"""
         self.log("Testing progress APIs...")
@@ -521,6 +1025,7 @@ class APITester:
         response = self.session.get(f"{API_BASE}/progress/{self.test_course_id}")
         self.assert_response(response, 401, "Get Progress - No Auth")
 
+    @step(requires=("admin_token",), consumes=("test_course_id",))
     def test_cleanup(self):
         """Clean up test data"""
         self.log("Cleaning up test data...")
@@ -540,6 +1045,7 @@ class APITester:
     # NEW LMS API TESTS
     # =====================================================
 
+    @step(requires=("admin_token", "user_token"), provides=("test_module_id", "test_lesson_id"))
     def test_lms_modules_apis(self):
         """Test Module APIs comprehensively"""
         self.log("\n🏗️ Testing Module APIs...")
@@ -662,6 +1168,8 @@ class APITester:
                                       json=reorder_data)
             self.assert_response(response, 200, "Reorder Modules - Admin")
 
+    @step(requires=("admin_token", "user_token", "test_module_id"),
+          provides=("test_quiz_id", "test_question_id"))
     def test_lms_quizzes_apis(self):
         """Test Quiz APIs comprehensively"""
         self.log("\n📝 Testing Quiz APIs...")
@@ -802,6 +1310,7 @@ class APITester:
                                       json=question_update)
             self.assert_response(response, 200, "Update Question - Admin")
 
+    @step(requires=("user_token", "test_quiz_id"), provides=("test_attempt_id",))
     def test_lms_quiz_taking_workflow(self):
         """Test the complete quiz taking workflow"""
         self.log("\n🎯 Testing Quiz Taking Workflow...")
@@ -880,19 +1389,98 @@ class APITester:
         if response.status_code in [201, 400]:
             if response.status_code == 201:
                 self.log("✅ Second quiz attempt started successfully")
-                self.results["passed"] += 1
+                self.tally(True)
             else:
                 data = response.json()
                 if "Maximum attempts" in data.get("error", ""):
                     self.log("✅ Max attempts limit working correctly")
-                    self.results["passed"] += 1
+                    self.tally(True)
                 else:
                     self.log(f"❌ Unexpected error on second attempt: {data.get('error')}", "ERROR")
-                    self.results["failed"] += 1
+                    self.tally(False)
         else:
             self.log(f"❌ Unexpected status code for second attempt: {response.status_code}", "ERROR")
-            self.results["failed"] += 1
+            self.tally(False)
+
+    @step(requires=("admin_token", "test_quiz_id"), after=("test_lms_quiz_taking_workflow",), heavy=True)
+    def test_lms_quiz_submit_stress(self):
+        """Start and submit the test quiz concurrently from several users, as at the end of an exam"""
+        self.log(f"\n⏱️ Stress testing quiz submission ({QUIZ_STRESS_USERS} users x {QUIZ_STRESS_ROUNDS} attempts)...")
+
+        if not self.admin_token or not self.test_quiz_id:
+            self.log("❌ Missing admin token or quiz ID for quiz submit stress test", "ERROR")
+            return
+
+        admin_headers = {"Authorization": f"Bearer {self.admin_token}"}
+        quiz_url = f"{API_BASE}/quizzes/{self.test_quiz_id}"
+        response = self.session.get(quiz_url, headers=admin_headers)
+        if not self.assert_response(response, 200, "Quiz Stress - Load Answer Key"):
+            return
+        quiz = response.json()
+        answers = {question["id"]: question["correctAnswer"] for question in quiz.get("questions", [])}
 
+        def sign_up(index: int) -> Optional[Dict[str, str]]:
+            response = self.session.post(f"{API_BASE}/auth/signup", json={
+                "email": f"quizstress_{int(time.time())}_{index}@example.com",
+                "password": "TestPassword123",
+                "firstName": "Quiz",
+                "lastName": f"Stress {index}",
+            })
+            if response.status_code != 201:
+                return None
+            headers = {"Authorization": f"Bearer {response.json()['token']}"}
+            response = self.session.post(f"{API_BASE}/enrollments", headers=headers,
+                                         json={"courseId": quiz["courseId"]})
+            return headers if response.status_code == 201 else None
+
+        def take_quiz(headers: Dict[str, str]) -> int:
+            graded = 0
+            for _ in range(QUIZ_STRESS_ROUNDS):
+                response = self.session.post(f"{quiz_url}/start", headers=headers)
+                if response.status_code not in (200, 201):
+                    break
+                attempt_id = response.json()["attempt"]["id"]
+                start = time.perf_counter()
+                response = self.session.post(f"{quiz_url}/submit", headers=headers, json={
+                    "attemptId": attempt_id,
+                    "answers": answers,
+                    "timeSpentSeconds": 60,
+                })
+                with self._lock:
+                    self.metrics.record("Quiz Stress - Submit", time.perf_counter() - start, len(response.content))
+                    self.endpoint_metrics.record_endpoint(response)
+                if response.status_code == 200 and response.json().get("correctAnswers") == len(answers):
+                    graded += 1
+            return graded
+
+        # Unlimited attempts for the duration of the run
+        self.session.put(quiz_url, headers=admin_headers, json={"maxAttempts": None})
+        try:
+            with ThreadPoolExecutor(max_workers=QUIZ_STRESS_USERS) as pool:
+                users = [headers for headers in pool.map(sign_up, range(QUIZ_STRESS_USERS)) if headers]
+                cache_before = self.session.get(f"{API_BASE}/health").json().get("quizCache") or {}
+                started = time.perf_counter()
+                graded = sum(pool.map(take_quiz, users))
+                elapsed = time.perf_counter() - started
+            cache_after = self.session.get(f"{API_BASE}/health").json().get("quizCache") or {}
+        finally:
+            self.session.put(quiz_url, headers=admin_headers, json={"maxAttempts": quiz.get("maxAttempts")})
+
+        expected = len(users) * QUIZ_STRESS_ROUNDS
+        hits = cache_after.get("hits", 0) - cache_before.get("hits", 0)
+        misses = cache_after.get("misses", 0) - cache_before.get("misses", 0)
+        self.log(f"📈 {graded} submissions graded in {elapsed:.2f}s ({graded / elapsed if elapsed else 0:.1f}/s); "
+                 f"answer key cache {hits} hits, {misses} misses")
+        if users and graded == expected:
+            self.log(f"✅ All {expected} concurrent submissions graded every answer correct")
+            self.tally(True)
+        else:
+            self.log(f"❌ Only {graded}/{expected} concurrent submissions graded correctly "
+                     f"({len(users)}/{QUIZ_STRESS_USERS} users enrolled)", "ERROR")
+            self.tally(False, f"Quiz submit stress: {graded}/{expected} submissions graded correctly")
+
+    @step(requires=("user_token", "test_module_id", "test_lesson_id"),
+          after=("test_lms_quiz_taking_workflow",))
     def test_lms_learning_progress_apis(self):
         """Test Learning Progress APIs"""
         self.log("\n📊 Testing Learning Progress APIs...")
@@ -942,23 +1530,88 @@ class APITester:
             if response.status_code in [200, 400]:
                 if response.status_code == 200:
                     self.log("✅ Module marked as complete successfully")
-                    self.results["passed"] += 1
+                    self.tally(True)
                 else:
                     data = response.json()
                     if "quiz" in data.get("error", "").lower():
                         self.log("✅ Gated learning working - quiz required for completion")
-                        self.results["passed"] += 1
+                        self.tally(True)
                     else:
                         self.log(f"❌ Unexpected error completing module: {data.get('error')}", "ERROR")
-                        self.results["failed"] += 1
+                        self.tally(False)
             else:
                 self.log(f"❌ Unexpected status code for module completion: {response.status_code}", "ERROR")
-                self.results["failed"] += 1
+                self.tally(False)
         
         # Test 5: Test without authentication
         response = self.session.get(f"{API_BASE}/learning-progress/{EXISTING_COURSE_ID}")
         self.assert_response(response, 401, "Get Progress - No Auth")
 
+    @step(requires=("admin_token", "user_token"), after=("test_lms_learning_progress_apis",))
+    def test_lms_learning_progress_query_count(self):
+        """Benchmark course progress and check its query count does not grow with module count"""
+        self.log("\n🔢 Testing Learning Progress query count as modules are added...")
+
+        if not self.admin_token or not self.user_token:
+            self.log("❌ Admin and user tokens required for progress query count test", "ERROR")
+            return
+
+        admin_headers = {"Authorization": f"Bearer {self.admin_token}"}
+        user_headers = {"Authorization": f"Bearer {self.user_token}"}
+        progress_url = f"{API_BASE}/learning-progress/{EXISTING_COURSE_ID}"
+
+        # Warm-up: the first GET flushes heartbeats buffered by earlier tests, whose upsert and
+        # module recalculation would otherwise be counted against the baseline
+        response = self.session.get(progress_url, headers=user_headers)
+        if not self.assert_response(response, 200, "Progress Query Count - Warm-up"):
+            return
+        if "X-DB-Query-Count" not in response.headers:
+            self.skip("Progress query count: server does not expose X-DB-Query-Count (DB_EXPOSE_QUERY_COUNT)")
+            return
+
+        response = self.session.get(progress_url, headers=user_headers)
+        if not self.assert_response(response, 200, "Progress Query Count - Baseline"):
+            return
+        baseline_queries = int(response.headers["X-DB-Query-Count"])
+        baseline_modules = response.json().get("totalModules", 0)
+
+        added_modules = []
+        try:
+            for index in range(3):
+                response = self.session.post(f"{API_BASE}/modules", headers=admin_headers, json={
+                    "courseId": EXISTING_COURSE_ID,
+                    "title": f"Query Count Module {index + 1}",
+                    "isPublished": True,
+                    "requiresPreviousCompletion": False,
+                })
+                if not self.assert_response(response, 201, "Progress Query Count - Add Module"):
+                    return
+                module_id = response.json()["module"]["id"]
+                added_modules.append(module_id)
+                response = self.session.post(f"{API_BASE}/modules/{module_id}/lessons", headers=admin_headers,
+                                             json={"title": "Query Count Lesson", "isPublished": True})
+                self.assert_response(response, 201, "Progress Query Count - Add Lesson")
+
+            for _ in range(5):
+                response = self.session.get(progress_url, headers=user_headers)
+                if not self.assert_response(response, 200, "Progress Query Count - Grown Course"):
+                    return
+
+            queries = int(response.headers.get("X-DB-Query-Count", -1))
+            modules = response.json().get("totalModules", 0)
+            if queries == baseline_queries and modules > baseline_modules:
+                self.log(f"✅ Progress tree used {queries} queries for both {baseline_modules} "
+                         f"and {modules} modules")
+                self.tally(True)
+            else:
+                self.log(f"❌ Progress tree queries grew from {baseline_queries} to {queries} "
+                         f"({baseline_modules} → {modules} modules)", "ERROR")
+                self.tally(False, f"Progress query count grew from {baseline_queries} to {queries}")
+        finally:
+            for module_id in added_modules:
+                self.session.delete(f"{API_BASE}/modules/{module_id}", headers=admin_headers)
+
+    @step(requires=("user_token",))
     def test_lms_admin_vs_user_access(self):
         """Test admin vs non-admin access control"""
         self.log("\n🔐 Testing Admin vs User Access Control...")
@@ -990,6 +1643,8 @@ class APITester:
             endpoint_name = url.split("/")[-1] if method == "DELETE" else f"{method} {url.split('/')[-1]}"
             self.assert_response(response, 403, f"Admin Only - {endpoint_name} (User Token)")
 
+    @step(requires=("admin_token",),
+          consumes=("test_module_id", "test_lesson_id", "test_quiz_id", "test_question_id"))
     def test_lms_cleanup(self):
         """Clean up LMS test data"""
         self.log("\n🧹 Cleaning up LMS test data...")
@@ -1057,9 +1712,14 @@ class APITester:
             # Course API tests
             self.log("\n📚 Testing Course APIs...")
             self.test_courses_list()
+            if self.heavy:
+                self.test_catalog_cache_throughput()
             self.test_courses_admin_only()
+            if self.heavy:
+                self.test_courses_large_import()
             self.test_courses_get_specific()
             self.test_courses_update_delete()
+            self.test_conditional_get()
             
             # Enrollment API tests
             self.log("\n📝 Testing Enrollment APIs...")
@@ -1067,6 +1727,9 @@ class APITester:
             self.test_enrollments_my_enrollments()
             self.test_enrollments_get_specific()
             self.test_enrollments_update()
+            if self.heavy:
+                self.test_enrollment_statistics()
+                self.test_admin_list_pagination()
             
             # Progress API tests
             self.log("\n📊 Testing Progress APIs...")
@@ -1077,7 +1740,10 @@ class APITester:
             self.test_lms_modules_apis()
             self.test_lms_quizzes_apis()
             self.test_lms_quiz_taking_workflow()
+            if self.heavy:
+                self.test_lms_quiz_submit_stress()
             self.test_lms_learning_progress_apis()
+            self.test_lms_learning_progress_query_count()
             self.test_lms_admin_vs_user_access()
             
             # LMS Cleanup
@@ -1088,10 +1754,79 @@ class APITester:
             
         except Exception as e:
             self.log(f"❌ Test suite failed with exception: {str(e)}", "ERROR")
-            self.results["failed"] += 1
+            self.tally(False)
         
         # Print summary
-        self.print_summary()
+        return self.print_summary()
+
+    def _step_methods(self):
+        """Bound @step-decorated test methods in source order, leaving out heavy tests unless enabled"""
+        methods = [getattr(self, name) for name, member in vars(type(self)).items()
+                   if hasattr(member, "step") and (self.heavy or not member.step["heavy"])]
+        return sorted(methods, key=lambda method: method.__func__.__code__.co_firstlineno)
+
+    def step_dependencies(self) -> Dict[str, set]:
+        """Map each test name to the test names that must finish before it starts"""
+        steps = {method.__name__: method.step for method in self._step_methods()}
+        producers: Dict[str, set] = {}
+        for name, meta in steps.items():
+            for key in meta["provides"]:
+                producers.setdefault(key, set()).add(name)
+
+        # An "after" test left out of this run has nothing to wait for
+        dependencies = {name: set(meta["after"]) & set(steps) for name, meta in steps.items()}
+        for name, meta in steps.items():
+            for key in meta["requires"]:
+                dependencies[name] |= producers.get(key, set())
+
+        dependents: Dict[str, set] = {name: set() for name in steps}
+        for name, upstream in dependencies.items():
+            for parent in upstream:
+                dependents.setdefault(parent, set()).add(name)
+
+        def downstream_of(roots: set) -> set:
+            seen, stack = set(), list(roots)
+            while stack:
+                for child in dependents.get(stack.pop(), ()):
+                    if child not in seen:
+                        seen.add(child)
+                        stack.append(child)
+            return seen
+
+        for name, meta in steps.items():
+            for key in meta["consumes"]:
+                roots = producers.get(key, set())
+                dependencies[name] |= (roots | downstream_of(roots)) - {name}
+        return dependencies
+
+    def run_all_tests_parallel(self, workers: int = 8):
+        """Run independent test branches concurrently, honouring declared state dependencies"""
+        self.log(f"Starting JNTU-GV Backend API Test Suite ({workers} workers)...")
+        self.log("=" * 60)
+
+        steps = {method.__name__: method for method in self._step_methods()}
+        pending = self.step_dependencies()
+        finished: set = set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending or running:
+                for name in [name for name, upstream in pending.items() if upstream <= finished]:
+                    del pending[name]
+                    running[pool.submit(steps[name])] = name
+                if not running:
+                    raise ValueError(f"Unsatisfiable test dependencies: {sorted(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finished.add(name)
+                    error = future.exception()
+                    if error:
+                        self.log(f"❌ {name} failed with exception: {str(error)}", "ERROR")
+                        self.tally(False, f"{name}: Exception - {str(error)}")
+
+        return self.print_summary()
 
     def print_summary(self):
         """Print test results summary"""
@@ -1101,6 +1836,11 @@ class APITester:
         self.log(f"✅ Passed: {self.results['passed']}")
         self.log(f"❌ Failed: {self.results['failed']}")
         self.log(f"📊 Total: {self.results['passed'] + self.results['failed']}")
+        if self.results["skipped"]:
+            self.log(f"⏭️ Skipped: {len(self.results['skipped'])}")
+            for reason in self.results["skipped"]:
+                self.log(f"  • {reason}")
+        self.metrics.print_table(self.log)
         
         if self.results["errors"]:
             self.log("\n🚨 FAILED TESTS:")
@@ -1114,7 +1854,137 @@ class APITester:
             self.log(f"\n⚠️ {self.results['failed']} TESTS FAILED")
             return False
 
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend API Test Suite")
+    parser.add_argument("--users", type=int, default=0,
+                        help="run the load mode with N concurrent virtual users instead of the functional suite")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="load mode duration in seconds (default: 60)")
+    parser.add_argument("--rate", action="append", default=[], metavar="OPERATION=RPS",
+                        help="open-loop mode: fire OPERATION (courses, course, enrollments, learning-progress, "
+                             "quiz-submit, login) at a fixed RPS; repeatable")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="open-loop mode: cap on concurrent requests (default: 1000)")
+    parser.add_argument("--miss-tolerance-ms", type=float, default=5.0,
+                        help="open-loop mode: send delay counted as a missed schedule slot (default: 5)")
+    parser.add_argument("--scenario", metavar="PATH",
+                        help="virtual-user mode: run the weighted journeys in a scenario JSON file "
+                             "(see scenarios/exam_week.json)")
+    parser.add_argument("--user-pool", type=int, default=0, metavar="N",
+                        help="load modes: give virtual users N pre-authenticated accounts with cached tokens")
+    parser.add_argument("--pool-file", default=".user-pool.json", metavar="PATH",
+                        help="where pooled accounts and their tokens are cached between runs "
+                             "(default: .user-pool.json)")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="load modes: spread virtual users or open-loop rates over N worker processes")
+    parser.add_argument("--report-interval", type=float, default=5.0,
+                        help="load modes with --processes: seconds between worker histogram reports")
+    parser.add_argument("--parallel", type=int, default=0, metavar="WORKERS",
+                        help="run independent test phases concurrently on WORKERS threads")
+    parser.add_argument("--smtp-outbox", metavar="PATH",
+                        help="read OTP emails from this smtp_sink.py outbox when the server does not return the OTP")
+    parser.add_argument("--heavy", action="store_true",
+                        help="also run the catalog cache throughput, large course import, enrollment statistics, "
+                             "admin pagination and quiz submit stress tests, which send hundreds of requests, create "
+                             "throwaway courses and accounts and compare latencies")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="export per-test latency histograms and byte counts as JSON")
+    add_baseline_arguments(parser)
+    return parser.parse_args(argv)
+
+def prepare_quiz_accounts(accounts: List[Dict[str, Any]], submits: float, log) -> List[Dict[str, Any]]:
+    """Enroll pooled accounts in the load quiz's course and warn if they cannot cover `submits` attempts"""
+    session = requests.Session()
+    enrolled = []
+    for account in accounts:
+        response = session.post(f"{API_BASE}/enrollments", headers={"Authorization": f"Bearer {account['token']}"},
+                                json={"courseId": EXISTING_COURSE_ID})
+        # 400 means the account is already enrolled from an earlier run
+        if response.status_code in (201, 400):
+            enrolled.append(account)
+    if not enrolled:
+        return []
+    quiz = session.get(f"{API_BASE}/quizzes/{EXISTING_QUIZ_ID}",
+                       headers={"Authorization": f"Bearer {enrolled[0]['token']}"}).json()
+    max_attempts = quiz.get("maxAttempts")
+    if max_attempts and len(enrolled) * max_attempts < submits:
+        log(f"⚠️ {len(enrolled)} quiz accounts x {max_attempts} attempts cannot cover {submits:.0f} submits; "
+            f"later submits will fail, raise --user-pool", "ERROR")
+    return enrolled
+
+def run_load_mode(args) -> bool:
+    """Run the virtual-user or open-loop load mode --repeat times and apply baseline options"""
+    from load_driver import VirtualUser, log, parse_rates, run_load, run_multiprocess, run_open_loop
+
+    rates = parse_rates(args.rate)
+    user_factory = VirtualUser
+    if args.scenario:
+        from load_scenarios import ScenarioUser, load_scenario
+        scenario = load_scenario(args.scenario, TEST_USER_CREDENTIALS,
+                                 {"course_id": [EXISTING_COURSE_ID], "quiz_id": [EXISTING_QUIZ_ID]})
+        user_factory = functools.partial(ScenarioUser, scenario)
+
+    credentials, quiz_accounts = TEST_USER_CREDENTIALS, None
+    if args.user_pool > 0:
+        from user_pool import PooledUserFactory, UserPool
+        accounts = UserPool(args.pool_file, API_BASE).checkout(args.user_pool)
+        if not accounts:
+            log("❌ User pool has no usable accounts", "ERROR")
+            return False
+        credentials = accounts[0]
+        if args.scenario:
+            scenario["users"] = accounts
+        else:
+            user_factory = PooledUserFactory(user_factory, accounts)
+        if "quiz-submit" in rates:
+            quiz_accounts = prepare_quiz_accounts(accounts, rates["quiz-submit"] * args.duration * max(args.repeat, 1),
+                                                  log)
+    elif "quiz-submit" in rates:
+        log("⚠️ quiz-submit from the single test user fails once it reaches the quiz's maxAttempts; "
+            "pass --user-pool N to rotate enrolled accounts", "ERROR")
+
+    samples, merged, success = [], MetricsRecorder(), True
+    for _ in range(max(args.repeat, 1)):
+        if args.processes > 1:
+            stats = run_multiprocess(args.processes, args.users, args.duration, API_BASE, credentials,
+                                     EXISTING_COURSE_ID, EXISTING_QUIZ_ID, rates, args.max_in_flight,
+                                     args.miss_tolerance_ms, args.report_interval, user_factory, quiz_accounts)
+        elif rates:
+            stats = run_open_loop(rates, args.duration, API_BASE, credentials,
+                                  EXISTING_COURSE_ID, EXISTING_QUIZ_ID, args.max_in_flight,
+                                  args.miss_tolerance_ms, quiz_accounts)
+        else:
+            stats = run_load(args.users, args.duration, API_BASE, credentials,
+                             EXISTING_COURSE_ID, EXISTING_QUIZ_ID, user_factory)
+        merged.merge(stats.metrics)
+        samples.append(run_sample(stats.metrics, stats.elapsed))
+        success = success and stats.total_requests > 0 and stats.total_errors == 0
+
+    if args.metrics_json:
+        merged.export_json(args.metrics_json)
+    return apply_baseline_options(args, samples, log) and success
+
+def run_functional_suite(args) -> bool:
+    """Run the functional suite --repeat times and apply baseline options"""
+    samples, merged, success = [], MetricsRecorder(), True
+    for _ in range(max(args.repeat, 1)):
+        tester = APITester()
+        tester.smtp_outbox = args.smtp_outbox
+        tester.heavy = args.heavy
+        started = time.perf_counter()
+        if args.parallel > 1:
+            success = tester.run_all_tests_parallel(args.parallel) and success
+        else:
+            success = tester.run_all_tests() and success
+        samples.append(run_sample(tester.endpoint_metrics, time.perf_counter() - started))
+        merged.merge(tester.metrics)
+
+    if args.metrics_json:
+        merged.export_json(args.metrics_json)
+    return apply_baseline_options(args, samples, tester.log) and success
+
 if __name__ == "__main__":
-    tester = APITester()
-    success = tester.run_all_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    args = parse_args()
+    success = run_load_mode(args) if args.users > 0 or args.rate else run_functional_suite(args)
+    sys.exit(0 if success else 1)
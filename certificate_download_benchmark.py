@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Certificate Download Benchmark
+Downloads one issued certificate from many concurrent clients, first cold and
+then from the server's on-disk PDF cache, and checks that concurrent cold
+downloads share a render, that every download is byte-identical, that Range
+and conditional requests are answered from the cached file and that updating
+or deleting the certificate drops it from the cache
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+from backend_test import ADMIN_CREDENTIALS, API_BASE, EXISTING_COURSE_ID, TEST_USER_CREDENTIALS
+from load_driver import aiohttp, log
+from perf_metrics import MetricsRecorder
+
+
+def cache_stats(api_base: str) -> Dict[str, Any]:
+    """Certificate PDF cache counters reported by /api/health"""
+    response = requests.get(f"{api_base}/health")
+    response.raise_for_status()
+    return response.json().get("certificatePdf") or {}
+
+
+def login(api_base: str, credentials: Dict[str, str]) -> str:
+    response = requests.post(f"{api_base}/auth/login", json=credentials)
+    response.raise_for_status()
+    return response.json()["token"]
+
+
+def issue_certificate(api_base: str, admin: Dict[str, str], course_id: str) -> Optional[str]:
+    """Issue a throwaway certificate to the test user, returning its id"""
+    response = requests.get(f"{api_base}/auth/me", headers={
+        "Authorization": f"Bearer {login(api_base, TEST_USER_CREDENTIALS)}"})
+    response.raise_for_status()
+    body = response.json()
+    user_id = (body.get("user") or body).get("id")
+    response = requests.post(f"{api_base}/certifications", headers=admin, json={
+        "userId": user_id, "courseId": course_id, "status": "ISSUED", "overallScore": 88,
+        "metadata": {"grade": "Very Good", "source": "certificate download benchmark"}})
+    if response.status_code != 201:
+        log(f"❌ Could not issue a certificate: {response.status_code} {response.text[:200]}", "ERROR")
+        return None
+    return response.json()["id"]
+
+
+async def download_burst(url: str, headers: Dict[str, str], downloads: int, concurrency: int) -> Dict[str, Any]:
+    """`downloads` GETs of `url` with `concurrency` in flight; latency, statuses and distinct bodies"""
+    metrics = MetricsRecorder()
+    statuses: Dict[int, int] = {}
+    digests: Dict[str, int] = {}
+    remaining = downloads
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as http:
+        async def client():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    async with http.get(url, headers=headers) as response:
+                        body = await response.read()
+                        status = response.status
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    status, body = 0, b""
+                metrics.record("pdf", time.perf_counter() - started, len(body))
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    digest = hashlib.sha256(body).hexdigest()
+                    digests[digest] = digests.get(digest, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {"summary": metrics.summary().get("pdf", {}), "statuses": statuses, "digests": digests,
+            "elapsed": elapsed}
+
+
+def check_ranges(url: str, headers: Dict[str, str], full: bytes, etag: str) -> bool:
+    """Partial, suffix, unsatisfiable, If-Range and If-None-Match requests against the cached file"""
+    size = len(full)
+    cases = [
+        ("first KiB", {"Range": "bytes=0-1023"}, 206, full[:1024], f"bytes 0-1023/{size}"),
+        ("middle slice", {"Range": f"bytes={size // 2}-{size // 2 + 499}"}, 206,
+         full[size // 2:size // 2 + 500], f"bytes {size // 2}-{size // 2 + 499}/{size}"),
+        ("last 100 bytes", {"Range": "bytes=-100"}, 206, full[-100:], f"bytes {size - 100}-{size - 1}/{size}"),
+        ("past the end", {"Range": f"bytes={size}-"}, 416, None, f"bytes */{size}"),
+        ("If-Range match", {"Range": "bytes=0-99", "If-Range": etag}, 206, full[:100], f"bytes 0-99/{size}"),
+        ("If-Range stale", {"Range": "bytes=0-99", "If-Range": '"stale"'}, 200, full, None),
+        ("If-None-Match", {"If-None-Match": etag}, 304, b"", None),
+    ]
+    ok = True
+    log(f"\n{'Request':<18} {'Status':>7} {'Expected':>9} {'Bytes':>8}  Content-Range")
+    for name, extra, expected, body, content_range in cases:
+        response = requests.get(url, headers={**headers, **extra})
+        passed = response.status_code == expected
+        if body is not None:
+            passed = passed and response.content == body
+        if content_range is not None:
+            passed = passed and response.headers.get("Content-Range") == content_range
+        ok = ok and passed
+        log(f"{'✅' if passed else '❌'} {name:<15} {response.status_code:>7} {expected:>9} {len(response.content):>8}  "
+            f"{response.headers.get('Content-Range', '-')}")
+    accepts = requests.head(url, headers=headers).headers.get("Accept-Ranges") == "bytes"
+    log(f"{'✅' if accepts else '❌'} Accept-Ranges: bytes advertised")
+    return ok and accepts
+
+
+def print_burst(name: str, burst: Dict[str, Any]):
+    row = burst["summary"]
+    count = row.get("count", 0)
+    log(f"{name:<6} {count:>7} {count / burst['elapsed']:>8.1f} {row.get('p50_ms', 0):>8.1f} "
+        f"{row.get('p95_ms', 0):>8.1f} {row.get('p99_ms', 0):>8.1f} {row.get('max_ms', 0):>8.1f} "
+        f"{row.get('bytes_total', 0) / 1048576 / burst['elapsed']:>8.1f} "
+        f"{', '.join(f'{status}: {n}' for status, n in sorted(burst['statuses'].items()))}")
+
+
+def run(args, admin: Dict[str, str], certificate_id: str, created: bool) -> bool:
+    url = f"{args.api_base}/certifications/{certificate_id}/pdf"
+    workers = (requests.get(f"{args.api_base}/health").json().get("cluster") or {}).get("workers", 1)
+
+    if not created:
+        # Start cold: an update with no changes still clears the certificate's cached renders
+        requests.put(f"{args.api_base}/certifications/{certificate_id}", headers=admin, json={})
+    before = cache_stats(args.api_base)
+    cold = asyncio.run(download_burst(url, admin, args.concurrency, args.concurrency))
+    after_cold = cache_stats(args.api_base)
+    warm = asyncio.run(download_burst(url, admin, args.downloads, args.concurrency))
+    after_warm = cache_stats(args.api_base)
+
+    log("\n" + "=" * 96)
+    log(f"CERTIFICATE PDF DOWNLOADS - {certificate_id}, {args.concurrency} concurrent")
+    log("=" * 96)
+    log(f"{'Phase':<6} {'Reqs':>7} {'RPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+        f"{'MB/s':>8} Statuses")
+    print_burst("cold", cold)
+    print_burst("warm", warm)
+
+    ok = True
+    for name, burst in (("cold", cold), ("warm", warm)):
+        all_ok = burst["statuses"].get(200, 0) == burst["summary"].get("count", 0)
+        ok = ok and all_ok
+        if not all_ok:
+            log(f"❌ Some {name} downloads failed", "ERROR")
+    digests = set(cold["digests"]) | set(warm["digests"])
+    identical = len(digests) == 1
+    log(f"{'✅' if identical else '❌'} Every download returned the same bytes ({len(digests)} distinct bodies)")
+
+    cold_renders = after_cold.get("renders", 0) - before.get("renders", 0)
+    warm_renders = after_warm.get("renders", 0) - after_cold.get("renders", 0)
+    # Each server process renders at most once; with several workers they may race to the same file
+    shared = 1 <= cold_renders <= workers and warm_renders == 0
+    log(f"{'✅' if shared else '❌'} {args.concurrency} cold downloads rendered {cold_renders} time(s), "
+        f"{args.downloads} warm downloads rendered {warm_renders} time(s) "
+        f"(avg render {after_warm.get('avgRenderMs', 0):.1f} ms)")
+    pool = after_warm.get("pool") or {}
+    log(f"🧵 Render pool: {pool.get('size', 0)} worker(s), {pool.get('rejected', 0)} render(s) shed with 503")
+
+    full = requests.get(url, headers=admin)
+    etag = full.headers.get("ETag", "")
+    ranges = full.status_code == 200 and bool(etag) and check_ranges(url, admin, full.content, etag)
+
+    # A changed certificate hashes to a new file; the old render is removed
+    response = requests.put(f"{args.api_base}/certifications/{certificate_id}", headers=admin,
+                            json={"metadata": {"grade": f"Benchmark {int(time.time())}"}})
+    updated = requests.get(url, headers=admin)
+    after_update = cache_stats(args.api_base)
+    refreshed = (response.status_code == 200 and updated.status_code == 200
+                 and updated.headers.get("ETag") != etag
+                 and after_update.get("invalidations", 0) > after_warm.get("invalidations", 0))
+    log(f"{'✅' if refreshed else '❌'} Updating the certificate served a fresh render "
+        f"({etag} → {updated.headers.get('ETag')})")
+
+    removed = True
+    if created:
+        requests.delete(f"{args.api_base}/certifications/{certificate_id}", headers=admin)
+        gone = requests.get(url, headers=admin)
+        removed = gone.status_code == 404
+        log(f"{'✅' if removed else '❌'} Deleted certificate no longer downloads ({gone.status_code})")
+
+    return ok and identical and shared and ranges and refreshed and removed
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Certificate Download Benchmark")
+    parser.add_argument("--certificate-id",
+                        help="issued certificate to download (default: issue a throwaway one to the test user)")
+    parser.add_argument("--downloads", type=int, default=500, help="warm downloads (default: 500)")
+    parser.add_argument("--concurrency", type=int, default=50,
+                        help="downloads in flight, and the size of the cold burst (default: 50)")
+    parser.add_argument("--course-id", default=EXISTING_COURSE_ID)
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The certificate download benchmark requires aiohttp: pip install aiohttp")
+    admin = {"Authorization": f"Bearer {login(args.api_base, ADMIN_CREDENTIALS)}"}
+    if not cache_stats(args.api_base):
+        log("⚠️ The server does not report certificatePdf on /api/health; cache checks will fail", "ERROR")
+
+    certificate_id, created = args.certificate_id, False
+    if not certificate_id:
+        certificate_id, created = issue_certificate(args.api_base, admin, args.course_id), True
+        if not certificate_id:
+            return False
+    log(f"📜 Downloading certificate {certificate_id}: {args.concurrency} cold, then {args.downloads} warm")
+    return run(args, admin, certificate_id, created)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
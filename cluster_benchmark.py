@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Cluster Benchmark
+Measures GET /api/courses throughput at several client concurrencies and
+compares the results across CLUSTER_WORKERS settings, and checks that the OTP
+request limit still holds when requests land on different workers
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict
+
+import requests
+
+from backend_test import API_BASE
+from load_driver import LoadStats, aiohttp, log, send
+
+MATRIX_VERSION = 1
+ENDPOINT = "GET /api/courses"
+# forgot-password allows this many requests per email per window
+OTP_LIMIT = 3
+
+
+def cluster_info(api_base: str) -> Dict[str, Any]:
+    """Worker count and shared state store reported by /api/health"""
+    response = requests.get(f"{api_base}/health")
+    response.raise_for_status()
+    health = response.json()
+    return {"workers": (health.get("cluster") or {}).get("workers", 1),
+            "store": (health.get("sharedState") or {}).get("store", "memory")}
+
+
+async def closed_loop(api_base: str, concurrency: int, duration: float) -> LoadStats:
+    """`concurrency` clients issuing back-to-back requests, each on its own connection so they spread over workers"""
+    stats = LoadStats()
+    url = f"{api_base}/courses"
+
+    async def client(deadline: float):
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=1)) as http:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    status, body = await send(http, "GET", url, {})
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    status, body = 0, b""
+                stats.record(ENDPOINT, time.perf_counter() - start, status == 200, len(body))
+
+    stats.started_at = time.perf_counter()
+    deadline = stats.started_at + duration
+    await asyncio.gather(*(client(deadline) for _ in range(concurrency)))
+    stats.finished_at = time.perf_counter()
+    return stats
+
+
+def check_shared_limit(api_base: str) -> bool:
+    """Send one more forgot-password request than the limit allows, each on a new connection"""
+    email = f"cluster-limit-{uuid.uuid4().hex[:8]}@example.com"
+    statuses = []
+    for _ in range(OTP_LIMIT + 1):
+        statuses.append(requests.post(f"{api_base}/auth/forgot-password", json={"email": email},
+                                      headers={"Connection": "close"}).status_code)
+    held = statuses[:OTP_LIMIT] == [200] * OTP_LIMIT and statuses[-1] == 429
+    if held:
+        log(f"✅ OTP limit held across connections: {statuses}")
+    else:
+        log(f"❌ OTP limit did not hold across connections, expected {OTP_LIMIT} x 200 then 429: {statuses}", "ERROR")
+    return held
+
+
+def load_matrix(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"version": MATRIX_VERSION, "runs": []}
+    with open(path, encoding="utf-8") as handle:
+        matrix = json.load(handle)
+    if matrix.get("version") != MATRIX_VERSION:
+        raise ValueError(f"Unsupported cluster matrix version in {path}: {matrix.get('version')}")
+    return matrix
+
+
+def measure(args) -> Dict[str, Any]:
+    info = cluster_info(args.api_base)
+    workers = args.workers or info["workers"]
+    log(f"🧵 {workers} worker(s), {info['store']} shared state: measuring {ENDPOINT} "
+        f"at concurrency {', '.join(map(str, args.concurrency))}")
+    if workers > 1 and info["store"] != "database":
+        log("⚠️ Several workers with the memory store: each worker enforces its own rate limits", "ERROR")
+
+    levels = {}
+    for concurrency in args.concurrency:
+        stats = asyncio.run(closed_loop(args.api_base, concurrency, args.duration))
+        row = stats.summary().get(ENDPOINT, {})
+        levels[str(concurrency)] = {
+            "rps": row.get("rps", 0.0) - row.get("errors", 0) / stats.elapsed,
+            "p50_ms": row.get("p50_ms", 0.0),
+            "p95_ms": row.get("p95_ms", 0.0),
+            "errors": row.get("errors", 0),
+        }
+        log(f"   concurrency {concurrency:>4}: {levels[str(concurrency)]['rps']:>8.1f} ok req/s, "
+            f"p95 {row.get('p95_ms', 0.0):.1f} ms, {row.get('errors', 0)} errors")
+
+    return {
+        "workers": workers,
+        "store": info["store"],
+        "measuredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "levels": levels,
+        "sharedLimitHeld": check_shared_limit(args.api_base) if args.check_limit else None,
+    }
+
+
+def print_report(matrix: Dict[str, Any], min_gain: float) -> bool:
+    """Throughput per worker count and concurrency; returns False if more workers are not faster"""
+    runs = sorted(matrix["runs"], key=lambda run: run["workers"])
+    levels = sorted({int(level) for run in runs for level in run["levels"]})
+    log("\n" + "=" * 96)
+    log(f"WORKER COUNT SCALING ({ENDPOINT}, successful req/s)")
+    log("=" * 96)
+    log(f"{'Workers':<10} {'Store':<10} " + " ".join(f"{'c=' + str(level):>10}" for level in levels)
+        + f" {'OTP limit':>10}")
+    for run in runs:
+        cells = " ".join(
+            f"{run['levels'][str(level)]['rps']:>10.1f}" if str(level) in run["levels"] else f"{'-':>10}"
+            for level in levels
+        )
+        held = {True: "held", False: "BROKEN", None: "-"}[run.get("sharedLimitHeld")]
+        log(f"{run['workers']:<10} {run['store']:<10} {cells} {held:>10}")
+
+    broken = [run["workers"] for run in runs if run.get("sharedLimitHeld") is False]
+    if len(runs) < 2:
+        log("\nℹ️ Restart the server with another CLUSTER_WORKERS and rerun to compare worker counts")
+        return not broken
+
+    # Compare at the highest concurrency both runs measured, where the event loop saturates first
+    regressions = []
+    for fewer, more in zip(runs, runs[1:]):
+        shared = sorted(set(fewer["levels"]) & set(more["levels"]), key=int)
+        if not shared:
+            continue
+        level = shared[-1]
+        before, after = fewer["levels"][level]["rps"], more["levels"][level]["rps"]
+        gain = after / before - 1 if before else 0.0
+        log(f"{'📈' if gain >= min_gain else '⚠️'} {fewer['workers']} → {more['workers']} workers "
+            f"at c={level}: {before:.1f} → {after:.1f} req/s ({gain * 100:+.1f}%)")
+        if gain < min_gain:
+            regressions.append(level)
+    return not regressions and not broken
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Cluster Benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64, 128],
+                        help="client concurrency levels to measure (default: 4 16 64 128)")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per concurrency level (default: 15)")
+    parser.add_argument("--workers", type=int,
+                        help="label for this run; defaults to the worker count reported by /api/health")
+    parser.add_argument("--matrix", default="cluster-matrix.json",
+                        help="JSON file accumulating one run per worker count (default: cluster-matrix.json)")
+    parser.add_argument("--min-gain", type=float, default=0.25,
+                        help="throughput gain expected from each larger worker count (default: 0.25 = 25%%)")
+    parser.add_argument("--no-check-limit", dest="check_limit", action="store_false",
+                        help="skip the forgot-password requests that check the OTP limit is shared")
+    parser.add_argument("--report", action="store_true", help="only print the report for an existing --matrix")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The cluster benchmark requires aiohttp: pip install aiohttp")
+    matrix = load_matrix(args.matrix)
+
+    if not args.report:
+        run = measure(args)
+        matrix["runs"] = [existing for existing in matrix["runs"] if existing["workers"] != run["workers"]] + [run]
+        with open(args.matrix, "w", encoding="utf-8") as handle:
+            json.dump(matrix, handle, indent=2)
+        log(f"💾 Cluster matrix saved to {args.matrix}")
+    return print_report(matrix, args.min_gain)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -5,10 +5,14 @@ Tests core functionality without rate-limited endpoints
 """
 
 import requests
+import argparse
 import json
 import time
 import sys
 
+from perf_baseline import add_baseline_arguments, apply_baseline_options, run_sample
+from perf_metrics import MetricsRecorder
+
 # Configuration
 BASE_URL = "http://localhost:8001"
 API_BASE = f"{BASE_URL}/api"
@@ -34,14 +38,18 @@ class CriticalAPITester:
             "failed": 0,
             "errors": []
         }
+        self.metrics = MetricsRecorder()
+        self.endpoint_metrics = MetricsRecorder()
 
     def log(self, message: str, level: str = "INFO"):
         """Log test messages"""
         print(f"[{level}] {message}")
 
     def assert_response(self, response: requests.Response, expected_status: int, test_name: str) -> bool:
-        """Assert response status and log results"""
+        """Assert response status, record latency and body size, and log results"""
         try:
+            self.metrics.record_response(test_name, response)
+            self.endpoint_metrics.record_endpoint(response)
             if response.status_code == expected_status:
                 self.log(f"✅ {test_name} - Status: {response.status_code}")
                 self.results["passed"] += 1
@@ -210,6 +218,7 @@ class CriticalAPITester:
         self.log(f"✅ Passed: {self.results['passed']}")
         self.log(f"❌ Failed: {self.results['failed']}")
         self.log(f"📊 Total: {self.results['passed'] + self.results['failed']}")
+        self.metrics.print_table(self.log)
         
         if self.results["errors"]:
             self.log("\n🚨 FAILED TESTS:")
@@ -233,7 +242,25 @@ class CriticalAPITester:
         
         return self.print_summary()
 
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend API Critical Test Suite")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="export per-test latency histograms and byte counts as JSON")
+    add_baseline_arguments(parser)
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    tester = CriticalAPITester()
-    success = tester.run()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    args = parse_args()
+    samples, merged, success = [], MetricsRecorder(), True
+    for _ in range(max(args.repeat, 1)):
+        tester = CriticalAPITester()
+        started = time.perf_counter()
+        success = tester.run() and success
+        samples.append(run_sample(tester.endpoint_metrics, time.perf_counter() - started))
+        merged.merge(tester.metrics)
+
+    if args.metrics_json:
+        merged.export_json(args.metrics_json)
+    success = apply_baseline_options(args, samples, tester.log) and success
+    sys.exit(0 if success else 1)
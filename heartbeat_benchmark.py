@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Lesson Heartbeat Benchmark
+Replays video-player heartbeat traffic and reports database writes per
+client progress update, comparing write-through and buffered server runs
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from typing import Any, Dict
+
+import requests
+
+from backend_test import API_BASE, EXISTING_COURSE_ID, EXISTING_QUIZ_ID, TEST_USER_CREDENTIALS
+from load_driver import aiohttp, log, run_load
+from load_scenarios import ScenarioUser, load_scenario
+from user_pool import UserPool
+
+MATRIX_VERSION = 1
+HEARTBEAT_ENDPOINT = "PUT /api/learning-progress/lesson/{id}"
+DEFAULT_SCENARIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios", "lesson_heartbeats.json")
+
+
+def server_counters(api_base: str) -> Dict[str, Any]:
+    """Statement totals and write-behind buffer state reported by /api/health"""
+    response = requests.get(f"{api_base}/health")
+    response.raise_for_status()
+    data = response.json()
+    if "queries" not in data:
+        raise RuntimeError("Server does not report query totals on /api/health")
+    return {"queries": data["queries"], "buffer": data.get("progressBuffer") or {}}
+
+
+def settled_counters(api_base: str, timeout: float) -> Dict[str, Any]:
+    """Counters once the server's buffer has written everything the run left pending"""
+    deadline = time.perf_counter() + timeout
+    counters = server_counters(api_base)
+    while counters["buffer"].get("pending") and time.perf_counter() < deadline:
+        time.sleep(0.5)
+        counters = server_counters(api_base)
+    if counters["buffer"].get("pending"):
+        log(f"⚠️ {counters['buffer']['pending']} update(s) still buffered after {timeout:.0f}s", "ERROR")
+    return counters
+
+
+def mode_label(buffer: Dict[str, Any]) -> str:
+    return f"buffered {buffer['flushIntervalMs']}ms" if buffer.get("enabled") else "write-through"
+
+
+def load_matrix(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"version": MATRIX_VERSION, "runs": []}
+    with open(path, encoding="utf-8") as handle:
+        matrix = json.load(handle)
+    if matrix.get("version") != MATRIX_VERSION:
+        raise ValueError(f"Unsupported heartbeat matrix version in {path}: {matrix.get('version')}")
+    return matrix
+
+
+def measure(args) -> Dict[str, Any]:
+    scenario = load_scenario(args.scenario, TEST_USER_CREDENTIALS, {"course_id": [args.course_id]})
+    # Distinct accounts, so heartbeats coalesce per viewer rather than all landing on one user
+    accounts = UserPool(args.pool_file, args.api_base).checkout(args.users)
+    if not accounts:
+        raise RuntimeError("User pool has no usable accounts")
+    for account in accounts:
+        requests.post(f"{args.api_base}/enrollments", headers={"Authorization": f"Bearer {account['token']}"},
+                      json={"courseId": args.course_id})
+    scenario["users"] = accounts
+
+    before = server_counters(args.api_base)
+    stats = run_load(args.users, args.duration, args.api_base, accounts[0], args.course_id, EXISTING_QUIZ_ID,
+                     functools.partial(ScenarioUser, scenario))
+    after = settled_counters(args.api_base, args.settle_timeout)
+
+    row = stats.summary().get(HEARTBEAT_ENDPOINT, {})
+    updates = row.get("requests", 0) - row.get("errors", 0)
+    writes = after["queries"]["writes"] - before["queries"]["writes"]
+    return {
+        "mode": args.label or mode_label(after["buffer"]),
+        "measuredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "users": args.users,
+        "updates": updates,
+        "writes": writes,
+        "writesPerUpdate": writes / updates if updates else 0.0,
+        "queriesPerUpdate": (after["queries"]["queries"] - before["queries"]["queries"]) / updates if updates else 0.0,
+        "p95_ms": row.get("p95_ms", 0.0),
+        "errors": stats.total_errors,
+    }
+
+
+def print_report(matrix: Dict[str, Any]):
+    """Writes per client update for every recorded server mode"""
+    runs = matrix["runs"]
+    log("\n" + "=" * 96)
+    log(f"LESSON HEARTBEAT WRITE AMPLIFICATION ({HEARTBEAT_ENDPOINT})")
+    log("=" * 96)
+    log(f"{'Mode':<24} {'Users':>6} {'Updates':>8} {'DB writes':>10} {'Writes/upd':>11} "
+        f"{'Queries/upd':>12} {'p95 ms':>8} {'Errors':>7}")
+    for run in runs:
+        log(f"{run['mode']:<24} {run['users']:>6} {run['updates']:>8} {run['writes']:>10} "
+            f"{run['writesPerUpdate']:>11.3f} {run['queriesPerUpdate']:>12.3f} {run['p95_ms']:>8.1f} "
+            f"{run['errors']:>7}")
+
+    through = next((run for run in runs if run["mode"] == "write-through"), None)
+    for run in runs:
+        if through and run is not through and run["writesPerUpdate"]:
+            log(f"📉 {run['mode']}: {through['writesPerUpdate'] / run['writesPerUpdate']:.1f}x fewer "
+                f"DB writes per update than write-through")
+    if not through:
+        log("\nℹ️ Restart the server with PROGRESS_FLUSH_INTERVAL_MS=0 and rerun to measure the write-through baseline")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Lesson Heartbeat Benchmark")
+    parser.add_argument("--users", type=int, default=50, help="concurrent viewers, each its own account (default: 50)")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds of heartbeat traffic (default: 60)")
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIO,
+                        help="scenario JSON with the heartbeat journey (default: scenarios/lesson_heartbeats.json)")
+    parser.add_argument("--pool-file", default=".user-pool.json", metavar="PATH",
+                        help="user pool cache shared with backend_test.py (default: .user-pool.json)")
+    parser.add_argument("--label", help="name for this run; defaults to the buffer mode reported by /api/health")
+    parser.add_argument("--settle-timeout", type=float, default=15.0,
+                        help="seconds to wait for the server to flush buffered updates (default: 15)")
+    parser.add_argument("--matrix", default="heartbeat-matrix.json",
+                        help="JSON file accumulating one run per server mode (default: heartbeat-matrix.json)")
+    parser.add_argument("--report", action="store_true", help="only print the report for an existing --matrix")
+    parser.add_argument("--course-id", default=EXISTING_COURSE_ID)
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The heartbeat benchmark requires aiohttp: pip install aiohttp")
+    matrix = load_matrix(args.matrix)
+
+    success = True
+    if not args.report:
+        run = measure(args)
+        matrix["runs"] = [existing for existing in matrix["runs"] if existing["mode"] != run["mode"]] + [run]
+        with open(args.matrix, "w", encoding="utf-8") as handle:
+            json.dump(matrix, handle, indent=2)
+        log(f"💾 Heartbeat matrix saved to {args.matrix}")
+        success = run["updates"] > 0 and run["errors"] == 0
+    print_report(matrix)
+    return success
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Load Driver
+Runs the APITester user journeys as concurrent asyncio virtual users
+"""
+
+import asyncio
+import json
+import multiprocessing
+import time
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from perf_metrics import MetricsRecorder
+
+try:
+    import aiohttp
+except ImportError:  # Load mode only; the functional suites run on requests alone
+    aiohttp = None
+
+
+def log(message: str, level: str = "INFO"):
+    """Log load test messages"""
+    print(f"[{level}] {message}")
+
+
+async def send(http: "aiohttp.ClientSession", method: str, url: str, headers: Dict[str, str],
+               **kwargs) -> Tuple[int, bytes]:
+    """Issue one request and return (status, raw body)"""
+    async with http.request(method, url, headers=headers, **kwargs) as response:
+        return response.status, await response.read()
+
+
+def parse_json(body: bytes) -> Any:
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
+
+
+def first_option_answers(quiz: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer every question of a quiz with its first option, so submissions are graded"""
+    answers = {}
+    for question in (quiz or {}).get("questions", []):
+        options = question.get("options") or []
+        if isinstance(options, list) and options:
+            answers[question["id"]] = options[0]
+    return answers
+
+
+class LoadStats:
+    """Per-endpoint latency histograms and error counts shared by all virtual users"""
+
+    def __init__(self):
+        self.metrics = MetricsRecorder()
+        self.journeys = MetricsRecorder()
+        self.errors: Dict[str, int] = {}
+        # Worker processes that crashed or never reported; each counts as an error
+        self.failed_workers = 0
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+
+    def record(self, endpoint: str, seconds: float, ok: bool, nbytes: int = 0):
+        self.metrics.record(endpoint, seconds, nbytes)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return max(end - self.started_at, 1e-9)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(metrics.count for metrics in self.metrics.endpoints.values())
+
+    @property
+    def total_errors(self) -> int:
+        return sum(self.errors.values()) + self.failed_workers
+
+    def drain(self) -> Dict[str, Any]:
+        """Hand over everything recorded since the last drain and start afresh"""
+        delta = {"metrics": self.metrics.to_dict(), "journeys": self.journeys.to_dict(), "errors": self.errors}
+        self.metrics = MetricsRecorder()
+        self.journeys = MetricsRecorder()
+        self.errors = {}
+        return delta
+
+    def absorb(self, delta: Dict[str, Any]):
+        """Merge a drained delta from another process (histograms merge losslessly)"""
+        self.metrics.merge(MetricsRecorder.from_dict(delta["metrics"]))
+        self.journeys.merge(MetricsRecorder.from_dict(delta.get("journeys", {})))
+        for endpoint, count in delta["errors"].items():
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + count
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Requests per second and p50/p95/p99 latency (ms) per endpoint"""
+        rows = {}
+        for endpoint, row in self.metrics.summary().items():
+            rows[endpoint] = {
+                "requests": row["count"],
+                "errors": self.errors.get(endpoint, 0),
+                "rps": row["count"] / self.elapsed,
+                "p50_ms": row["p50_ms"],
+                "p95_ms": row["p95_ms"],
+                "p99_ms": row["p99_ms"],
+            }
+        return rows
+
+    def print_report(self, users: int):
+        """Print the load run summary table"""
+        log("\n" + "=" * 96)
+        log(f"LOAD TEST RESULTS - {users} virtual users, {self.elapsed:.1f}s")
+        log("=" * 96)
+        log(f"{'Endpoint':<44} {'Reqs':>7} {'Errs':>6} {'RPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for endpoint, row in self.summary().items():
+            log(
+                f"{endpoint:<44} {row['requests']:>7} {row['errors']:>6} {row['rps']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+            )
+        for journey, row in self.journeys.summary().items():
+            log(f"{'journey ' + journey:<44} {row['count']:>7} {'':>6} {row['count'] / self.elapsed:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+        log("-" * 96)
+        log(f"📊 Total: {self.total_requests} requests, {self.total_errors} errors, "
+            f"{self.total_requests / self.elapsed:.1f} req/s")
+        if self.failed_workers:
+            log(f"❌ {self.failed_workers} worker process(es) failed; their share of the load is missing", "ERROR")
+
+
+class VirtualUser:
+    """One simulated student with its own connection pool and auth token"""
+
+    def __init__(self, index: int, api_base: str, credentials: Dict[str, str],
+                 course_id: str, quiz_id: str, stats: LoadStats):
+        self.index = index
+        self.api_base = api_base
+        self.credentials = credentials
+        self.course_id = course_id
+        self.quiz_id = quiz_id
+        self.stats = stats
+        self.token: Optional[str] = None
+        self.http: Optional["aiohttp.ClientSession"] = None
+
+    async def request(self, method: str, path: str, endpoint: str, expected: Tuple[int, ...] = (200,),
+                      **kwargs) -> Tuple[int, Any]:
+        """Issue one request, record its latency under `endpoint` and return (status, json)"""
+        headers = kwargs.pop("headers", {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        start = time.perf_counter()
+        try:
+            status, body = await send(self.http, method, f"{self.api_base}{path}", headers, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.stats.record(endpoint, time.perf_counter() - start, False)
+            return 0, None
+
+        self.stats.record(endpoint, time.perf_counter() - start, status in expected, len(body))
+        return status, parse_json(body)
+
+    async def login(self) -> bool:
+        """Use a token handed over by the user pool, or log in with the credentials"""
+        self.token = self.credentials.get("token")
+        if self.token:
+            return True
+        status, data = await self.request("POST", "/auth/login", "POST /api/auth/login",
+                                          json={"email": self.credentials["email"],
+                                                "password": self.credentials["password"]})
+        self.token = (data or {}).get("token") if status == 200 else None
+        return bool(self.token)
+
+    async def run_journey(self):
+        """courses → enrollments → learning progress → quiz start/submit"""
+        await self.request("GET", "/courses", "GET /api/courses")
+        await self.request("GET", "/enrollments/my-enrollments", "GET /api/enrollments/my-enrollments")
+        await self.request("GET", f"/learning-progress/{self.course_id}", "GET /api/learning-progress/{id}")
+
+        status, data = await self.request("POST", f"/quizzes/{self.quiz_id}/start", "POST /api/quizzes/{id}/start",
+                                          expected=(200, 201, 400))
+        attempt_id = ((data or {}).get("attempt") or {}).get("id") if status in (200, 201) else None
+        if not attempt_id:
+            return
+
+        status, quiz = await self.request("GET", f"/quizzes/{self.quiz_id}", "GET /api/quizzes/{id}")
+        answers = first_option_answers(quiz) if status == 200 else {}
+
+        await self.request("POST", f"/quizzes/{self.quiz_id}/submit", "POST /api/quizzes/{id}/submit",
+                           json={"attemptId": attempt_id, "answers": answers, "timeSpentSeconds": 60})
+
+    async def run(self, deadline: float):
+        connector = aiohttp.TCPConnector(limit=1)
+        async with aiohttp.ClientSession(connector=connector) as http:
+            self.http = http
+            if not await self.login():
+                log(f"❌ Virtual user {self.index} could not log in", "ERROR")
+                return
+            while time.perf_counter() < deadline:
+                await self.run_journey()
+
+
+async def run_virtual_users(users: int, duration: float, api_base: str, credentials: Dict[str, str],
+                            course_id: str, quiz_id: str, stats: Optional[LoadStats] = None,
+                            first_index: int = 0,
+                            user_factory: Callable[..., VirtualUser] = VirtualUser) -> LoadStats:
+    stats = stats or LoadStats()
+    stats.started_at = time.perf_counter()
+    deadline = stats.started_at + duration
+    virtual_users = [
+        user_factory(first_index + index, api_base, dict(credentials), course_id, quiz_id, stats)
+        for index in range(users)
+    ]
+    await asyncio.gather(*(vu.run(deadline) for vu in virtual_users))
+    stats.finished_at = time.perf_counter()
+    return stats
+
+
+def run_load(users: int, duration: float, api_base: str, credentials: Dict[str, str],
+             course_id: str, quiz_id: str, user_factory: Callable[..., VirtualUser] = VirtualUser) -> LoadStats:
+    """Run `users` concurrent virtual users for `duration` seconds and print the report"""
+    if aiohttp is None:
+        raise RuntimeError("Load mode requires aiohttp: pip install aiohttp")
+
+    log(f"Starting load test: {users} virtual users for {duration:.0f}s against {api_base}")
+    stats = asyncio.run(run_virtual_users(users, duration, api_base, credentials, course_id, quiz_id,
+                                          user_factory=user_factory))
+    stats.print_report(users)
+    return stats
+
+
+# =====================================================
+# Open-loop (constant arrival rate) mode
+# =====================================================
+
+class OpenLoopStats(LoadStats):
+    """LoadStats measured from intended start times, plus schedule adherence"""
+
+    def __init__(self, rates: Dict[str, float], miss_tolerance: float):
+        super().__init__()
+        self.rates = rates
+        self.miss_tolerance = miss_tolerance
+        self.service = MetricsRecorder()
+        self.scheduled: Dict[str, int] = {}
+        self.missed: Dict[str, int] = {}
+        self.max_lag: Dict[str, float] = {}
+
+    def record_dispatch(self, operation: str, lag: float):
+        self.scheduled[operation] = self.scheduled.get(operation, 0) + 1
+        self.max_lag[operation] = max(self.max_lag.get(operation, 0.0), lag)
+        if lag > self.miss_tolerance:
+            self.missed[operation] = self.missed.get(operation, 0) + 1
+
+    def drain(self) -> Dict[str, Any]:
+        delta = super().drain()
+        delta.update(service=self.service.to_dict(), scheduled=self.scheduled,
+                     missed=self.missed, max_lag=self.max_lag)
+        self.service = MetricsRecorder()
+        self.scheduled, self.missed, self.max_lag = {}, {}, {}
+        return delta
+
+    def absorb(self, delta: Dict[str, Any]):
+        super().absorb(delta)
+        self.service.merge(MetricsRecorder.from_dict(delta["service"]))
+        for operation, count in delta["scheduled"].items():
+            self.scheduled[operation] = self.scheduled.get(operation, 0) + count
+        for operation, count in delta["missed"].items():
+            self.missed[operation] = self.missed.get(operation, 0) + count
+        for operation, lag in delta["max_lag"].items():
+            self.max_lag[operation] = max(self.max_lag.get(operation, 0.0), lag)
+
+    @property
+    def total_missed(self) -> int:
+        return sum(self.missed.values())
+
+    def print_report(self, users: int = 0):
+        """Print intended-start latency, service time and schedule misses per operation"""
+        log("\n" + "=" * 118)
+        log(f"OPEN-LOOP RESULTS - {self.elapsed:.1f}s, latency measured from intended start")
+        log("=" * 118)
+        log(f"{'Operation':<20} {'Target':>7} {'RPS':>8} {'Errs':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'svc p99':>8} {'Missed':>8} {'Miss %':>7} {'Max lag ms':>10}")
+        service = self.service.summary()
+        for operation, row in self.summary().items():
+            scheduled = self.scheduled.get(operation, 0)
+            missed = self.missed.get(operation, 0)
+            log(f"{operation:<20} {self.rates.get(operation, 0):>7.1f} {row['rps']:>8.1f} {row['errors']:>6} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+                f"{service.get(operation, {}).get('p99_ms', 0):>8.1f} {missed:>8} "
+                f"{(missed / scheduled * 100 if scheduled else 0):>6.1f}% {self.max_lag.get(operation, 0) * 1000:>10.1f}")
+        log("-" * 118)
+        scheduled = sum(self.scheduled.values())
+        log(f"📊 Total: {self.total_requests} completed of {scheduled} scheduled, {self.total_errors} errors, "
+            f"{self.total_missed} missed their send time by more than {self.miss_tolerance * 1000:.0f}ms")
+        if self.failed_workers:
+            log(f"❌ {self.failed_workers} worker process(es) failed; their share of the load is missing", "ERROR")
+
+
+class OpenLoopClient:
+    """Shared connection pool and token used by every scheduled request"""
+
+    def __init__(self, http: "aiohttp.ClientSession", api_base: str, token: str,
+                 course_id: str, quiz_id: str, credentials: Optional[Dict[str, str]] = None,
+                 quiz_accounts: Optional[List[Dict[str, Any]]] = None):
+        self.http = http
+        self.api_base = api_base
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.credentials = credentials or {}
+        self.course_id = course_id
+        self.quiz_id = quiz_id
+        # Enrolled accounts that quiz submits rotate through, so no single account runs out of attempts
+        self.quiz_accounts = [account for account in quiz_accounts or [] if account.get("token")] or [{"token": token}]
+        self.quiz_busy = set()
+        self.next_quiz_account = 0
+        self.quiz_answers: Optional[Dict[str, Any]] = None
+
+    async def call(self, method: str, path: str, **kwargs) -> Tuple[int, bytes]:
+        return await send(self.http, method, f"{self.api_base}{path}", dict(self.headers), **kwargs)
+
+    async def courses(self):
+        return await self.call("GET", "/courses")
+
+    async def course(self):
+        return await self.call("GET", f"/courses/{self.course_id}")
+
+    async def enrollments(self):
+        return await self.call("GET", "/enrollments/my-enrollments")
+
+    async def learning_progress(self):
+        return await self.call("GET", f"/learning-progress/{self.course_id}")
+
+    async def login(self):
+        """A fresh password login, which costs the server one bcrypt comparison"""
+        return await send(self.http, "POST", f"{self.api_base}/auth/login", {},
+                          json={"email": self.credentials.get("email"), "password": self.credentials.get("password")})
+
+    def claim_quiz_account(self) -> int:
+        """Next quiz account with no submit in flight; if all are busy, the next one in turn"""
+        count = len(self.quiz_accounts)
+        candidates = [(self.next_quiz_account + offset) % count for offset in range(count)]
+        index = next((candidate for candidate in candidates if candidate not in self.quiz_busy), candidates[0])
+        self.next_quiz_account = index + 1
+        self.quiz_busy.add(index)
+        return index
+
+    async def quiz_submit(self):
+        """Claim an attempt on a quiz account and submit graded answers; the latency covers both calls"""
+        index = self.claim_quiz_account()
+        headers = {"Authorization": f"Bearer {self.quiz_accounts[index]['token']}"}
+        quiz_url = f"{self.api_base}/quizzes/{self.quiz_id}"
+        try:
+            if self.quiz_answers is None:
+                status, body = await send(self.http, "GET", quiz_url, dict(headers))
+                if status != 200:
+                    return status, body
+                self.quiz_answers = first_option_answers(parse_json(body))
+            status, body = await send(self.http, "POST", f"{quiz_url}/start", dict(headers))
+            attempt_id = ((parse_json(body) or {}).get("attempt") or {}).get("id")
+            if status not in (200, 201) or not attempt_id:
+                # A refused start, such as an account out of attempts, is a failed sample, not a quick success
+                return (status if status >= 400 else 0), body
+            return await send(self.http, "POST", f"{quiz_url}/submit", dict(headers),
+                              json={"attemptId": attempt_id, "answers": self.quiz_answers, "timeSpentSeconds": 60})
+        finally:
+            self.quiz_busy.discard(index)
+
+
+# Operation name -> (OpenLoopClient method, accepted status codes)
+OPEN_LOOP_OPERATIONS = {
+    "courses": ("courses", (200,)),
+    "course": ("course", (200,)),
+    "enrollments": ("enrollments", (200,)),
+    "learning-progress": ("learning_progress", (200,)),
+    # Fails when the start is refused, e.g. once every quiz account has used up the quiz's attempts
+    "quiz-submit": ("quiz_submit", (200,)),
+    # A 503 means the server shed the login because its password hashing queue was full
+    "login": ("login", (200,)),
+}
+
+
+def parse_rates(values: List[str]) -> Dict[str, float]:
+    """Parse repeated `operation=requests_per_second` options"""
+    rates = {}
+    for value in values:
+        operation, _, rate = value.partition("=")
+        if operation not in OPEN_LOOP_OPERATIONS:
+            raise ValueError(f"Unknown open-loop operation '{operation}'; "
+                             f"choose from {', '.join(OPEN_LOOP_OPERATIONS)}")
+        rates[operation] = float(rate)
+        if rates[operation] <= 0:
+            raise ValueError(f"Rate for '{operation}' must be positive")
+    return rates
+
+
+async def fire(client: OpenLoopClient, operation: str, intended: float, slots: asyncio.Semaphore,
+               stats: OpenLoopStats):
+    method_name, accepted = OPEN_LOOP_OPERATIONS[operation]
+    async with slots:
+        sent = time.perf_counter()
+        stats.record_dispatch(operation, sent - intended)
+        try:
+            status, body = await getattr(client, method_name)()
+            ok, nbytes = status in accepted, len(body)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok, nbytes = False, 0
+        finished = time.perf_counter()
+    stats.record(operation, finished - intended, ok, nbytes)
+    stats.service.record(operation, finished - sent, nbytes)
+
+
+async def run_schedule(client: OpenLoopClient, operation: str, rate: float, deadline: float,
+                       slots: asyncio.Semaphore, stats: OpenLoopStats):
+    """Fire `operation` every 1/rate seconds from stats.started_at, never waiting on responses"""
+    interval = 1.0 / rate
+    in_flight = set()
+    tick = 0
+    while True:
+        intended = stats.started_at + tick * interval
+        if intended >= deadline:
+            break
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(fire(client, operation, intended, slots, stats))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        tick += 1
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def run_open_loop_schedules(rates: Dict[str, float], duration: float, api_base: str,
+                                  credentials: Dict[str, str], course_id: str, quiz_id: str,
+                                  max_in_flight: int, miss_tolerance: float,
+                                  stats: Optional[OpenLoopStats] = None,
+                                  quiz_accounts: Optional[List[Dict[str, Any]]] = None) -> OpenLoopStats:
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    async with aiohttp.ClientSession(connector=connector) as http:
+        token, status = credentials.get("token"), 200
+        if not token:
+            status, body = await send(http, "POST", f"{api_base}/auth/login", {},
+                                      json={"email": credentials["email"], "password": credentials["password"]})
+            token = (parse_json(body) or {}).get("token") if status == 200 else None
+        if not token:
+            raise RuntimeError(f"Open-loop mode could not log in (status {status})")
+
+        client = OpenLoopClient(http, api_base, token, course_id, quiz_id, credentials, quiz_accounts)
+        slots = asyncio.Semaphore(max_in_flight)
+        stats = stats or OpenLoopStats(rates, miss_tolerance)
+        stats.started_at = time.perf_counter()
+        deadline = stats.started_at + duration
+        await asyncio.gather(*(
+            run_schedule(client, operation, rate, deadline, slots, stats)
+            for operation, rate in rates.items()
+        ))
+        stats.finished_at = time.perf_counter()
+        return stats
+
+
+def run_open_loop(rates: Dict[str, float], duration: float, api_base: str, credentials: Dict[str, str],
+                  course_id: str, quiz_id: str, max_in_flight: int = 1000,
+                  miss_tolerance_ms: float = 5.0,
+                  quiz_accounts: Optional[List[Dict[str, Any]]] = None) -> OpenLoopStats:
+    """Drive each operation at a fixed arrival rate regardless of how fast the server answers;
+    quiz submits rotate through `quiz_accounts`, which must be enrolled in the quiz's course"""
+    if aiohttp is None:
+        raise RuntimeError("Open-loop mode requires aiohttp: pip install aiohttp")
+
+    schedule = ", ".join(f"{operation}={rate:g}/s" for operation, rate in rates.items())
+    log(f"Starting open-loop test: {schedule} for {duration:.0f}s against {api_base}")
+    stats = asyncio.run(run_open_loop_schedules(rates, duration, api_base, credentials, course_id, quiz_id,
+                                                max_in_flight, miss_tolerance_ms / 1000.0,
+                                                quiz_accounts=quiz_accounts))
+    stats.print_report()
+    return stats
+
+
+# =====================================================
+# Multi-process driver
+# =====================================================
+
+async def stream_deltas(stats: LoadStats, queue, worker: int, interval: float):
+    """Periodically ship this worker's drained stats to the coordinator"""
+    while True:
+        await asyncio.sleep(interval)
+        queue.put({"worker": worker, "final": False, "stats": stats.drain()})
+
+
+async def run_worker(worker: int, users: int, first_index: int, rates: Dict[str, float], duration: float, api_base: str,
+                     credentials: Dict[str, str], course_id: str, quiz_id: str, max_in_flight: int,
+                     miss_tolerance: float, report_interval: float, user_factory, quiz_accounts, queue):
+    stats = OpenLoopStats(rates, miss_tolerance) if rates else LoadStats()
+    streamer = asyncio.create_task(stream_deltas(stats, queue, worker, report_interval))
+    try:
+        if rates:
+            await run_open_loop_schedules(rates, duration, api_base, credentials, course_id, quiz_id,
+                                          max_in_flight, miss_tolerance, stats, quiz_accounts)
+        else:
+            await run_virtual_users(users, duration, api_base, credentials, course_id, quiz_id, stats,
+                                    first_index=first_index, user_factory=user_factory)
+    finally:
+        streamer.cancel()
+    queue.put({"worker": worker, "final": True, "elapsed": stats.elapsed, "stats": stats.drain()})
+
+
+def worker_main(worker: int, *args):
+    """Process entry point: one event loop driving this worker's share of the load"""
+    queue = args[-1]
+    try:
+        asyncio.run(run_worker(worker, *args))
+    except Exception as e:
+        queue.put({"worker": worker, "final": True, "elapsed": 0.0, "error": str(e)})
+
+
+def split_evenly(total: int, parts: int) -> List[int]:
+    return [total // parts + (1 if index < total % parts else 0) for index in range(parts)]
+
+
+def run_multiprocess(processes: int, users: int, duration: float, api_base: str, credentials: Dict[str, str],
+                     course_id: str, quiz_id: str, rates: Optional[Dict[str, float]] = None,
+                     max_in_flight: int = 1000, miss_tolerance_ms: float = 5.0,
+                     report_interval: float = 5.0,
+                     user_factory: Callable[..., VirtualUser] = VirtualUser,
+                     quiz_accounts: Optional[List[Dict[str, Any]]] = None) -> LoadStats:
+    """Spread virtual users (or open-loop rates) over `processes` cores and merge their histograms"""
+    if aiohttp is None:
+        raise RuntimeError("Load mode requires aiohttp: pip install aiohttp")
+
+    rates = rates or {}
+    miss_tolerance = miss_tolerance_ms / 1000.0
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+
+    if rates:
+        shares = [0] * processes
+        worker_rates = {operation: rate / processes for operation, rate in rates.items()}
+        log(f"Starting multi-process open-loop test: {processes} processes for {duration:.0f}s against {api_base}")
+    else:
+        shares = split_evenly(users, processes)
+        worker_rates = {}
+        log(f"Starting multi-process load test: {users} virtual users over {processes} processes "
+            f"for {duration:.0f}s against {api_base}")
+
+    workers = [
+        context.Process(
+            target=worker_main,
+            args=(index, share, sum(shares[:index]), worker_rates, duration, api_base, credentials,
+                  course_id, quiz_id, max(max_in_flight // processes, 1), miss_tolerance, report_interval,
+                  # Each process gets its own quiz accounts so processes never race on one attempt
+                  user_factory, (quiz_accounts or [])[index::processes], queue),
+            daemon=True,
+        )
+        for index, share in enumerate(shares)
+        if share > 0 or worker_rates
+    ]
+    for process in workers:
+        process.start()
+
+    stats = OpenLoopStats(rates, miss_tolerance) if rates else LoadStats()
+    finished, elapsed = set(), [0.0]
+    while len(finished) < len(workers):
+        try:
+            message = queue.get(timeout=1.0)
+        except Empty:
+            if not any(process.is_alive() for process in workers):
+                log(f"❌ {len(workers) - len(finished)} worker(s) exited without reporting", "ERROR")
+                stats.failed_workers += len(workers) - len(finished)
+                break
+            continue
+
+        if "error" in message:
+            log(f"❌ Worker {message['worker']} failed: {message['error']}", "ERROR")
+            stats.failed_workers += 1
+        else:
+            stats.absorb(message["stats"])
+        if message["final"]:
+            finished.add(message["worker"])
+            elapsed.append(message["elapsed"])
+        else:
+            log(f"⏱  {stats.total_requests} requests so far from {len(workers)} workers")
+
+    for process in workers:
+        process.join(timeout=5)
+    stats.finished_at = stats.started_at + max(elapsed)
+    stats.print_report(users)
+    return stats
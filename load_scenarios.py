@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Load Scenarios
+Weighted user journeys composed from the API calls exercised by APITester,
+loaded from a declarative JSON scenario file
+"""
+
+import asyncio
+import json
+import os
+import random
+import string
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from load_driver import LoadStats, VirtualUser, first_option_answers
+from perf_metrics import endpoint_label
+
+
+def random_lesson(progress: Dict[str, Any]) -> Optional[str]:
+    lesson_ids = [
+        lesson["id"]
+        for module in (progress or {}).get("modules", [])
+        for lesson in module.get("lessons", [])
+    ]
+    return random.choice(lesson_ids) if lesson_ids else None
+
+
+class ScenarioCall:
+    """One API call a journey step can name, with its body and context extraction"""
+
+    def __init__(self, method: str, path: str, body: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 accepted: Tuple[int, ...] = (200,),
+                 extract: Optional[Callable[[Any], Dict[str, Any]]] = None, requires: Tuple[str, ...] = ()):
+        self.method = method
+        self.path = path
+        self.body = body
+        self.accepted = accepted
+        self.extract = extract
+        self.needs = {name for _, name, _, _ in string.Formatter().parse(path) if name} | set(requires)
+
+
+# Call name -> the request it issues; `{name}` path placeholders come from scenario data or earlier steps
+SCENARIO_CALLS: Dict[str, ScenarioCall] = {
+    "courses": ScenarioCall("GET", "/courses"),
+    "courses-featured": ScenarioCall("GET", "/courses?featured=true"),
+    "course": ScenarioCall("GET", "/courses/{course_id}"),
+    "modules": ScenarioCall("GET", "/modules/{course_id}"),
+    "course-quizzes": ScenarioCall("GET", "/quizzes/course/{course_id}"),
+    "public-realtime": ScenarioCall("GET", "/public/realtime"),
+    "my-enrollments": ScenarioCall("GET", "/enrollments/my-enrollments"),
+    "enroll": ScenarioCall(
+        "POST", "/enrollments",
+        body=lambda ctx: {"courseId": ctx["course_id"], "paymentData": {"method": "free", "amount": 0}},
+        accepted=(201, 400),  # 400 once the pooled user is already enrolled
+    ),
+    "create-payment": ScenarioCall(
+        "POST", "/payments",
+        body=lambda ctx: {"courseId": ctx["course_id"], "amount": ctx.get("amount", 999)},
+        accepted=(201,),
+    ),
+    "my-payments": ScenarioCall("GET", "/payments/my-payments"),
+    "learning-progress": ScenarioCall(
+        "GET", "/learning-progress/{course_id}",
+        extract=lambda data: {"lesson_id": random_lesson(data)},
+    ),
+    "lesson-heartbeat": ScenarioCall(
+        "PUT", "/learning-progress/lesson/{lesson_id}",
+        body=lambda ctx: {
+            "progressPercentage": min(ctx["repeat_index"] * 5, 95),
+            "timeSpentMinutes": 1,
+            "lastPosition": ctx["repeat_index"] * 15,
+            "status": "in_progress",
+        },
+    ),
+    "quiz-start": ScenarioCall(
+        "POST", "/quizzes/{quiz_id}/start",
+        accepted=(200, 201, 400),  # 400 once the pooled user hits maxAttempts
+        extract=lambda data: {"attempt_id": ((data or {}).get("attempt") or {}).get("id")},
+    ),
+    "quiz-get": ScenarioCall(
+        "GET", "/quizzes/{quiz_id}",
+        extract=lambda data: {"answers": first_option_answers(data)},
+    ),
+    "quiz-submit": ScenarioCall(
+        "POST", "/quizzes/{quiz_id}/submit",
+        body=lambda ctx: {"attemptId": ctx["attempt_id"], "answers": ctx.get("answers", {}), "timeSpentSeconds": 300},
+        requires=("attempt_id",),
+    ),
+    # Signs in again with the virtual user's own password, costing the server one bcrypt comparison
+    "login": ScenarioCall(
+        "POST", "/auth/login",
+        body=lambda ctx: {"email": ctx["email"], "password": ctx["password"]},
+        requires=("email", "password"),
+    ),
+}
+
+# Context keys a step can depend on that an earlier call extracts instead of scenario data
+EXTRACTED_PLACEHOLDERS = {"lesson_id", "attempt_id"}
+# Context keys filled from the virtual user's credentials
+CREDENTIAL_PLACEHOLDERS = {"email", "password"}
+
+
+def think_range(value: Any) -> Tuple[float, float]:
+    """Accept a think time as seconds or a [min, max] range"""
+    if isinstance(value, (int, float)):
+        return float(value), float(value)
+    low, high = value
+    return float(low), float(high)
+
+
+def load_scenario(path: str, default_credentials: Dict[str, str], default_data: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Read and validate a scenario file, resolving its user pool and data lists"""
+    with open(path, encoding="utf-8") as handle:
+        scenario = json.load(handle)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    users = scenario.get("users")
+    if "usersFile" in scenario:
+        with open(os.path.join(base_dir, scenario["usersFile"]), encoding="utf-8") as handle:
+            users = json.load(handle)
+    manifest_data = {}
+    if isinstance(users, dict):  # a seed_fixtures.py manifest: its users, courses and quizzes
+        manifest_data = {
+            "course_id": [course["id"] for course in users.get("courses", [])],
+            "quiz_id": [quiz["id"] for course in users.get("courses", []) for quiz in course["quizzes"]],
+        }
+        users = users.get("users")
+    scenario["users"] = users or [default_credentials]
+
+    data = {key: list(values) for key, values in default_data.items() if values}
+    data.update({key: values for key, values in manifest_data.items() if values})
+    data.update({key: list(values) for key, values in scenario.get("data", {}).items() if values})
+    scenario["data"] = data
+
+    journeys = scenario.get("journeys") or []
+    if not journeys:
+        raise ValueError(f"Scenario {path} defines no journeys")
+    for journey in journeys:
+        if journey.get("weight", 0) <= 0:
+            raise ValueError(f"Journey '{journey.get('name')}' needs a positive weight")
+        extracted = set()
+        for step in journey.get("steps", []):
+            call = SCENARIO_CALLS.get(step.get("call"))
+            if call is None:
+                raise ValueError(f"Journey '{journey['name']}' uses unknown call '{step.get('call')}'; "
+                                 f"choose from {', '.join(SCENARIO_CALLS)}")
+            missing = call.needs - set(data) - extracted - CREDENTIAL_PLACEHOLDERS
+            if missing:
+                raise ValueError(f"Journey '{journey['name']}' step '{step['call']}' needs "
+                                 f"{', '.join(sorted(missing))} from scenario data or an earlier step")
+            if call.extract:
+                extracted |= EXTRACTED_PLACEHOLDERS
+            think_range(step.get("think", journey.get("thinkTime", scenario.get("thinkTime", 0))))
+    return scenario
+
+
+class ScenarioUser(VirtualUser):
+    """Virtual user that repeatedly runs a weighted random journey from a scenario"""
+
+    def __init__(self, scenario: Dict[str, Any], index: int, api_base: str, credentials: Dict[str, str],
+                 course_id: str, quiz_id: str, stats: LoadStats):
+        pool = scenario["users"]
+        super().__init__(index, api_base, dict(pool[index % len(pool)]), course_id, quiz_id, stats)
+        self.scenario = scenario
+        self.journeys = scenario["journeys"]
+        self.weights = [journey["weight"] for journey in self.journeys]
+        self.deadline = float("inf")
+
+    async def think(self, value: Any):
+        low, high = think_range(value)
+        delay = min(random.uniform(low, high), max(self.deadline - time.perf_counter(), 0))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def run_step(self, call: ScenarioCall, ctx: Dict[str, Any]) -> bool:
+        if any(ctx.get(name) is None for name in call.needs):
+            return False
+        path = call.path.format(**ctx)
+        kwargs = {"json": call.body(ctx)} if call.body else {}
+        status, data = await self.request(call.method, path, endpoint_label(call.method, f"{self.api_base}{path}"),
+                                          expected=call.accepted, **kwargs)
+        if call.extract and status in call.accepted:
+            ctx.update(call.extract(data))
+        return status in call.accepted
+
+    async def run_journey(self):
+        journey = random.choices(self.journeys, weights=self.weights)[0]
+        ctx: Dict[str, Any] = {key: random.choice(values) for key, values in self.scenario["data"].items()}
+        # Pooled accounts may carry only a token, in which case login steps are skipped
+        ctx.update({key: self.credentials.get(key) for key in CREDENTIAL_PLACEHOLDERS})
+        default_think = journey.get("thinkTime", self.scenario.get("thinkTime", 0))
+
+        started = time.perf_counter()
+        for step in journey.get("steps", []):
+            call = SCENARIO_CALLS[step["call"]]
+            for repeat_index in range(step.get("repeat", 1)):
+                if time.perf_counter() >= self.deadline:
+                    return
+                ctx["repeat_index"] = repeat_index
+                if not await self.run_step(call, ctx):
+                    break
+                await self.think(step.get("think", default_think))
+        self.stats.journeys.record(journey["name"], time.perf_counter() - started)
+
+    async def run(self, deadline: float):
+        self.deadline = deadline
+        await super().run(deadline)
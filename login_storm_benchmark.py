@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Login Storm Benchmark
+Measures GET /api/courses latency at a fixed arrival rate, first on its own
+and then while password logins arrive at the same time, and checks that the
+bcrypt work of the storm does not stall the catalog
+"""
+
+import argparse
+import sys
+from typing import Any, Dict
+
+import requests
+
+from backend_test import API_BASE, EXISTING_COURSE_ID, EXISTING_QUIZ_ID, TEST_USER_CREDENTIALS
+from load_driver import aiohttp, log, run_open_loop
+
+# Storm p95 for GET /api/courses may exceed the quiet p95 by this factor, or by MIN_SLOWDOWN_MS, and still pass
+SLOWDOWN_TOLERANCE = 2.0
+MIN_SLOWDOWN_MS = 20.0
+
+
+def hashing_stats(api_base: str) -> Dict[str, Any]:
+    """Password hashing pool counters reported by /api/health"""
+    response = requests.get(f"{api_base}/health")
+    response.raise_for_status()
+    return response.json().get("passwordHashing") or {}
+
+
+def phase(args, rates: Dict[str, float]) -> Dict[str, Any]:
+    before = hashing_stats(args.api_base)
+    stats = run_open_loop(rates, args.duration, args.api_base, dict(TEST_USER_CREDENTIALS), args.course_id,
+                          EXISTING_QUIZ_ID, args.max_in_flight)
+    after = hashing_stats(args.api_base)
+    summary = stats.summary()
+    return {
+        "courses": summary.get("courses", {}),
+        "login": summary.get("login", {}),
+        "maxQueueDepth": after.get("maxQueueDepth", 0),
+        "rejected": after.get("rejected", 0) - before.get("rejected", 0),
+        "avgWaitMs": after.get("avgWaitMs", 0.0),
+    }
+
+
+def print_report(quiet: Dict[str, Any], storm: Dict[str, Any], login_rate: float) -> bool:
+    log("\n" + "=" * 96)
+    log("GET /api/courses LATENCY, QUIET VS DURING A LOGIN STORM")
+    log("=" * 96)
+    log(f"{'Phase':<10} {'RPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Errors':>7} "
+        f"{'Logins/s':>9} {'Login p95':>10} {'Shed':>6}")
+    for name, run in (("quiet", quiet), ("storm", storm)):
+        courses, login = run["courses"], run["login"]
+        log(f"{name:<10} {courses.get('rps', 0):>8.1f} {courses.get('p50_ms', 0):>8.1f} "
+            f"{courses.get('p95_ms', 0):>8.1f} {courses.get('p99_ms', 0):>8.1f} {courses.get('errors', 0):>7} "
+            f"{login.get('rps', 0):>9.1f} {login.get('p95_ms', 0):>10.1f} {run['rejected']:>6}")
+
+    log(f"\n🔐 Password hashing: queue peaked at {storm['maxQueueDepth']}, average wait "
+        f"{storm['avgWaitMs']:.1f} ms, {storm['rejected']} login(s) shed with 503")
+    quiet_p95, storm_p95 = quiet["courses"].get("p95_ms", 0.0), storm["courses"].get("p95_ms", 0.0)
+    budget = max(quiet_p95 * SLOWDOWN_TOLERANCE, quiet_p95 + MIN_SLOWDOWN_MS)
+    held = storm_p95 <= budget and not storm["courses"].get("errors", 0)
+    log(f"{'✅' if held else '❌'} GET /api/courses p95 {quiet_p95:.1f} ms quiet vs {storm_p95:.1f} ms "
+        f"with {login_rate:g} logins/s (budget {budget:.1f} ms)")
+    return held
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Login Storm Benchmark")
+    parser.add_argument("--courses-rate", type=float, default=20.0,
+                        help="GET /api/courses requests per second in both phases (default: 20)")
+    parser.add_argument("--login-rate", type=float, default=40.0,
+                        help="password logins per second during the storm (default: 40)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per phase (default: 30)")
+    parser.add_argument("--max-in-flight", type=int, default=1000,
+                        help="cap on concurrent requests (default: 1000)")
+    parser.add_argument("--course-id", default=EXISTING_COURSE_ID)
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The login storm benchmark requires aiohttp: pip install aiohttp")
+    quiet = phase(args, {"courses": args.courses_rate})
+    storm = phase(args, {"courses": args.courses_rate, "login": args.login_rate})
+    return print_report(quiet, storm, args.login_rate)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend OTP Rate-Limit Soak Test
+Sends forgot-password requests for a long run of distinct email addresses while
+sampling the server's RSS from the admin-only /api/admin/health, and checks that
+memory stays flat once the bounded OTP counter store is full instead of growing
+with every address, and that the flood never evicts the API limit's counters
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+import requests
+
+from backend_test import ADMIN_CREDENTIALS, API_BASE
+from load_driver import aiohttp, log, parse_json, send
+
+
+def server_memory(health: Dict[str, Any]) -> Dict[str, Any]:
+    limits = (health.get("sharedState") or {}).get("limits") or {}
+    otp = limits.get("otp") or {}
+    return {
+        "rss": (health.get("memory") or {}).get("rss", 0),
+        "heapUsed": (health.get("memory") or {}).get("heapUsed", 0),
+        "keys": otp.get("keys", 0),
+        "maxEntries": otp.get("maxEntries"),
+        "evicted": otp.get("evicted", 0),
+        "expired": otp.get("expired", 0),
+        "apiEvicted": (limits.get("api") or {}).get("evicted", 0),
+    }
+
+
+def admin_headers(api_base: str) -> Dict[str, str]:
+    response = requests.post(f"{api_base}/auth/login", json=ADMIN_CREDENTIALS)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+async def soak(args, admin: Dict[str, str]) -> Dict[str, Any]:
+    run_id = uuid.uuid4().hex[:8]
+    url = f"{args.api_base}/auth/forgot-password"
+    step = max(args.emails // args.samples, 1)
+    statuses: Dict[int, int] = {}
+    samples: List[Dict[str, Any]] = []
+    next_index = 0
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.concurrency)) as http:
+        async def sample(sent: int):
+            _, body = await send(http, "GET", f"{args.api_base}/admin/health", admin)
+            samples.append({"sent": sent, **server_memory(parse_json(body) or {})})
+            last = samples[-1]
+            log(f"   {sent:>9} sent: RSS {last['rss'] / 1048576:.1f} MB, {last['keys']} counters, "
+                f"{last['evicted']} evicted")
+
+        async def client():
+            nonlocal next_index
+            while next_index < args.emails:
+                index = next_index
+                next_index += 1
+                try:
+                    status, _ = await send(http, "POST", url, {},
+                                           json={"email": f"soak-{run_id}-{index}@example.com"})
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    status = 0
+                statuses[status] = statuses.get(status, 0) + 1
+                if (index + 1) % step == 0:
+                    await sample(index + 1)
+
+        await sample(0)
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    samples.sort(key=lambda row: row["sent"])
+    return {"samples": samples, "statuses": statuses, "elapsed": elapsed}
+
+
+def print_report(result: Dict[str, Any], emails: int, warmup: float, tolerance: float) -> bool:
+    samples, statuses = result["samples"], result["statuses"]
+    log("\n" + "=" * 80)
+    log(f"SERVER MEMORY OVER {emails} DISTINCT FORGOT-PASSWORD EMAILS "
+        f"({emails / result['elapsed']:.0f} req/s)")
+    log("=" * 80)
+    log(f"{'Sent':>10} {'RSS MB':>9} {'Heap MB':>9} {'Counters':>10} {'Evicted':>10} {'Expired':>10}")
+    for row in samples:
+        log(f"{row['sent']:>10} {row['rss'] / 1048576:>9.1f} {row['heapUsed'] / 1048576:>9.1f} "
+            f"{row['keys']:>10} {row['evicted']:>10} {row['expired']:>10}")
+
+    ok = statuses.get(200, 0)
+    log(f"\n📊 Responses: {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))}")
+    if ok < emails * 0.99:
+        log("❌ Too many requests were refused or failed; raise API_RATE_LIMIT_MAX on the server so every "
+            "request reaches the OTP limit", "ERROR")
+        return False
+
+    # Compare against the first sample after warm-up, once the store has had time to fill
+    settled = [row for row in samples if row["sent"] >= emails * warmup]
+    baseline, peak = settled[0]["rss"], max(row["rss"] for row in settled)
+    if not baseline:
+        log("❌ Server does not report memory.rss on /api/admin/health", "ERROR")
+        return False
+    flat = peak <= baseline * (1 + tolerance)
+    log(f"{'✅' if flat else '❌'} RSS after warm-up: {baseline / 1048576:.1f} MB → peak {peak / 1048576:.1f} MB "
+        f"({(peak / baseline - 1) * 100:+.1f}%, tolerance {tolerance * 100:.0f}%)")
+
+    cap = samples[-1]["maxEntries"]
+    bounded = cap is None or all(row["keys"] <= cap for row in samples)
+    log(f"{'✅' if bounded else '❌'} OTP counters peaked at {max(row['keys'] for row in samples)}"
+        + (f" of {cap}" if cap is not None else " (server store has no entry cap)"))
+
+    # The OTP flood fills its own store; the per-IP API counters must survive it
+    api_kept = samples[-1]["apiEvicted"] == samples[0]["apiEvicted"]
+    log(f"{'✅' if api_kept else '❌'} API limit counters evicted during the soak: "
+        f"{samples[-1]['apiEvicted'] - samples[0]['apiEvicted']}")
+    return flat and bounded and api_kept
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend OTP Rate-Limit Soak Test")
+    parser.add_argument("--emails", type=int, default=1_000_000,
+                        help="distinct email addresses to request OTPs for (default: 1000000)")
+    parser.add_argument("--concurrency", type=int, default=64, help="requests in flight (default: 64)")
+    parser.add_argument("--samples", type=int, default=20, help="RSS samples over the soak (default: 20)")
+    parser.add_argument("--warmup", type=float, default=0.2,
+                        help="fraction of the soak before RSS is expected to be flat (default: 0.2)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="RSS growth allowed after warm-up (default: 0.25 = 25%%)")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The OTP soak test requires aiohttp: pip install aiohttp")
+    admin = admin_headers(args.api_base)
+    health = requests.get(f"{args.api_base}/admin/health", headers=admin).json()
+    if (health.get("cluster") or {}).get("workers", 1) > 1:
+        log("⚠️ The server runs several workers; /api/admin/health reports the RSS of whichever worker answers",
+            "ERROR")
+    if (health.get("sharedState") or {}).get("store", "memory") != "memory":
+        log("⚠️ Counters are kept in the database store, so server RSS does not depend on them", "ERROR")
+
+    log(f"🌊 Requesting OTPs for {args.emails} distinct addresses at concurrency {args.concurrency}")
+    result = asyncio.run(soak(args, admin))
+    return print_report(result, args.emails, args.warmup, args.tolerance)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
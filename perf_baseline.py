@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Performance Baselines
+Saves per-endpoint latency/throughput baselines and gates later runs
+on statistically significant p95 regressions
+"""
+
+import argparse
+import json
+import math
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from perf_metrics import MetricsRecorder
+
+BASELINE_VERSION = 1
+
+# Endpoint -> metric -> value for one run of a suite
+RunSample = Dict[str, Dict[str, float]]
+
+
+def add_baseline_arguments(parser: argparse.ArgumentParser):
+    """Register the shared --repeat/--save-baseline/--compare-baseline options"""
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run the suite N times and treat each run as one baseline sample")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="write per-endpoint p50/p95/throughput samples to PATH")
+    parser.add_argument("--compare-baseline", metavar="PATH",
+                        help="compare this run against the baseline at PATH and fail on p95 regressions")
+    parser.add_argument("--regression-threshold", type=float, default=0.10,
+                        help="allowed relative p95 increase before failing (default: 0.10 = 10%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="ignore p95 increases smaller than this many milliseconds (default: 2)")
+    parser.add_argument("--alpha", type=float, default=0.05,
+                        help="significance level for the regression test when both sides have 3+ samples")
+
+
+def run_sample(recorder: MetricsRecorder, elapsed_seconds: float) -> RunSample:
+    """Reduce one run's per-endpoint histograms to the figures kept in a baseline"""
+    elapsed = max(elapsed_seconds, 1e-9)
+    return {
+        endpoint: {
+            "p50_ms": row["p50_ms"],
+            "p95_ms": row["p95_ms"],
+            "rps": row["count"] / elapsed,
+        }
+        for endpoint, row in recorder.summary().items()
+    }
+
+
+def save_baseline(path: str, samples: List[RunSample]):
+    endpoints: Dict[str, Dict[str, List[float]]] = {}
+    for sample in samples:
+        for endpoint, values in sample.items():
+            series = endpoints.setdefault(endpoint, {"p50_ms": [], "p95_ms": [], "rps": []})
+            for metric, value in values.items():
+                series[metric].append(round(value, 3))
+
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump({
+            "version": BASELINE_VERSION,
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "runs": len(samples),
+            "endpoints": endpoints,
+        }, handle, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}: {baseline.get('version')}")
+    return baseline
+
+
+def robust_spread(values: List[float]) -> float:
+    """Median absolute deviation scaled to be comparable with a standard deviation"""
+    if len(values) < 2:
+        return 0.0
+    center = statistics.median(values)
+    return 1.4826 * statistics.median(abs(value - center) for value in values)
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """One-sided p-value that `current` tends to be larger than `baseline` (normal approximation)"""
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2.0 + 1
+        ties = end - index + 1
+        tie_term += ties ** 3 - ties
+        index = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u_stat = rank_sum - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z_score = (u_stat - n1 * n2 / 2.0 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z_score / math.sqrt(2))
+
+
+def compare_to_baseline(baseline: Dict[str, Any], samples: List[RunSample], threshold: float,
+                        min_delta_ms: float = 2.0, alpha: float = 0.05) -> List[Dict[str, Any]]:
+    """Compare current run samples to a saved baseline, one row per endpoint present in both"""
+    rows = []
+    for endpoint, series in sorted(baseline["endpoints"].items()):
+        current_p95 = [sample[endpoint]["p95_ms"] for sample in samples if endpoint in sample]
+        current_rps = [sample[endpoint]["rps"] for sample in samples if endpoint in sample]
+        if not current_p95 or not series["p95_ms"]:
+            continue
+
+        base_median = statistics.median(series["p95_ms"])
+        current_median = statistics.median(current_p95)
+        delta = current_median - base_median
+        noise = 2 * max(robust_spread(series["p95_ms"]), robust_spread(current_p95))
+
+        p_value = None
+        if len(current_p95) >= 3 and len(series["p95_ms"]) >= 3:
+            p_value = mann_whitney_greater(current_p95, series["p95_ms"])
+
+        regressed = (
+            current_median > base_median * (1 + threshold)
+            and delta > max(min_delta_ms, noise)
+            and (p_value is None or p_value < alpha)
+        )
+        rows.append({
+            "endpoint": endpoint,
+            "baseline_p95_ms": base_median,
+            "current_p95_ms": current_median,
+            "change": delta / base_median if base_median else 0.0,
+            "baseline_rps": statistics.median(series["rps"]) if series["rps"] else 0.0,
+            "current_rps": statistics.median(current_rps),
+            "p_value": p_value,
+            "regressed": regressed,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], log: Callable[..., None]):
+    log("\n" + "=" * 110)
+    log("BASELINE COMPARISON (median p95 across runs)")
+    log("=" * 110)
+    log(f"{'Endpoint':<48} {'base p95':>9} {'curr p95':>9} {'change':>8} {'base rps':>9} "
+        f"{'curr rps':>9} {'p-value':>8}")
+    for row in rows:
+        marker = "❌" if row["regressed"] else "  "
+        p_value = f"{row['p_value']:.3f}" if row["p_value"] is not None else "-"
+        log(f"{marker}{row['endpoint'][:46]:<46} {row['baseline_p95_ms']:>9.1f} {row['current_p95_ms']:>9.1f} "
+            f"{row['change'] * 100:>7.1f}% {row['baseline_rps']:>9.2f} {row['current_rps']:>9.2f} {p_value:>8}")
+
+
+def apply_baseline_options(args: argparse.Namespace, samples: List[RunSample],
+                           log: Callable[..., None]) -> bool:
+    """Save and/or compare baselines as requested; returns False on a p95 regression"""
+    if args.save_baseline:
+        save_baseline(args.save_baseline, samples)
+        log(f"💾 Baseline with {len(samples)} run(s) saved to {args.save_baseline}")
+
+    if not args.compare_baseline:
+        return True
+
+    rows = compare_to_baseline(load_baseline(args.compare_baseline), samples,
+                               args.regression_threshold, args.min_delta_ms, args.alpha)
+    print_comparison(rows, log)
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        log(f"\n⚠️ {len(regressions)} ENDPOINT(S) REGRESSED past p95 threshold "
+            f"of {args.regression_threshold * 100:.0f}%", "ERROR")
+        return False
+    log("\n🎉 No p95 regressions against baseline")
+    return True
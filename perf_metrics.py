@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Performance Metrics
+Fixed-memory latency histograms and per-endpoint response statistics
+shared by the API test suites and the load driver
+"""
+
+import json
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+# UUID or numeric path segments collapse to {id} so baselines key on the route, not the row
+ID_SEGMENT = re.compile(r"^(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)$")
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Route-style label such as `POST /api/quizzes/{id}/submit` for a request"""
+    segments = ["{id}" if ID_SEGMENT.match(segment) else segment for segment in urlsplit(url).path.split("/")]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies in microseconds.
+
+    Values are bucketed by power of two and then linearly into
+    `2 ** sub_bucket_bits` sub-buckets, so memory is fixed by the value
+    range while every recorded value keeps a relative error below
+    1 / 2 ** (sub_bucket_bits - 1) (under 1.6% with the default of 7).
+    """
+
+    def __init__(self, max_value_us: int = 3_600_000_000, sub_bucket_bits: int = 7):
+        self.max_value_us = max_value_us
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.counts = [0] * (self._index_for(max_value_us) + 1)
+        self.total_count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+
+    def _index_for(self, value_us: int) -> int:
+        bucket = max(value_us.bit_length() - self.sub_bucket_bits, 0)
+        return (bucket << (self.sub_bucket_bits - 1)) + (value_us >> bucket)
+
+    def _highest_value_at(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        bucket = (index >> (self.sub_bucket_bits - 1)) - 1
+        sub_bucket = index - (bucket << (self.sub_bucket_bits - 1))
+        return ((sub_bucket + 1) << bucket) - 1
+
+    def record(self, seconds: float, count: int = 1):
+        value_us = min(max(int(seconds * 1_000_000), 0), self.max_value_us)
+        self.counts[self._index_for(value_us)] += count
+        self.total_count += count
+        self.total_us += value_us * count
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = value_us if self.max_us is None else max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's counts into this one (lossless for equal layouts)"""
+        if (other.sub_bucket_bits, other.max_value_us) != (self.sub_bucket_bits, self.max_value_us):
+            raise ValueError("Cannot merge histograms with different layouts")
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total_count += other.total_count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        if other.max_us is not None:
+            self.max_us = other.max_us if self.max_us is None else max(self.max_us, other.max_us)
+
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds at the given percentile (0-100)"""
+        if self.total_count == 0:
+            return 0.0
+        target = max(int(pct / 100.0 * self.total_count + 0.999999), 1)
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(self._highest_value_at(index), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total_us / self.total_count / 1_000_000 if self.total_count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse JSON-safe form, suitable for export and for shipping between processes"""
+        return {
+            "maxValueUs": self.max_value_us,
+            "subBucketBits": self.sub_bucket_bits,
+            "totalCount": self.total_count,
+            "totalUs": self.total_us,
+            "minUs": self.min_us,
+            "maxUs": self.max_us,
+            "counts": {str(index): count for index, count in enumerate(self.counts) if count},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls(data["maxValueUs"], data["subBucketBits"])
+        for index, count in data["counts"].items():
+            histogram.counts[int(index)] = count
+        histogram.total_count = data["totalCount"]
+        histogram.total_us = data["totalUs"]
+        histogram.min_us = data["minUs"]
+        histogram.max_us = data["maxUs"]
+        return histogram
+
+
+class EndpointMetrics:
+    """Latency histogram plus response byte counts for one endpoint or test name"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.bytes_total = 0
+        self.bytes_max = 0
+
+    def record(self, seconds: float, nbytes: int = 0):
+        self.histogram.record(seconds)
+        self.bytes_total += nbytes
+        self.bytes_max = max(self.bytes_max, nbytes)
+
+    def merge(self, other: "EndpointMetrics"):
+        self.histogram.merge(other.histogram)
+        self.bytes_total += other.bytes_total
+        self.bytes_max = max(self.bytes_max, other.bytes_max)
+
+    @property
+    def count(self) -> int:
+        return self.histogram.total_count
+
+    def summary(self) -> Dict[str, Any]:
+        histogram = self.histogram
+        return {
+            "count": self.count,
+            "mean_ms": histogram.mean * 1000,
+            "p50_ms": histogram.percentile(50) * 1000,
+            "p90_ms": histogram.percentile(90) * 1000,
+            "p95_ms": histogram.percentile(95) * 1000,
+            "p99_ms": histogram.percentile(99) * 1000,
+            "max_ms": (histogram.max_us or 0) / 1000,
+            "bytes_total": self.bytes_total,
+            "bytes_mean": self.bytes_total / self.count if self.count else 0,
+            "bytes_max": self.bytes_max,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.summary(),
+            "histogram": self.histogram.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EndpointMetrics":
+        metrics = cls()
+        metrics.histogram = LatencyHistogram.from_dict(data["histogram"])
+        metrics.bytes_total = data.get("bytes_total", 0)
+        metrics.bytes_max = data.get("bytes_max", 0)
+        return metrics
+
+
+class MetricsRecorder:
+    """Collection of EndpointMetrics keyed by test name or endpoint label"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+
+    def record(self, name: str, seconds: float, nbytes: int = 0):
+        self.endpoints.setdefault(name, EndpointMetrics()).record(seconds, nbytes)
+
+    def record_response(self, name: str, response):
+        """Record a requests.Response using its server round-trip time and body size"""
+        self.record(name, response.elapsed.total_seconds(), len(response.content or b""))
+
+    def record_endpoint(self, response):
+        """Record a requests.Response under its route label rather than a test name"""
+        self.record_response(endpoint_label(response.request.method, response.request.url), response)
+
+    def merge(self, other: "MetricsRecorder"):
+        for name, metrics in other.endpoints.items():
+            self.endpoints.setdefault(name, EndpointMetrics()).merge(metrics)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: metrics.summary() for name, metrics in sorted(self.endpoints.items())}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "generatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "endpoints": {name: metrics.to_dict() for name, metrics in sorted(self.endpoints.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MetricsRecorder":
+        recorder = cls()
+        for name, metrics in data.get("endpoints", {}).items():
+            recorder.endpoints[name] = EndpointMetrics.from_dict(metrics)
+        return recorder
+
+    def export_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, indent=2)
+
+    def print_table(self, log: Callable[[str], None], title: str = "LATENCY PERCENTILES"):
+        """Print a percentile table through the caller's log function"""
+        if not self.endpoints:
+            return
+        log("\n" + "=" * 110)
+        log(title)
+        log("=" * 110)
+        log(f"{'Test':<48} {'Count':>6} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'max ms':>8} {'avg bytes':>10}")
+        for name, row in self.summary().items():
+            log(f"{name[:48]:<48} {row['count']:>6} {row['p50_ms']:>8.1f} {row['p90_ms']:>8.1f} "
+                f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} {row['bytes_mean']:>10.0f}")
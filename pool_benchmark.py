@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Connection Pool Benchmark
+Measures GET /api/learning-progress/:courseId throughput at several client
+concurrencies and compares the results across database pool sizes
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import requests
+
+from backend_test import API_BASE, EXISTING_COURSE_ID, TEST_USER_CREDENTIALS
+from load_driver import LoadStats, aiohttp, log, send
+
+MATRIX_VERSION = 1
+ENDPOINT = "GET /api/learning-progress/{id}"
+
+
+def pool_stats(api_base: str) -> Dict[str, Any]:
+    """Database pool figures reported by /api/health"""
+    response = requests.get(f"{api_base}/health")
+    response.raise_for_status()
+    return response.json().get("db") or {}
+
+
+def login(api_base: str, credentials: Dict[str, str]) -> str:
+    response = requests.post(f"{api_base}/auth/login", json=credentials)
+    token = response.json().get("token") if response.status_code == 200 else None
+    if not token:
+        raise RuntimeError(f"Login failed for {credentials['email']}: {response.status_code}")
+    return token
+
+
+async def closed_loop(api_base: str, token: str, course_id: str, concurrency: int, duration: float) -> LoadStats:
+    """`concurrency` workers issuing back-to-back requests over one shared connection pool"""
+    stats = LoadStats()
+    url = f"{api_base}/learning-progress/{course_id}"
+    headers = {"Authorization": f"Bearer {token}"}
+    connector = aiohttp.TCPConnector(limit=concurrency)
+
+    async def worker(http: "aiohttp.ClientSession", deadline: float):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status, body = await send(http, "GET", url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status, body = 0, b""
+            stats.record(ENDPOINT, time.perf_counter() - start, status == 200, len(body))
+
+    async with aiohttp.ClientSession(connector=connector) as http:
+        stats.started_at = time.perf_counter()
+        deadline = stats.started_at + duration
+        await asyncio.gather(*(worker(http, deadline) for _ in range(concurrency)))
+        stats.finished_at = time.perf_counter()
+    return stats
+
+
+def load_matrix(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"version": MATRIX_VERSION, "runs": []}
+    with open(path, encoding="utf-8") as handle:
+        matrix = json.load(handle)
+    if matrix.get("version") != MATRIX_VERSION:
+        raise ValueError(f"Unsupported pool matrix version in {path}: {matrix.get('version')}")
+    return matrix
+
+
+def measure(args) -> Dict[str, Any]:
+    before = pool_stats(args.api_base)
+    pool_size = args.pool_size or before.get("connectionLimit")
+    if not pool_size:
+        raise RuntimeError("Server did not report its pool size on /api/health; pass --pool-size")
+
+    token = login(args.api_base, TEST_USER_CREDENTIALS)
+    log(f"🔌 Pool size {pool_size}: measuring {ENDPOINT} at concurrency {', '.join(map(str, args.concurrency))}")
+    levels = {}
+    for concurrency in args.concurrency:
+        stats = asyncio.run(closed_loop(args.api_base, token, args.course_id, concurrency, args.duration))
+        row = stats.summary().get(ENDPOINT, {})
+        levels[str(concurrency)] = {
+            "rps": row.get("rps", 0.0) - row.get("errors", 0) / stats.elapsed,
+            "p50_ms": row.get("p50_ms", 0.0),
+            "p95_ms": row.get("p95_ms", 0.0),
+            "errors": row.get("errors", 0),
+        }
+        log(f"   concurrency {concurrency:>4}: {levels[str(concurrency)]['rps']:>8.1f} ok req/s, "
+            f"p95 {row.get('p95_ms', 0.0):.1f} ms, {row.get('errors', 0)} errors")
+
+    after = pool_stats(args.api_base)
+    return {
+        "poolSize": pool_size,
+        "measuredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "levels": levels,
+        "pool": {
+            "acquireTimeouts": after.get("acquireTimeouts", 0) - before.get("acquireTimeouts", 0),
+            "queueRejections": after.get("queueRejections", 0) - before.get("queueRejections", 0),
+            "maxWaitMs": after.get("maxWaitMs", 0),
+            "totalConnections": after.get("totalConnections", 0),
+        },
+    }
+
+
+def print_report(matrix: Dict[str, Any], min_gain: float) -> bool:
+    """Throughput per pool size and concurrency; returns False if a larger pool is not faster"""
+    runs = sorted(matrix["runs"], key=lambda run: run["poolSize"])
+    levels = sorted({int(level) for run in runs for level in run["levels"]})
+    log("\n" + "=" * 96)
+    log(f"POOL SIZE SCALING ({ENDPOINT}, successful req/s)")
+    log("=" * 96)
+    log(f"{'Pool size':<12} " + " ".join(f"{'c=' + str(level):>10}" for level in levels)
+        + f" {'timeouts':>9} {'rejected':>9} {'max wait':>9}")
+    for run in runs:
+        cells = " ".join(
+            f"{run['levels'][str(level)]['rps']:>10.1f}" if str(level) in run["levels"] else f"{'-':>10}"
+            for level in levels
+        )
+        pool = run.get("pool", {})
+        log(f"{run['poolSize']:<12} {cells} {pool.get('acquireTimeouts', 0):>9} "
+            f"{pool.get('queueRejections', 0):>9} {pool.get('maxWaitMs', 0):>8.0f}ms")
+
+    if len(runs) < 2:
+        log("\nℹ️ Restart the server with another DB_POOL_SIZE and rerun to compare pool sizes")
+        return True
+
+    # Compare at the highest concurrency both runs measured, where pooling matters most
+    regressions = []
+    for smaller, larger in zip(runs, runs[1:]):
+        shared = sorted(set(smaller["levels"]) & set(larger["levels"]), key=int)
+        if not shared:
+            continue
+        level = shared[-1]
+        before, after = smaller["levels"][level]["rps"], larger["levels"][level]["rps"]
+        gain = after / before - 1 if before else 0.0
+        log(f"{'📈' if gain >= min_gain else '⚠️'} pool {smaller['poolSize']} → {larger['poolSize']} "
+            f"at c={level}: {before:.1f} → {after:.1f} req/s ({gain * 100:+.1f}%)")
+        if gain < min_gain:
+            regressions.append(level)
+    return not regressions
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Connection Pool Benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64],
+                        help="client concurrency levels to measure (default: 1 4 16 64)")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per concurrency level (default: 15)")
+    parser.add_argument("--pool-size", type=int,
+                        help="label for this run; defaults to connectionLimit reported by /api/health")
+    parser.add_argument("--matrix", default="pool-matrix.json",
+                        help="JSON file accumulating one run per pool size (default: pool-matrix.json)")
+    parser.add_argument("--min-gain", type=float, default=0.10,
+                        help="throughput gain expected from each larger pool size (default: 0.10 = 10%%)")
+    parser.add_argument("--report", action="store_true", help="only print the report for an existing --matrix")
+    parser.add_argument("--course-id", default=EXISTING_COURSE_ID)
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The pool benchmark requires aiohttp: pip install aiohttp")
+    matrix = load_matrix(args.matrix)
+
+    if not args.report:
+        run = measure(args)
+        matrix["runs"] = [existing for existing in matrix["runs"] if existing["poolSize"] != run["poolSize"]] + [run]
+        with open(args.matrix, "w", encoding="utf-8") as handle:
+            json.dump(matrix, handle, indent=2)
+        log(f"💾 Pool matrix saved to {args.matrix}")
+    return print_report(matrix, args.min_gain)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Data-Size Scaling Benchmark
+Measures the read endpoints at several seeded data sizes and fits each
+endpoint's latency growth to a complexity curve
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from perf_metrics import MetricsRecorder
+from seed_fixtures import ADMIN_CREDENTIALS, API_BASE, PRESETS, load_manifest, seed
+
+MATRIX_VERSION = 1
+
+# Candidate growth curves, simplest first; ties within MODEL_TOLERANCE go to the simpler curve
+MODELS: List[Tuple[str, Callable[[float], float]]] = [
+    ("O(1)", lambda n: 0.0),
+    ("O(log n)", lambda n: math.log(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log(n)),
+    ("O(n^2)", lambda n: n * n),
+]
+LINEAR_OR_WORSE = {"O(n)", "O(n log n)", "O(n^2)", "O(n)+"}
+MODEL_TOLERANCE = 0.10
+# Latency that moves less than this across all sizes is treated as flat rather than fitted
+MIN_GROWTH_MS = 1.0
+
+
+def log(message: str, level: str = "INFO"):
+    """Log benchmark messages"""
+    print(f"[{level}] {message}")
+
+
+def login(session: requests.Session, api_base: str, credentials: Dict[str, str]) -> str:
+    response = session.post(f"{api_base}/auth/login", json=credentials)
+    token = response.json().get("token") if response.status_code == 200 else None
+    if not token:
+        raise RuntimeError(f"Login failed for {credentials['email']}: {response.status_code}")
+    return token
+
+
+def benchmark_targets(manifests: List[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+    """(label, path, token role) for each measured read endpoint"""
+    enrollment = next((enrollment for manifest in manifests for enrollment in manifest["enrollments"]), None)
+    targets = [
+        ("GET /api/courses", "/courses", "public"),
+        ("GET /api/courses/admin", "/courses/admin", "admin"),
+        ("GET /api/enrollments", "/enrollments", "admin"),
+        ("GET /api/public/realtime", "/public/realtime", "public"),
+        ("GET /api/admin/realtime", "/admin/realtime", "admin"),
+    ]
+    if enrollment:
+        targets.append(("GET /api/learning-progress/{id}", f"/learning-progress/{enrollment['courseId']}", "student"))
+    return targets
+
+
+def student_credentials(manifests: List[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """Credentials for the user behind the first seeded enrollment"""
+    for manifest in manifests:
+        users = {user["id"]: user for user in manifest["users"]}
+        for enrollment in manifest["enrollments"]:
+            user = users.get(enrollment["userId"])
+            if user:
+                return {"email": user["email"], "password": user["password"]}
+    return None
+
+
+def measure(api_base: str, admin_credentials: Dict[str, str], manifests: List[Dict[str, Any]],
+            samples: int, warmup: int) -> MetricsRecorder:
+    """Time each endpoint sequentially so data size, not concurrency, drives latency"""
+    recorder = MetricsRecorder()
+    session = requests.Session()
+    tokens = {"public": None, "admin": login(session, api_base, admin_credentials)}
+    student = student_credentials(manifests)
+    if student:
+        tokens["student"] = login(session, api_base, student)
+
+    for label, path, role in benchmark_targets(manifests):
+        headers = {"Authorization": f"Bearer {tokens[role]}"} if tokens.get(role) else {}
+        for index in range(warmup + samples):
+            response = session.get(f"{api_base}{path}", headers=headers)
+            if response.status_code != 200:
+                log(f"❌ {label} returned {response.status_code}", "ERROR")
+                break
+            if index >= warmup:
+                recorder.record_response(label, response)
+    return recorder
+
+
+def data_size(manifests: List[Dict[str, Any]]) -> Dict[str, int]:
+    totals: Dict[str, int] = {}
+    for manifest in manifests:
+        for table, count in manifest["counts"].items():
+            totals[table] = totals.get(table, 0) + count
+    return totals
+
+
+def load_matrix(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"version": MATRIX_VERSION, "points": []}
+    with open(path, encoding="utf-8") as handle:
+        matrix = json.load(handle)
+    if matrix.get("version") != MATRIX_VERSION:
+        raise ValueError(f"Unsupported scaling matrix version in {path}: {matrix.get('version')}")
+    return matrix
+
+
+def record_point(matrix: Dict[str, Any], label: str, manifests: List[Dict[str, Any]], recorder: MetricsRecorder):
+    """Replace or add the matrix point for `label` with this measurement"""
+    counts = data_size(manifests)
+    point = {
+        "label": label,
+        "rows": sum(counts.values()),
+        "counts": counts,
+        "measuredAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "endpoints": {
+            endpoint: {key: row[key] for key in ("count", "p50_ms", "p95_ms", "mean_ms", "bytes_mean")}
+            for endpoint, row in recorder.summary().items()
+        },
+    }
+    matrix["points"] = [existing for existing in matrix["points"] if existing["label"] != label] + [point]
+    matrix["points"].sort(key=lambda existing: existing["rows"])
+
+
+def fit_model(sizes: List[float], values: List[float], curve: Callable[[float], float]) -> Tuple[float, float, float]:
+    """Least-squares fit of value = a + b * curve(n) with b >= 0; returns (a, b, rms error)"""
+    xs = [curve(n) for n in sizes]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(values) / len(values)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    slope = max(sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, values)) / spread, 0.0) if spread else 0.0
+    intercept = mean_y - slope * mean_x
+    rms = math.sqrt(sum((intercept + slope * x - y) ** 2 for x, y in zip(xs, values)) / len(values))
+    return intercept, slope, rms
+
+
+def log_log_slope(sizes: List[float], values: List[float]) -> float:
+    """Growth exponent k in value ~ n^k; 1.0 means latency grows in step with data"""
+    points = [(math.log(n), math.log(value)) for n, value in zip(sizes, values) if n > 0 and value > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else 0.0
+
+
+def classify(sizes: List[float], values: List[float], min_growth: float = MIN_GROWTH_MS) -> Tuple[str, float]:
+    """Best-fitting complexity curve and the log-log growth exponent"""
+    exponent = log_log_slope(sizes, values)
+    if len(set(sizes)) < 2:
+        return "-", exponent
+    growth = max(values) - min(values)
+    if growth < max(min_growth, 0.1 * sum(values) / len(values)):
+        return "O(1)", exponent
+    if len(set(sizes)) < 3:
+        # Two points fit every two-parameter curve exactly, so fall back to the exponent alone
+        return ("O(n)+" if exponent >= 0.8 else "unclear"), exponent
+
+    fits = [(name, fit_model(sizes, values, curve)[2]) for name, curve in MODELS]
+    best_rms = min(rms for _, rms in fits)
+    for name, rms in fits:
+        if (rms - best_rms) / growth <= MODEL_TOLERANCE:
+            return name, exponent
+    return fits[-1][0], exponent
+
+
+def scaling_report(matrix: Dict[str, Any]) -> List[Dict[str, Any]]:
+    points = matrix["points"]
+    endpoints = sorted({endpoint for point in points for endpoint in point["endpoints"]})
+    rows = []
+    for endpoint in endpoints:
+        series = [(point["rows"], point["endpoints"][endpoint]) for point in points if endpoint in point["endpoints"]]
+        sizes = [float(rows_) for rows_, _ in series]
+        latency = [row["p50_ms"] for _, row in series]
+        payload = [row["bytes_mean"] for _, row in series]
+        model, exponent = classify(sizes, latency)
+        bytes_model, bytes_exponent = classify(sizes, payload, min_growth=1024)
+        rows.append({
+            "endpoint": endpoint,
+            "sizes": sizes,
+            "p50_ms": latency,
+            "p95_ms": [row["p95_ms"] for _, row in series],
+            "model": model,
+            "exponent": exponent,
+            "bytes_model": bytes_model,
+            "bytes_exponent": bytes_exponent,
+            "flagged": model in LINEAR_OR_WORSE,
+        })
+    return rows
+
+
+def print_report(matrix: Dict[str, Any], rows: List[Dict[str, Any]]) -> bool:
+    """Print the latency matrix and fitted curves; returns False if any endpoint scales linearly or worse"""
+    labels = [f"{point['label']} ({point['rows']})" for point in matrix["points"]]
+    width = 110
+    log("\n" + "=" * width)
+    log("DATA-SIZE SCALING (p50 ms per data size, growth fitted over total seeded rows)")
+    log("=" * width)
+    log(f"{'Endpoint':<34} " + " ".join(f"{label[:14]:>14}" for label in labels)
+        + f" {'latency':>12} {'k':>5} {'payload':>12}")
+    for row in rows:
+        by_size = dict(zip(row["sizes"], row["p50_ms"]))
+        cells = " ".join(
+            f"{by_size[float(point['rows'])]:>14.1f}" if float(point["rows"]) in by_size else f"{'-':>14}"
+            for point in matrix["points"]
+        )
+        marker = "❌" if row["flagged"] else "  "
+        log(f"{marker}{row['endpoint'][:32]:<32} {cells} {row['model']:>12} {row['exponent']:>5.2f} "
+            f"{row['bytes_model']:>12}")
+
+    flagged = [row for row in rows if row["flagged"]]
+    if len(matrix["points"]) < 3:
+        log("\nℹ️ Measure at least three data sizes to fit complexity curves")
+    if flagged:
+        log(f"\n⚠️ {len(flagged)} ENDPOINT(S) SCALE LINEARLY OR WORSE with data size", "ERROR")
+        return False
+    elif len(matrix["points"]) >= 3:
+        log("\n🎉 All measured endpoints scale sublinearly with data size")
+    return True
+
+
+def seed_step(api_base: str, admin_credentials: Dict[str, str], previous: Optional[str], preset: str,
+              run_id: str, concurrency: int) -> Dict[str, Any]:
+    """Seed only the users and courses the next preset adds on top of the previous one"""
+    counts = dict(PRESETS[preset])
+    if previous:
+        for table in ("users", "courses"):
+            counts[table] = max(counts[table] - PRESETS[previous][table], 0)
+    log(f"🌱 Topping up to the {preset} preset: {json.dumps(counts)}")
+    manifest, _ = asyncio.run(seed(api_base, admin_credentials, counts, f"{run_id}-{preset}",
+                                   concurrency, "SeedPassword123"))
+    return manifest
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Data-Size Scaling Benchmark")
+    parser.add_argument("--matrix", default="scaling-matrix.json",
+                        help="JSON file accumulating one point per data size (default: scaling-matrix.json)")
+    parser.add_argument("--manifest", action="append", default=[], metavar="PATH",
+                        help="seed manifest(s) describing the data currently in the database; repeatable")
+    parser.add_argument("--label", help="name of the data-size point measured from --manifest")
+    parser.add_argument("--sizes", nargs="+", choices=sorted(PRESETS), metavar="PRESET",
+                        help="seed each preset in turn (1k 10k 100k) and measure after each top-up")
+    parser.add_argument("--report", action="store_true", help="only print the report for an existing --matrix")
+    parser.add_argument("--samples", type=int, default=30, help="timed requests per endpoint (default: 30)")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed requests per endpoint (default: 3)")
+    parser.add_argument("--concurrency", type=int, default=32, help="seeding concurrency for --sizes")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    parser.add_argument("--admin-email", default=ADMIN_CREDENTIALS["email"])
+    parser.add_argument("--admin-password", default=ADMIN_CREDENTIALS["password"])
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    admin = {"email": args.admin_email, "password": args.admin_password}
+    matrix = load_matrix(args.matrix)
+
+    if args.sizes:
+        manifests = [load_manifest(path) for path in args.manifest]
+        run_id = time.strftime("%Y%m%d%H%M%S")
+        previous = None
+        for preset in args.sizes:
+            manifests.append(seed_step(args.api_base, admin, previous, preset, run_id, args.concurrency))
+            log(f"⏱️ Measuring endpoints at {preset} ({sum(data_size(manifests).values())} seeded rows)")
+            record_point(matrix, preset, manifests, measure(args.api_base, admin, manifests,
+                                                            args.samples, args.warmup))
+            previous = preset
+    elif not args.report:
+        if not args.manifest or not args.label:
+            raise SystemExit("Measuring a single point needs --manifest and --label (or use --sizes / --report)")
+        manifests = [load_manifest(path) for path in args.manifest]
+        record_point(matrix, args.label, manifests, measure(args.api_base, admin, manifests,
+                                                            args.samples, args.warmup))
+
+    if not args.report:
+        with open(args.matrix, "w", encoding="utf-8") as handle:
+            json.dump(matrix, handle, indent=2)
+        log(f"💾 Scaling matrix saved to {args.matrix}")
+    return print_report(matrix, scaling_report(matrix))
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend Fixture Seeder
+Concurrently builds a synthetic dataset of configurable size through the public API
+and writes every generated ID to a manifest for the data-size scaling benchmarks
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from load_driver import LoadStats, aiohttp, log, parse_json, send
+from perf_metrics import endpoint_label
+
+BASE_URL = "http://localhost:8001"
+API_BASE = f"{BASE_URL}/api"
+
+ADMIN_CREDENTIALS = {
+    "email": "admin@example.com",
+    "password": "your_admin_password"
+}
+
+MANIFEST_VERSION = 1
+
+# Roughly 1k / 10k / 100k inserted rows across users, catalog, enrollments and attempts
+PRESETS: Dict[str, Dict[str, int]] = {
+    "1k": {"users": 200, "courses": 20, "modules": 4, "lessons": 3, "quizzes": 1, "questions": 5,
+           "enrollments": 2, "attempts": 1},
+    "10k": {"users": 2000, "courses": 200, "modules": 4, "lessons": 3, "quizzes": 1, "questions": 5,
+            "enrollments": 2, "attempts": 1},
+    "100k": {"users": 20000, "courses": 2000, "modules": 4, "lessons": 3, "quizzes": 1, "questions": 5,
+             "enrollments": 2, "attempts": 1},
+}
+
+MAX_RETRIES = 5
+
+
+class Seeder:
+    """Issues the creation calls for one run under a shared concurrency limit"""
+
+    def __init__(self, http: "aiohttp.ClientSession", api_base: str, run_id: str, concurrency: int):
+        self.http = http
+        self.api_base = api_base
+        self.run_id = run_id
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.stats = LoadStats()
+        self.failures: Dict[str, int] = {}
+
+    async def call(self, method: str, path: str, token: Optional[str] = None,
+                   expected: Tuple[int, ...] = (200, 201), **kwargs) -> Optional[Any]:
+        """Issue one request, retrying 429/5xx with backoff; returns the JSON body or None on failure"""
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        url = f"{self.api_base}{path}"
+        endpoint = endpoint_label(method, url)
+        status = 0
+        for attempt in range(MAX_RETRIES):
+            start = time.perf_counter()
+            try:
+                async with self.semaphore:
+                    status, body = await send(self.http, method, url, headers, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status, body = 0, b""
+            self.stats.record(endpoint, time.perf_counter() - start, status in expected, len(body))
+            if status in expected:
+                return parse_json(body)
+            if status not in (0, 429) and status < 500:
+                break
+            await asyncio.sleep(min(2 ** attempt, 30) * random.uniform(0.5, 1.0))
+
+        self.failures[endpoint] = self.failures.get(endpoint, 0) + 1
+        if self.failures[endpoint] <= 3:
+            log(f"❌ {endpoint} failed with status {status}", "ERROR")
+        return None
+
+    async def gather(self, coroutines) -> List[Any]:
+        return [result for result in await asyncio.gather(*coroutines) if result is not None]
+
+    async def login(self, credentials: Dict[str, str]) -> Optional[str]:
+        data = await self.call("POST", "/auth/login", expected=(200,), json=credentials)
+        return (data or {}).get("token")
+
+    async def create_user(self, index: int, password: str) -> Optional[Dict[str, Any]]:
+        email = f"seed-{self.run_id}-{index}@example.com"
+        data = await self.call("POST", "/auth/signup", expected=(201,), json={
+            "email": email,
+            "password": password,
+            "firstName": "Seed",
+            "lastName": f"User {index}",
+        })
+        if not data or not data.get("user"):
+            return None
+        return {"id": data["user"]["id"], "email": email, "password": password, "token": data.get("token")}
+
+    async def create_course(self, admin_token: str, index: int, counts: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        data = await self.call("POST", "/courses", admin_token, expected=(201,), json={
+            "title": f"Seed Course {self.run_id}-{index}",
+            "description": "Synthetic course generated for data-size scaling benchmarks",
+            "shortDescription": "Synthetic scaling fixture",
+            "category": random.choice(["Technology", "Science", "Business", "Design"]),
+            "instructor": "Seed Instructor",
+            "duration": 4.0,
+            "difficulty": random.choice(["beginner", "intermediate", "advanced"]),
+            "language": "English",
+            "price": 0,
+            "currency": "INR",
+            "isPublished": True,
+            "isFeatured": index % 10 == 0,
+            "tags": ["seed", self.run_id],
+        })
+        course_id = ((data or {}).get("course") or {}).get("id")
+        if not course_id:
+            return None
+
+        modules = await self.gather(
+            self.create_module(admin_token, course_id, order, counts["lessons"])
+            for order in range(1, counts["modules"] + 1)
+        )
+        quizzes = await self.gather(
+            self.create_quiz(admin_token, course_id, modules, order, counts["questions"])
+            for order in range(1, counts["quizzes"] + 1)
+        )
+        return {"id": course_id, "modules": modules, "quizzes": quizzes}
+
+    async def create_module(self, admin_token: str, course_id: str, order: int,
+                            lessons: int) -> Optional[Dict[str, Any]]:
+        data = await self.call("POST", "/modules", admin_token, expected=(201,), json={
+            "courseId": course_id,
+            "title": f"Module {order}",
+            "description": "Synthetic module",
+            "orderIndex": order,
+            "durationMinutes": 30,
+            "isPublished": True,
+            "requiresPreviousCompletion": False,
+        })
+        module_id = ((data or {}).get("module") or {}).get("id")
+        if not module_id:
+            return None
+
+        # Lessons share the module's order index counter, so create them one after another
+        lesson_ids = []
+        for lesson_order in range(1, lessons + 1):
+            lesson = await self.call("POST", f"/modules/{module_id}/lessons", admin_token, expected=(201,), json={
+                "title": f"Lesson {order}.{lesson_order}",
+                "orderIndex": lesson_order,
+                "durationMinutes": 10,
+                "isPublished": True,
+            })
+            lesson_id = ((lesson or {}).get("lesson") or {}).get("id")
+            if lesson_id:
+                lesson_ids.append(lesson_id)
+        return {"id": module_id, "lessons": lesson_ids}
+
+    async def create_quiz(self, admin_token: str, course_id: str, modules: List[Dict[str, Any]], order: int,
+                          questions: int) -> Optional[Dict[str, Any]]:
+        data = await self.call("POST", "/quizzes", admin_token, expected=(201,), json={
+            "courseId": course_id,
+            "moduleId": modules[(order - 1) % len(modules)]["id"] if modules else None,
+            "title": f"Quiz {order}",
+            "passingScore": 60,
+            "isPublished": True,
+            "orderIndex": order,
+        })
+        quiz_id = ((data or {}).get("quiz") or {}).get("id")
+        if not quiz_id:
+            return None
+
+        # Question totals on the quiz are recomputed per insert, so add questions sequentially
+        question_ids = []
+        for question_order in range(1, questions + 1):
+            question = await self.call("POST", f"/quizzes/{quiz_id}/questions", admin_token, expected=(201,), json={
+                "questionText": f"Synthetic question {question_order}?",
+                "questionType": "multiple_choice",
+                "options": ["A", "B", "C", "D"],
+                "correctAnswer": "A",
+                "orderIndex": question_order,
+            })
+            question_id = ((question or {}).get("question") or {}).get("id")
+            if question_id:
+                question_ids.append(question_id)
+        return {"id": quiz_id, "questions": question_ids}
+
+    async def enroll(self, user: Dict[str, Any], course_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.call("POST", "/enrollments", user["token"], expected=(201,), json={
+            "courseId": course_id,
+            "paymentData": {"method": "free", "amount": 0},
+        })
+        if data is None:
+            return None
+        return {"id": data.get("id"), "userId": user["id"], "courseId": course_id}
+
+    async def attempt(self, user: Dict[str, Any], quiz: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        started = await self.call("POST", f"/quizzes/{quiz['id']}/start", user["token"], json={})
+        attempt_id = ((started or {}).get("attempt") or {}).get("id")
+        if not attempt_id:
+            return None
+        answers = {question_id: random.choice(["A", "B"]) for question_id in quiz["questions"]}
+        submitted = await self.call("POST", f"/quizzes/{quiz['id']}/submit", user["token"], json={
+            "attemptId": attempt_id,
+            "answers": answers,
+            "timeSpentSeconds": random.randint(60, 900),
+        })
+        if submitted is None:
+            return None
+        return {"id": attempt_id, "userId": user["id"], "quizId": quiz["id"]}
+
+
+async def seed(api_base: str, admin_credentials: Dict[str, str], counts: Dict[str, int], run_id: str,
+               concurrency: int, password: str) -> Tuple[Dict[str, Any], Seeder]:
+    """Create users, catalog, enrollments and attempts; returns the manifest and the seeder's stats"""
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as http:
+        seeder = Seeder(http, api_base, run_id, concurrency)
+        admin_token = await seeder.login(admin_credentials)
+        if not admin_token:
+            raise RuntimeError(f"Admin login failed for {admin_credentials['email']}")
+
+        log(f"🏗️ Creating {counts['courses']} courses and {counts['users']} users")
+        courses, users = await asyncio.gather(
+            seeder.gather(seeder.create_course(admin_token, index, counts) for index in range(counts["courses"])),
+            seeder.gather(seeder.create_user(index, password) for index in range(counts["users"])),
+        )
+        users = [user for user in users if user["token"]]
+
+        log(f"🎓 Enrolling {len(users)} users in {counts['enrollments']} course(s) each")
+        picks = {
+            user["id"]: random.sample(courses, min(counts["enrollments"], len(courses)))
+            for user in users
+        }
+        enrollments = await seeder.gather(
+            seeder.enroll(user, course["id"]) for user in users for course in picks[user["id"]]
+        )
+
+        enrolled = {(enrollment["userId"], enrollment["courseId"]) for enrollment in enrollments}
+        attempt_plan = []
+        for user in users:
+            quizzes = [
+                quiz for course in picks[user["id"]] if (user["id"], course["id"]) in enrolled
+                for quiz in course["quizzes"] if quiz["questions"]
+            ]
+            attempt_plan.extend((user, quiz) for quiz in quizzes[:counts["attempts"]])
+        log(f"📝 Submitting {len(attempt_plan)} quiz attempts")
+        attempts = await seeder.gather(seeder.attempt(user, quiz) for user, quiz in attempt_plan)
+
+        seeder.stats.finished_at = time.perf_counter()
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "runId": run_id,
+            "createdAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "apiBase": api_base,
+            "requested": counts,
+            "counts": {
+                "users": len(users),
+                "courses": len(courses),
+                "modules": sum(len(course["modules"]) for course in courses),
+                "lessons": sum(len(module["lessons"]) for course in courses for module in course["modules"]),
+                "quizzes": sum(len(course["quizzes"]) for course in courses),
+                "questions": sum(len(quiz["questions"]) for course in courses for quiz in course["quizzes"]),
+                "enrollments": len(enrollments),
+                "attempts": len(attempts),
+            },
+            "users": [{key: user[key] for key in ("id", "email", "password")} for user in users],
+            "courses": courses,
+            "enrollments": enrollments,
+            "attempts": attempts,
+            "failures": seeder.failures,
+        }
+        return manifest, seeder
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {path}: {manifest.get('version')}")
+    return manifest
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Backend Fixture Seeder")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="1k",
+                        help="dataset size preset; individual counts below override it (default: 1k)")
+    for name, label in (("users", "student accounts"), ("courses", "courses"),
+                        ("modules", "modules per course"), ("lessons", "lessons per module"),
+                        ("quizzes", "quizzes per course"), ("questions", "questions per quiz"),
+                        ("enrollments", "enrollments per user"), ("attempts", "quiz attempts per user")):
+        parser.add_argument(f"--{name}", type=int, help=f"number of {label}")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="maximum requests in flight (default: 32)")
+    parser.add_argument("--api-base", default=API_BASE, help=f"API base URL (default: {API_BASE})")
+    parser.add_argument("--admin-email", default=ADMIN_CREDENTIALS["email"])
+    parser.add_argument("--admin-password", default=ADMIN_CREDENTIALS["password"])
+    parser.add_argument("--user-password", default="SeedPassword123",
+                        help="password given to every seeded user")
+    parser.add_argument("--run-id", default=time.strftime("%Y%m%d%H%M%S"),
+                        help="tag embedded in seeded emails and titles (default: timestamp)")
+    parser.add_argument("--manifest", metavar="PATH",
+                        help="where to write the generated IDs (default: seed-manifest-<preset>-<run-id>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    if aiohttp is None:
+        raise RuntimeError("The fixture seeder requires aiohttp: pip install aiohttp")
+
+    counts = dict(PRESETS[args.preset])
+    for name in counts:
+        if getattr(args, name) is not None:
+            counts[name] = getattr(args, name)
+
+    log(f"🌱 Seeding {args.api_base} (run {args.run_id}): {json.dumps(counts)}")
+    manifest, seeder = asyncio.run(seed(
+        args.api_base,
+        {"email": args.admin_email, "password": args.admin_password},
+        counts, args.run_id, args.concurrency, args.user_password,
+    ))
+
+    path = args.manifest or f"seed-manifest-{args.preset}-{args.run_id}.json"
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2)
+
+    seeder.stats.metrics.print_table(log, "SEEDING LATENCY")
+    total = sum(manifest["counts"].values())
+    log(f"\n📊 Created {total} rows in {seeder.stats.elapsed:.1f}s: {json.dumps(manifest['counts'])}")
+    log(f"💾 Manifest written to {path}")
+    if seeder.failures:
+        log(f"⚠️ {sum(seeder.failures.values())} creation call(s) failed: {json.dumps(seeder.failures)}", "ERROR")
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Local SMTP Stand-in
+A minimal SMTP server to point the backend's SMTP_HOST at during tests. It
+accepts any login, records every message it receives to a JSON-lines outbox
+and can answer slowly or with temporary failures, so tests can show that API
+responses do not wait for mail delivery and that queued emails are retried
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import re
+import sys
+import time
+from email import message_from_bytes, policy
+from typing import Any, Dict, List, Optional
+
+from load_driver import log
+
+HOSTNAME = "smtp-sink.local"
+OTP_PATTERN = re.compile(r"\b(\d{6})\b")
+
+
+def parse_message(data: bytes) -> Dict[str, Any]:
+    """Subject, plain text and any OTP code of a received message"""
+    message = message_from_bytes(data, policy=policy.default)
+    body = message.get_body(preferencelist=("plain", "html"))
+    text = body.get_content() if body is not None else ""
+    if body is not None and body.get_content_type() == "text/html":
+        text = re.sub(r"<[^>]*>", " ", text)
+    subject = str(message.get("subject", ""))
+    match = OTP_PATTERN.search(text) if "OTP" in subject else None
+    return {"subject": subject, "text": text.strip(), "otp": match.group(1) if match else None}
+
+
+class SMTPSession:
+    """One client connection, answering the commands nodemailer and smtplib send"""
+
+    def __init__(self, sink: "SMTPSink", reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.sink = sink
+        self.reader = reader
+        self.writer = writer
+        self.sender: Optional[str] = None
+        self.recipients: List[str] = []
+
+    async def reply(self, line: str):
+        self.writer.write(f"{line}\r\n".encode())
+        await self.writer.drain()
+
+    async def readline(self) -> Optional[str]:
+        line = await self.reader.readline()
+        return line.decode("utf-8", "replace").rstrip("\r\n") if line else None
+
+    async def read_data(self) -> bytes:
+        lines = []
+        while True:
+            line = await self.reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            # Undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    async def authenticate(self, argument: str) -> bool:
+        mechanism, _, initial = argument.partition(" ")
+        mechanism = mechanism.upper()
+        if mechanism == "PLAIN":
+            if not initial:
+                await self.reply("334 ")
+                await self.readline()
+        elif mechanism == "LOGIN":
+            if not initial:
+                await self.reply(f"334 {base64.b64encode(b'Username:').decode()}")
+                await self.readline()
+            await self.reply(f"334 {base64.b64encode(b'Password:').decode()}")
+            await self.readline()
+        else:
+            await self.reply("504 Unrecognized authentication type")
+            return False
+        # Any credentials are accepted
+        await self.reply("235 Authentication successful")
+        return True
+
+    async def run(self):
+        await self.reply(f"220 {HOSTNAME} ESMTP ready")
+        while True:
+            line = await self.readline()
+            if line is None:
+                return
+            command, _, argument = line.partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                await self.reply(f"250-{HOSTNAME}")
+                await self.reply("250-AUTH PLAIN LOGIN")
+                await self.reply("250-8BITMIME")
+                await self.reply("250 SIZE 26214400")
+            elif command == "HELO":
+                await self.reply(f"250 {HOSTNAME}")
+            elif command == "AUTH":
+                await self.authenticate(argument)
+            elif command == "MAIL":
+                self.sender, self.recipients = argument.partition(":")[2].strip(), []
+                await self.reply("250 OK")
+            elif command == "RCPT":
+                self.recipients.append(argument.partition(":")[2].strip().strip("<>").split(">")[0])
+                await self.reply("250 OK")
+            elif command == "DATA":
+                await self.reply("354 End data with <CR><LF>.<CR><LF>")
+                await self.reply(await self.sink.receive(self.recipients, await self.read_data()))
+                self.sender, self.recipients = None, []
+            elif command in ("RSET", "NOOP"):
+                self.sender, self.recipients = None, []
+                await self.reply("250 OK")
+            elif command == "QUIT":
+                await self.reply("221 Bye")
+                return
+            else:
+                await self.reply("502 Command not implemented")
+
+
+class SMTPSink:
+    """Records received messages to `outbox` after an optional delay or temporary failure"""
+
+    def __init__(self, outbox: str, delay: float = 0.0, fail_rate: float = 0.0):
+        self.outbox = outbox
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.received = 0
+        self.rejected = 0
+
+    async def receive(self, recipients: List[str], data: bytes) -> str:
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            self.rejected += 1
+            log(f"📭 Deferred message to {', '.join(recipients)}")
+            return "451 Temporary failure, try again later"
+
+        entry = {"to": recipients, "receivedAt": time.time(), **parse_message(data)}
+        with open(self.outbox, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry) + "\n")
+        self.received += 1
+        log(f"📬 {entry['subject']} → {', '.join(recipients)}")
+        return "250 OK queued"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await SMTPSession(self, reader, writer).run()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def read_outbox(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def wait_for_otp(path: str, recipient: str, since: float, timeout: float) -> Optional[str]:
+    """The OTP from the newest message to `recipient` received after `since`, polling the outbox until `timeout`"""
+    deadline = time.time() + timeout
+    while True:
+        for entry in reversed(read_outbox(path)):
+            if entry["receivedAt"] >= since and recipient in entry["to"] and entry.get("otp"):
+                return entry["otp"]
+        if time.time() >= deadline:
+            return None
+        time.sleep(0.25)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="JNTU-GV Local SMTP Stand-in")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=2525, help="port to listen on (default: 2525)")
+    parser.add_argument("--outbox", default="smtp-outbox.jsonl",
+                        help="JSON-lines file receiving one entry per message (default: smtp-outbox.jsonl)")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="seconds to hold each message before answering, like a slow relay (default: 0)")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="fraction of messages deferred with a 451 to exercise retries (default: 0)")
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    sink = SMTPSink(args.outbox, args.delay, args.fail_rate)
+    server = await asyncio.start_server(sink.handle, args.host, args.port)
+    log(f"📮 SMTP stand-in on {args.host}:{args.port}, writing to {args.outbox}; point the backend at it with "
+        f"SMTP_HOST={args.host} SMTP_PORT={args.port} SMTP_SECURITY=none and any SMTP_EMAIL/SMTP_PASSWORD")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None) -> bool:
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
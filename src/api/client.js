@@ -99,6 +99,7 @@ export const apiRequest = async (path, options = {}) => {
     withAuth = true,
     parseJson = true,
     dedup = true, // Default to true for read operations efficiency
+    onResponse, // Called with the successful Response, e.g. to read headers
     ...rest
   } = options;
 
@@ -154,6 +155,7 @@ export const apiRequest = async (path, options = {}) => {
         throw new ApiError(message, response.status, payload);
       }
 
+      onResponse?.(response);
       return payload;
     } finally {
       if (cacheKey) {
@@ -169,5 +171,31 @@ export const apiRequest = async (path, options = {}) => {
   return requestPromise;
 };
 
+// Admin list endpoints return one page at a time and advertise the next in X-Next-Cursor.
+// Follows the cursor until the last page, or until `limit` rows when one is given.
+export const apiRequestAllPages = async (path, { limit, ...options } = {}) => {
+  const maxRows = Number.parseInt(limit, 10) || Infinity;
+  const separator = path.includes('?') ? '&' : '?';
+  const rows = [];
+  let cursor = null;
+
+  do {
+    let nextCursor = null;
+    const page = await apiRequest(cursor ? `${path}${separator}cursor=${encodeURIComponent(cursor)}` : path, {
+      ...options,
+      // Each caller needs its own response to read the cursor from
+      dedup: false,
+      onResponse: (response) => {
+        nextCursor = response.headers.get('X-Next-Cursor');
+      },
+    });
+    if (!Array.isArray(page)) return page;
+    rows.push(...page);
+    cursor = nextCursor;
+  } while (cursor && rows.length < maxRows);
+
+  return rows.length > maxRows ? rows.slice(0, maxRows) : rows;
+};
+
 export default apiRequest;
 export { ApiError };
@@ -1,4 +1,4 @@
-import apiRequest from './client.js';
+import apiRequest, { apiRequestAllPages } from './client.js';
 
 const resolveApiError = (error) => {
   if (!error) {
@@ -38,7 +38,7 @@ const buildQuery = (params = {}) => {
 
 export const getCourses = (params) => apiRequest(`/courses${buildQuery(params)}`);
 
-export const getAdminCourses = () => apiRequest('/courses/admin', { method: 'GET' });
+export const getAdminCourses = () => apiRequestAllPages('/courses/admin');
 
 export const getCourseById = (courseId) => apiRequest(`/courses/${courseId}`);
 
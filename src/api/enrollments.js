@@ -1,4 +1,4 @@
-import apiRequest from './client.js';
+import apiRequest, { apiRequestAllPages } from './client.js';
 
 const buildQuery = (params = {}) => {
   const searchParams = new URLSearchParams();
@@ -21,7 +21,7 @@ export const getUserEnrollments = (userId, params) => apiRequest(`/enrollments/u
 
 export const getUserEnrollmentStats = (userId) => apiRequest(`/enrollments/user/${userId}/stats`);
 
-export const getAllEnrollments = (params) => apiRequest(`/enrollments${buildQuery(params)}`);
+export const getAllEnrollments = (params) => apiRequestAllPages(`/enrollments${buildQuery(params)}`, { limit: params?.limit });
 
 export const getEnrollmentById = (enrollmentId) => apiRequest(`/enrollments/record/${enrollmentId}`);
 
@@ -1,4 +1,4 @@
-import apiRequest from './client.js';
+import apiRequest, { apiRequestAllPages } from './client.js';
 
 const buildQuery = (params = {}) => {
   const searchParams = new URLSearchParams();
@@ -22,7 +22,7 @@ export const updatePaymentStatus = (paymentId, updates) => apiRequest(`/payments
 
 export const getMyPayments = () => apiRequest('/payments/my-payments');
 
-export const getAllPayments = (params) => apiRequest(`/payments${buildQuery(params)}`);
+export const getAllPayments = (params) => apiRequestAllPages(`/payments${buildQuery(params)}`, { limit: params?.limit });
 
 export default {
   createPaymentRecord,
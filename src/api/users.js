@@ -1,4 +1,4 @@
-import apiRequest from './client.js';
+import apiRequest, { apiRequestAllPages } from './client.js';
 
 const buildQuery = (params = {}) => {
   const searchParams = new URLSearchParams();
@@ -10,7 +10,7 @@ const buildQuery = (params = {}) => {
   return queryString ? `?${queryString}` : '';
 };
 
-export const getAllUsers = (params) => apiRequest(`/admin/users${buildQuery(params)}`);
+export const getAllUsers = (params) => apiRequestAllPages(`/admin/users${buildQuery(params)}`, { limit: params?.limit });
 
 export const createUser = (payload) => apiRequest('/admin/users', {
   method: 'POST',
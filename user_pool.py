@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+JNTU-GV Backend User Pool
+Signs up benchmark accounts once and caches their JWTs on disk with expiry
+tracking, so load runs measure the LMS endpoints instead of bcrypt logins
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+POOL_VERSION = 1
+
+
+def log(message: str, level: str = "INFO"):
+    """Log user pool messages"""
+    print(f"[{level}] {message}")
+
+
+def jwt_expiry(token: Optional[str]) -> Optional[float]:
+    """Unverified `exp` claim of a JWT as a Unix timestamp, or None if absent or malformed"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class UserPool:
+    """Benchmark accounts and their cached tokens, persisted to a JSON file between runs"""
+
+    def __init__(self, path: str, api_base: str, password: str = "PoolPassword123", prefix: str = "pool",
+                 refresh_margin: float = 300.0):
+        self.path = path
+        self.api_base = api_base
+        self.password = password
+        self.prefix = prefix
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.accounts: List[Dict[str, Any]] = []
+        self.logins = 0
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("version") == POOL_VERSION and data.get("apiBase") == api_base:
+                self.accounts = data.get("accounts", [])
+
+    @property
+    def http(self) -> requests.Session:
+        if not hasattr(self._local, "http"):
+            self._local.http = requests.Session()
+        return self._local.http
+
+    def save(self):
+        """Write the pool atomically so an interrupted run never leaves a truncated cache"""
+        with self._lock:
+            data = {
+                "version": POOL_VERSION,
+                "apiBase": self.api_base,
+                "savedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "accounts": self.accounts,
+            }
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, indent=2)
+            os.replace(temporary, self.path)
+
+    def fresh(self, entry: Dict[str, Any]) -> bool:
+        expires_at = entry.get("expiresAt")
+        return bool(entry.get("token")) and (expires_at is None or expires_at - self.refresh_margin > time.time())
+
+    def _store_token(self, entry: Dict[str, Any], token: Optional[str]):
+        entry["token"] = token
+        entry["expiresAt"] = jwt_expiry(token)
+
+    def _login(self, entry: Dict[str, Any]) -> Optional[str]:
+        response = self.http.post(f"{self.api_base}/auth/login",
+                                  json={"email": entry["email"], "password": entry["password"]})
+        with self._lock:
+            self.logins += 1
+        return response.json().get("token") if response.status_code == 200 else None
+
+    def token_for(self, entry: Dict[str, Any]) -> Optional[str]:
+        """Cached token for an account entry, logging in again only once it is near expiry"""
+        if not self.fresh(entry):
+            self._store_token(entry, self._login(entry))
+        return entry.get("token")
+
+    def _sign_up(self, index: int) -> Optional[Dict[str, Any]]:
+        entry = {"email": f"{self.prefix}-{index}@example.com", "password": self.password}
+        response = self.http.post(f"{self.api_base}/auth/signup", json={
+            **entry,
+            "firstName": "Pool",
+            "lastName": f"User {index}",
+        })
+        if response.status_code == 201:
+            data = response.json()
+            entry["id"] = (data.get("user") or {}).get("id")
+            self._store_token(entry, data.get("token"))
+        elif response.status_code == 400:
+            # Left over from a pool file that was deleted; adopt it if the password still matches
+            self._store_token(entry, self._login(entry))
+        return entry if entry.get("token") else None
+
+    def checkout(self, size: int, workers: int = 16) -> List[Dict[str, Any]]:
+        """Return `size` accounts with valid tokens, signing up or refreshing only what is missing"""
+        started = time.perf_counter()
+        logins_before = self.logins
+        missing = range(len(self.accounts), size)
+        stale = [entry for entry in self.accounts[:size] if not self.fresh(entry)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            created = [entry for entry in executor.map(self._sign_up, missing) if entry]
+            list(executor.map(self.token_for, stale))
+        self.accounts.extend(created)
+        self.save()
+
+        ready = [dict(entry) for entry in self.accounts[:size] if entry.get("token")]
+        log(f"👥 User pool ready: {len(ready)}/{size} accounts ({len(created)} signed up, "
+            f"{self.logins - logins_before} logins) in {time.perf_counter() - started:.1f}s")
+        if len(ready) < size:
+            log(f"⚠️ {size - len(ready)} pooled account(s) have no token", "ERROR")
+        return ready
+
+
+class PooledUserFactory:
+    """Picklable virtual-user factory that hands each user its own pooled account and token"""
+
+    def __init__(self, factory: Callable[..., Any], accounts: List[Dict[str, Any]]):
+        self.factory = factory
+        self.accounts = accounts
+
+    def __call__(self, index: int, api_base: str, credentials: Dict[str, str], *args):
+        return self.factory(index, api_base, dict(self.accounts[index % len(self.accounts)]), *args)